@@ -1,13 +1,18 @@
 WORKER_QUEUE_SCRAPING = "scraping"
 WORKER_FUNCTION_SCRAPING = "workers.scraping.write_to_scraping_database"
+WORKER_FUNCTION_SCRAPING_BATCH = "workers.scraping.write_batch_to_scraping_database"
+WORKER_FUNCTION_SCRAPING_UNCHANGED = "workers.scraping.write_unchanged_page_to_scraping_database"
 
 WORKER_QUEUE_EXTRACT = "extract"
 WORKER_FUNCTION_EXTRACT = "workers.extract.extract_and_write_to_green_db"
+WORKER_FUNCTION_EXTRACT_BATCH = "workers.extract.extract_batch_and_write_to_green_db"
 
 WORKER_QUEUE_INFERENCE = "inference"
 WORKER_FUNCTION_INFERENCE = "workers.inference.inference_and_write_to_green_db"
+WORKER_FUNCTION_INFERENCE_BATCH = "workers.inference.inference_batch_and_write_to_green_db"
 
 DATABASE_NAME_SCRAPING = "scraping"
+TABLE_NAME_UNCHANGED_PAGES = "unchanged-pages"
 
 # New table variable and names need to follow the structure:
 # TABLE_NAME_SCRAPING_<MERCHANT>_<COUNTRY> = "<merchant>_<COUNTRY>"
@@ -41,6 +46,7 @@ TABLE_NAME_GREEN_DB = "green-db"
 TABLE_NAME_SUSTAINABILITY_LABELS = "sustainability-labels"
 TABLE_NAME_PRODUCT_CLASSIFICATION = "product-classification"
 TABLE_NAME_PRODUCT_CLASSIFICATION_THRESHOLDS = "product-classification-thresholds"
+TABLE_NAME_PRODUCT_CLASSIFICATION_CACHE = "product-classification-cache"
 
 
 PRODUCT_CLASSIFICATION_MODEL = "genial-butterfly-301"
@@ -62,6 +62,43 @@ class ScrapedPage(BaseModel):
         use_enum_values = True
 
 
+class UnchangedPage(BaseModel):
+    # A page whose content did not change since it was scraped the last time
+    timestamp: datetime
+    source: str
+    merchant: str
+    country: CountryType
+    url: str
+    category: str
+    gender: Optional[GenderType]
+    consumer_lifestage: Optional[ConsumerLifestageType]
+
+    page_type: PageType
+    content_hash: str
+    meta_information: Optional[dict]
+
+    class Config:
+        from_attributes = True
+        use_enum_values = True
+
+
+class PageValidators(BaseModel):
+    # Content hash and HTTP validators of a product page, stored in Redis with key `key` for
+    # `ttl_seconds` once the page is written into its scraping table
+    key: str
+    ttl_seconds: int
+    content_hash: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+class FreshProduct(BaseModel):
+    # Redis key that marks a product page as recently fetched for `ttl_seconds`, stored once the
+    # page is written into its scraping table
+    key: str
+    ttl_seconds: int
+
+
 class Product(BaseModel):
     timestamp: datetime
     url: str
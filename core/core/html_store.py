@@ -0,0 +1,6 @@
+import os
+
+# Directory (e.g. a volume shared by scrapyd and workers) used to store compressed HTML of
+# scraped pages, so that jobs only carry a reference to it. `None` disables the HTML store.
+HTML_STORE_PATH = os.environ.get("HTML_STORE_PATH", None)
+HTML_STORE_COMPRESSION_LEVEL = int(os.environ.get("HTML_STORE_COMPRESSION_LEVEL", 6))
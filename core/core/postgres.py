@@ -9,3 +9,14 @@ GREEN_DB_POSTGRES_USER = os.environ.get("POSTGRES_GREEN_DB_USER", None)
 GREEN_DB_POSTGRES_PASSWORD = os.environ.get("POSTGRES_GREEN_DB_PASSWORD", None)
 GREEN_DB_POSTGRES_HOST = os.environ.get("POSTGRES_GREEN_DB_HOST", None)
 GREEN_DB_POSTGRES_PORT = os.environ.get("POSTGRES_GREEN_DB_PORT", None)
+
+# Connection pool settings, shared by all engines of a process
+POSTGRES_POOL_SIZE = int(os.environ.get("POSTGRES_POOL_SIZE", 5))
+POSTGRES_MAX_OVERFLOW = int(os.environ.get("POSTGRES_MAX_OVERFLOW", 10))
+POSTGRES_POOL_TIMEOUT = int(os.environ.get("POSTGRES_POOL_TIMEOUT", 30))
+POSTGRES_POOL_RECYCLE = int(os.environ.get("POSTGRES_POOL_RECYCLE", 1800))
+POSTGRES_POOL_PRE_PING = os.environ.get("POSTGRES_POOL_PRE_PING", "true").lower() == "true"
+
+# How the scraping tables store HTML: "none" (as TEXT) or "gzip" (as compressed bytes)
+SCRAPING_HTML_COMPRESSION = os.environ.get("SCRAPING_HTML_COMPRESSION", "none").lower()
+SCRAPING_HTML_COMPRESSION_LEVEL = int(os.environ.get("SCRAPING_HTML_COMPRESSION_LEVEL", 6))
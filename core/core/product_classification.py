@@ -0,0 +1,49 @@
+import os
+
+from core.constants import PRODUCT_CLASSIFICATION_MODEL
+
+# Directory of the model files, mounted into the product classification server
+PRODUCT_CLASSIFICATION_MODEL_DIR = os.environ.get(
+    "PRODUCT_CLASSIFICATION_MODEL_DIR", f"/usr/src/app/data/models/{PRODUCT_CLASSIFICATION_MODEL}"
+)
+
+# Micro-batching of the product classification server: concurrent requests are coalesced into one
+# model call of up to `PRODUCT_CLASSIFICATION_MAX_BATCH_SIZE` products, waiting at most
+# `PRODUCT_CLASSIFICATION_MAX_BATCH_WAIT_MS` milliseconds for more requests
+# (a batch size of 1 disables batching). Requests beyond `PRODUCT_CLASSIFICATION_MAX_QUEUE_DEPTH`
+# waiting ones are rejected.
+PRODUCT_CLASSIFICATION_MAX_BATCH_SIZE = int(
+    os.environ.get("PRODUCT_CLASSIFICATION_MAX_BATCH_SIZE", 32)
+)
+PRODUCT_CLASSIFICATION_MAX_BATCH_WAIT_MS = float(
+    os.environ.get("PRODUCT_CLASSIFICATION_MAX_BATCH_WAIT_MS", 10)
+)
+PRODUCT_CLASSIFICATION_MAX_QUEUE_DEPTH = int(
+    os.environ.get("PRODUCT_CLASSIFICATION_MAX_QUEUE_DEPTH", 256)
+)
+
+# Reuse predictions of products with identical model features, stored in the GreenDB
+PRODUCT_CLASSIFICATION_CACHE = (
+    os.environ.get("PRODUCT_CLASSIFICATION_CACHE", "true").lower() == "true"
+)
+
+# Number of threads serving requests, limits how many requests can be coalesced
+PRODUCT_CLASSIFICATION_SERVER_THREADS = int(
+    os.environ.get("PRODUCT_CLASSIFICATION_SERVER_THREADS", 32)
+)
+
+# Load the model and predict a warm-up batch at startup, the readiness probe fails until then
+PRODUCT_CLASSIFICATION_EAGER_LOAD = (
+    os.environ.get("PRODUCT_CLASSIFICATION_EAGER_LOAD", "true").lower() == "true"
+)
+
+# Quantize the weights of the model's linear layers to int8 (dynamic quantization), which speeds up
+# inference on CPUs at a small loss of accuracy
+PRODUCT_CLASSIFICATION_QUANTIZE = (
+    os.environ.get("PRODUCT_CLASSIFICATION_QUANTIZE", "false").lower() == "true"
+)
+
+# Threads torch uses within a single prediction, 0 keeps torch's default (one per core)
+PRODUCT_CLASSIFICATION_INTRA_OP_THREADS = int(
+    os.environ.get("PRODUCT_CLASSIFICATION_INTRA_OP_THREADS", 0)
+)
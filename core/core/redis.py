@@ -4,3 +4,18 @@ REDIS_HOST = os.environ.get("REDIS_HOST", "localhost")
 REDIS_PORT = int(os.environ.get("REDIS_PORT", 6379))
 REDIS_USER = os.environ.get("REDIS_USER", None)
 REDIS_PASSWORD = os.environ.get("REDIS_PASSWORD", None)
+
+# Batched job mode: `MessageQueue` collects up to `REDIS_JOB_BATCH_SIZE` items into one job
+# (1 disables batching) and flushes incomplete batches after `REDIS_JOB_BATCH_LATENCY` seconds.
+REDIS_JOB_BATCH_SIZE = int(os.environ.get("REDIS_JOB_BATCH_SIZE", 1))
+REDIS_JOB_BATCH_LATENCY = float(os.environ.get("REDIS_JOB_BATCH_LATENCY", 10))
+
+# Every `REDIS_JOB_MEMORY_SAMPLE_RATE`-th enqueued job is measured with `MEMORY USAGE`
+# (0 disables the measurement), see `MessageQueue.get_job_memory_statistics`.
+REDIS_JOB_MEMORY_SAMPLE_RATE = int(os.environ.get("REDIS_JOB_MEMORY_SAMPLE_RATE", 100))
+
+# Pipelined enqueue mode: `MessageQueue` buffers up to `REDIS_PIPELINE_SIZE` jobs per queue and
+# enqueues them within a single Redis pipeline (1 enqueues each job immediately). Buffered jobs
+# are enqueued once the oldest of them is older than `REDIS_PIPELINE_LATENCY` seconds.
+REDIS_PIPELINE_SIZE = int(os.environ.get("REDIS_PIPELINE_SIZE", 50))
+REDIS_PIPELINE_LATENCY = float(os.environ.get("REDIS_PIPELINE_LATENCY", 1))
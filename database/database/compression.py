@@ -0,0 +1,55 @@
+import gzip
+from logging import getLogger
+
+from core.postgres import SCRAPING_HTML_COMPRESSION, SCRAPING_HTML_COMPRESSION_LEVEL
+
+logger = getLogger(__name__)
+
+HTML_COMPRESSION_NONE = "none"
+HTML_COMPRESSION_GZIP = "gzip"
+
+if SCRAPING_HTML_COMPRESSION not in (HTML_COMPRESSION_NONE, HTML_COMPRESSION_GZIP):
+    error_message = (
+        f"'SCRAPING_HTML_COMPRESSION' not valid! Need to be one of: "
+        f"{HTML_COMPRESSION_NONE}, {HTML_COMPRESSION_GZIP}"
+    )
+    logger.error(error_message)
+    raise ValueError(error_message)
+
+
+def is_html_compression_enabled() -> bool:
+    """
+    Checks whether new scraped pages should be stored with compressed HTML.
+
+    Returns:
+        bool: Whether HTML compression is enabled
+    """
+    return SCRAPING_HTML_COMPRESSION == HTML_COMPRESSION_GZIP
+
+
+def compress_html(html: str) -> bytes:
+    """
+    Compresses `html` for storage in the scraping tables.
+
+    Args:
+        html (str): HTML to compress
+
+    Returns:
+        bytes: gzip compressed `html`
+    """
+    return gzip.compress(
+        html.encode("utf-8"), compresslevel=SCRAPING_HTML_COMPRESSION_LEVEL, mtime=0
+    )
+
+
+def decompress_html(compressed_html: bytes) -> str:
+    """
+    Decompresses HTML compressed by `compress_html`.
+
+    Args:
+        compressed_html (bytes): Compressed HTML
+
+    Returns:
+        str: Original HTML
+    """
+    return gzip.decompress(compressed_html).decode("utf-8")
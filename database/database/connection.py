@@ -1,10 +1,12 @@
 from collections import Counter
 from datetime import datetime
+from itertools import islice
 from logging import getLogger
-from typing import Any, Iterator, List, Optional, Type
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Type
 
 import pandas as pd
-from sqlalchemy import desc, func, literal_column, or_
+from sqlalchemy import desc, func, insert, literal_column, or_
+from sqlalchemy.dialects.postgresql import insert as postgres_insert
 from sqlalchemy.orm import Session
 
 from core.constants import (
@@ -20,21 +22,48 @@ from core.domain import (
     ProductClassificationThreshold,
     ScrapedPage,
     SustainabilityLabel,
+    UnchangedPage,
 )
 
+from .compression import compress_html, decompress_html, is_html_compression_enabled
 from .tables import (
     SCRAPING_TABLE_CLASS_FOR,
     GreenDBTable,
+    ProductClassificationCacheTable,
     ProductClassificationTable,
     ProductClassificationThresholdsTable,
     ScrapingTable,
     SustainabilityLabelsTable,
+    UnchangedPagesTable,
     bootstrap_tables,
+    get_pool_statistics,
     get_session_factory,
 )
 
 logger = getLogger(__name__)
 
+# Number of rows inserted with a single multi-row `INSERT` statement
+WRITE_BATCH_SIZE = 1000
+
+# Number of rows fetched at once from server-side cursors when streaming query results
+STREAM_CHUNK_SIZE = 1000
+
+
+def _batched(iterable: Iterable[Any], batch_size: int) -> Iterator[List[Any]]:
+    """
+    Helper function that splits `iterable` into `list`s of at most `batch_size` elements.
+
+    Args:
+        iterable (Iterable[Any]): Objects to split into batches
+        batch_size (int): Maximum number of objects per batch
+
+    Yields:
+        Iterator[List[Any]]: Consecutive batches of `iterable`
+    """
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
+
 
 class Connection:
     def __init__(
@@ -53,10 +82,34 @@ class Connection:
                 necessary for boostrapping and `Session` factory
         """
         self._database_class = database_class
+        self._database_name = database_name
         self._session_factory = get_session_factory(database_name)
 
         bootstrap_tables(database_name)
 
+    def get_pool_statistics(self) -> Dict[str, int]:
+        """
+        Fetch statistics of the connection pool, which is shared by all `Connection`s
+            to the same database within this process.
+
+        Returns:
+            Dict[str, int]: Pool size, overflow and number of idle and used connections
+        """
+        return get_pool_statistics(self._database_name)
+
+    def _to_row(self, domain_object: ScrapedPage | Product | ProductClassification) -> dict:
+        """
+        Converts a `domain_object` into the column values of its table row.
+        Child classes can override this if rows are stored differently than domain objects.
+
+        Args:
+            domain_object (ScrapedPage | Product | ProductClassification): Domain object to convert
+
+        Returns:
+            dict: Column values of the table row
+        """
+        return domain_object.model_dump()
+
     def write(
         self, domain_object: ScrapedPage | Product | ProductClassification
     ) -> ScrapingTable | GreenDBTable | ProductClassificationTable:
@@ -68,13 +121,112 @@ class Connection:
             [ScrapingTable | GreenDBTable]: Updated Table object representing the database row
         """
         with self._session_factory() as db_session:
-            db_object = self._database_class(**domain_object.model_dump())
+            db_object = self._database_class(**self._to_row(domain_object))
             db_session.add(db_object)
             db_session.commit()
             db_session.refresh(db_object)
 
         return db_object
 
+    def __insert_batch(
+        self,
+        db_session: Session,
+        domain_objects: List[ScrapedPage | Product | ProductClassification],
+        database_class: Optional[
+            Type[GreenDBTable] | Type[ScrapingTable] | Type[ProductClassificationTable]
+        ] = None,
+    ) -> List[int]:
+        """
+        Helper method that inserts `domain_objects` with a single multi-row `INSERT` statement.
+
+        Args:
+            db_session (Session): `db_session` use for the query
+            domain_objects (List[ScrapedPage | Product | ProductClassification]): Domain objects
+                to insert
+            database_class (
+                Optional[Type[GreenDBTable] | Type[ScrapingTable] |
+                Type[ProductClassificationTable]]
+            ): Optional database table to insert into. Defaults to None.
+
+        Returns:
+            List[int]: `id`s of the inserted rows, in the same order as `domain_objects`
+        """
+        database_class = self._database_class if database_class is None else database_class
+        table = database_class.__table__  # type: ignore[union-attr]
+        rows = [self._to_row(domain_object) for domain_object in domain_objects]
+
+        if table.c.id.autoincrement is not True:
+            db_session.execute(insert(table).values(rows))
+            return [row["id"] for row in rows]
+
+        # Serial `id`s are drawn in the order of the `VALUES` list, sorting restores it
+        result = db_session.execute(insert(table).values(rows).returning(table.c.id))
+        return sorted(row.id for row in result)
+
+    def write_many(
+        self,
+        domain_objects: Iterable[ScrapedPage | Product | ProductClassification],
+        batch_size: int = WRITE_BATCH_SIZE,
+        database_class: Optional[
+            Type[GreenDBTable] | Type[ScrapingTable] | Type[ProductClassificationTable]
+        ] = None,
+    ) -> List[int]:
+        """
+        Writes all `domain_objects` into the database within one transaction.
+        Rows are inserted with multi-row `INSERT` statements of at most `batch_size` rows.
+
+        Args:
+            domain_objects (Iterable[ScrapedPage | Product | ProductClassification]): Domain
+                objects to write
+            batch_size (int, optional): Rows per `INSERT` statement. Defaults to 1000.
+            database_class (
+                Optional[Type[GreenDBTable] | Type[ScrapingTable] |
+                Type[ProductClassificationTable]]
+            ): Optional database table to write into. Defaults to None.
+
+        Returns:
+            List[int]: `id`s of the written rows, in the same order as `domain_objects`
+        """
+        ids: List[int] = []
+        with self._session_factory() as db_session:
+            for batch in _batched(domain_objects, batch_size):
+                ids += self.__insert_batch(db_session, batch, database_class=database_class)
+            db_session.commit()
+
+        return ids
+
+    def write_iter(
+        self,
+        domain_objects: Iterable[ScrapedPage | Product | ProductClassification],
+        batch_size: int = WRITE_BATCH_SIZE,
+        database_class: Optional[
+            Type[GreenDBTable] | Type[ScrapingTable] | Type[ProductClassificationTable]
+        ] = None,
+    ) -> Iterator[int]:
+        """
+        Streaming version of `write_many`. Consumes `domain_objects` lazily and commits
+            every `batch_size` rows, so arbitrarily large iterables can be written.
+
+        Args:
+            domain_objects (Iterable[ScrapedPage | Product | ProductClassification]): Domain
+                objects to write
+            batch_size (int, optional): Rows per `INSERT` statement and transaction.
+                Defaults to 1000.
+            database_class (
+                Optional[Type[GreenDBTable] | Type[ScrapingTable] |
+                Type[ProductClassificationTable]]
+            ): Optional database table to write into. Defaults to None.
+
+        Yields:
+            Iterator[int]: `id`s of the written rows, in the same order as `domain_objects`,
+                as soon as their batch is committed
+        """
+        with self._session_factory() as db_session:
+            for batch in _batched(domain_objects, batch_size):
+                ids = self.__insert_batch(db_session, batch, database_class=database_class)
+                db_session.commit()
+                yield from ids
+
     def __get_latest_timestamp(
         self,
         db_session: Session,
@@ -166,6 +318,57 @@ class Scraping(Connection):
         self.__table_name = table_name
         super().__init__(SCRAPING_TABLE_CLASS_FOR[self.__table_name], DATABASE_NAME_SCRAPING)
 
+    def _to_row(self, domain_object: ScrapedPage) -> dict:  # type: ignore[override]
+        """
+        Converts a `ScrapedPage` into the column values of its table row.
+        If HTML compression is enabled, its HTML is stored compressed.
+
+        Args:
+            domain_object (ScrapedPage): Domain object to convert
+
+        Returns:
+            dict: Column values of the table row
+        """
+        row = domain_object.model_dump()
+
+        if is_html_compression_enabled():
+            row["html_compressed"] = compress_html(row.pop("html"))
+            row["html"] = None
+
+        return row
+
+    @staticmethod
+    def _to_scraped_page(row: ScrapingTable) -> ScrapedPage:
+        """
+        Converts a table row into a `ScrapedPage` and decompresses its HTML if necessary.
+
+        Args:
+            row (ScrapingTable): Table row to convert
+
+        Returns:
+            ScrapedPage: Domain object representation of table row
+        """
+        if row.html_compressed is None:
+            return ScrapedPage.model_validate(row)
+
+        # Do not modify `row`, this would keep it in memory as long as its `Session` is open
+        return ScrapedPage.model_validate(
+            {field: getattr(row, field) for field in ScrapedPage.model_fields}
+            | {"html": decompress_html(row.html_compressed)}
+        )
+
+    def write_unchanged_page(self, unchanged_page: UnchangedPage) -> None:
+        """
+        Records that `unchanged_page` was scraped again without changes, instead of writing
+            the page into the scraping table again.
+
+        Args:
+            unchanged_page (UnchangedPage): Domain object to write into the unchanged pages table
+        """
+        with self._session_factory() as db_session:
+            db_session.add(UnchangedPagesTable(**unchanged_page.model_dump()))
+            db_session.commit()
+
     def get_scraped_page(self, id: int) -> ScrapedPage:
         """
         Fetch `ScrapedPage` with given `id`.
@@ -177,34 +380,146 @@ class Scraping(Connection):
             ScrapedPage: Domain object representation of table row
         """
         with self._session_factory() as db_session:
-            return ScrapedPage.model_validate(
+            return self._to_scraped_page(
                 db_session.query(self._database_class).filter(self._database_class.id == id).first()
             )
 
-    def get_scraped_pages_for_timestamp(self, timestamp: datetime) -> Iterator[ScrapedPage]:
+    def get_scraped_pages_with_ids(self, ids: List[int]) -> Iterator[ScrapedPage]:
         """
-        Fetch all `ScrapedPage`s for given `timestamp`.
+        Fetch `ScrapedPage`s with given `ids` using a single query.
+
+        Args:
+            ids (List[int]): Row `ids` to fetch
+
+        Returns:
+            Iterator[ScrapedPage]: Iterator over the domain object representations
+        """
+        with self._session_factory() as db_session:
+            query = db_session.query(self._database_class).filter(self._database_class.id.in_(ids))
+            return (self._to_scraped_page(row) for row in query.all())
+
+    def get_scraped_pages_for_timestamp(
+        self, timestamp: datetime, chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> Iterator[ScrapedPage]:
+        """
+        Stream all `ScrapedPage`s for given `timestamp`.
+        Rows are fetched in chunks of `chunk_size` from a server-side cursor, which stays open
+            until the iterator is exhausted or closed, so memory usage does not grow with the
+            number of rows.
 
         Args:
             timestamp (datetime): Defines which rows to fetch.
+            chunk_size (int, optional): Rows fetched at once. Defaults to 1000.
 
         Yields:
             Iterator[ScrapedPage]: Iterator over the domain object representations
         """
         with self._session_factory() as db_session:
-            query = db_session.query(self._database_class).filter(
-                self._database_class.timestamp == timestamp
+            query = (
+                db_session.query(self._database_class)
+                .filter(self._database_class.timestamp == timestamp)
+                .yield_per(chunk_size)
             )
-            return (ScrapedPage.model_validate(row) for row in query.all())
+            for row in query:
+                yield self._to_scraped_page(row)
 
-    def get_latest_scraped_pages(self) -> Iterator[ScrapedPage]:
+    def get_scraped_pages_with_row_ids_for_timestamp(
+        self,
+        timestamp: datetime,
+        start_id: int = 0,
+        page_type: Optional[PageType] = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> Iterator[Tuple[int, ScrapedPage]]:
         """
-        Fetch all `ScrapedPage`s for latest available `timestamp`.
+        Stream all `ScrapedPage`s for given `timestamp`, ordered by and together with their row
+            `id`. Use `start_id` to resume a stream after the last processed row.
+        Rows are fetched in chunks of `chunk_size` from a server-side cursor.
+
+        Args:
+            timestamp (datetime): Defines which rows to fetch.
+            start_id (int, optional): Only rows with a greater `id` are fetched. Defaults to 0.
+            page_type (Optional[PageType], optional): Only rows of this `page_type` are fetched.
+                Defaults to None.
+            chunk_size (int, optional): Rows fetched at once. Defaults to 1000.
+
+        Yields:
+            Iterator[Tuple[int, ScrapedPage]]: Iterator over row `id`s and domain object
+                representations
+        """
+        with self._session_factory() as db_session:
+            query = (
+                db_session.query(self._database_class)
+                .filter(self._database_class.timestamp == timestamp)
+                .filter(self._database_class.id > start_id)
+            )
+
+            if page_type is not None:
+                query = query.filter(self._database_class.page_type == page_type.value)
+
+            for row in query.order_by(self._database_class.id).yield_per(chunk_size):
+                yield row.id, self._to_scraped_page(row)
+
+    def get_latest_scraped_pages(
+        self, chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> Iterator[ScrapedPage]:
+        """
+        Stream all `ScrapedPage`s for latest available `timestamp`.
+
+        Args:
+            chunk_size (int, optional): Rows fetched at once. Defaults to 1000.
 
         Yields:
             Iterator[ScrapedPage]: Iterator over the domain object representations
         """
-        return self.get_scraped_pages_for_timestamp(self.get_latest_timestamp())
+        return self.get_scraped_pages_for_timestamp(self.get_latest_timestamp(), chunk_size)
+
+    def compress_stored_html(self, batch_size: int = WRITE_BATCH_SIZE, start_id: int = 0) -> int:
+        """
+        Compresses the HTML of all rows that store it uncompressed, in batches ordered by `id`.
+        Each batch is committed, so an interrupted run can be resumed with `start_id`.
+        Postgres reclaims the disk space of the uncompressed HTML only after a `VACUUM`.
+
+        Args:
+            batch_size (int, optional): Rows per batch and transaction. Defaults to 1000.
+            start_id (int, optional): Only rows with a greater `id` are compressed.
+                Defaults to 0.
+
+        Returns:
+            int: Number of compressed rows
+        """
+        compressed_rows = 0
+        last_id = start_id
+
+        while True:
+            with self._session_factory() as db_session:
+                rows = (
+                    db_session.query(self._database_class.id, self._database_class.html)
+                    .filter(self._database_class.id > last_id)
+                    .filter(self._database_class.html.isnot(None))
+                    .filter(self._database_class.html_compressed.is_(None))
+                    .order_by(self._database_class.id)
+                    .limit(batch_size)
+                    .all()
+                )
+
+                if not rows:
+                    return compressed_rows
+
+                db_session.bulk_update_mappings(
+                    self._database_class,  # type: ignore[arg-type]
+                    [
+                        {"id": row.id, "html": None, "html_compressed": compress_html(row.html)}
+                        for row in rows
+                    ],
+                )
+                db_session.commit()
+
+            compressed_rows += len(rows)
+            last_id = rows[-1].id
+            logger.info(
+                f"Compressed HTML of {compressed_rows} rows of table '{self.__table_name}', "
+                f"last id: {last_id}"
+            )
 
     def get_scraped_page_count_per_merchant_and_country(
         self, timestamp: Optional[datetime] = None
@@ -337,14 +652,21 @@ class GreenDB(Connection):
                 return list(sustainability_labels_iterator)
 
     def get_products_for_timestamp(
-        self, timestamp: datetime, convert_orm: Optional[bool] = True
+        self,
+        timestamp: datetime,
+        convert_orm: Optional[bool] = True,
+        chunk_size: int = STREAM_CHUNK_SIZE,
     ) -> Iterator[Product]:
         """
-        Fetch all `Product`s for given `timestamp`.
+        Stream all `Product`s for given `timestamp`.
+        Rows are fetched in chunks of `chunk_size` from a server-side cursor, which stays open
+            until the iterator is exhausted or closed, so memory usage does not grow with the
+            number of rows.
 
         Args:
             convert_orm (boolean): Convert the results to Product instances or not.
             timestamp (datetime): Defines which rows to fetch
+            chunk_size (int, optional): Rows fetched at once. Defaults to 1000.
 
         Yields:
             Iterator[Product]: `Iterator` of domain object representations
@@ -355,19 +677,67 @@ class GreenDB(Connection):
             if timestamp is not None:
                 query = query.filter(self._database_class.timestamp == timestamp)
 
-            if convert_orm:
-                return (Product.model_validate(row) for row in query.all())
-            else:
-                return query.all()
+            for row in query.yield_per(chunk_size):
+                yield Product.model_validate(row) if convert_orm else row
 
-    def get_latest_products(self, convert_orm: Optional[bool] = True) -> Iterator[Product]:
+    def get_products_with_row_ids(
+        self,
+        timestamp: Optional[datetime] = None,
+        start_id: int = 0,
+        unclassified_by_ml_model_name: Optional[str] = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> Iterator[Tuple[int, Product]]:
         """
-        Fetch all `Product`s for latest available `timestamp`.
+        Stream all `Product`s for given `timestamp`, or if `None` for all data, ordered by and
+            together with their row `id`. Use `start_id` to resume a stream after the last
+            processed row.
+        Rows are fetched in chunks of `chunk_size` from a server-side cursor.
+
+        Args:
+            timestamp (Optional[datetime], optional): Defines which rows to fetch.
+                Defaults to None.
+            start_id (int, optional): Only rows with a greater `id` are fetched. Defaults to 0.
+            unclassified_by_ml_model_name (Optional[str], optional): Only rows without a
+                `ProductClassification` of this model are fetched. Defaults to None.
+            chunk_size (int, optional): Rows fetched at once. Defaults to 1000.
+
+        Yields:
+            Iterator[Tuple[int, Product]]: Iterator over row `id`s and domain object
+                representations
+        """
+        with self._session_factory() as db_session:
+            query = db_session.query(GreenDBTable).filter(GreenDBTable.id > start_id)
+
+            if timestamp is not None:
+                query = query.filter(GreenDBTable.timestamp == timestamp)
+
+            if unclassified_by_ml_model_name is not None:
+                query = query.filter(
+                    ~db_session.query(ProductClassificationTable)
+                    .filter(ProductClassificationTable.id == GreenDBTable.id)
+                    .filter(
+                        ProductClassificationTable.ml_model_name == unclassified_by_ml_model_name
+                    )
+                    .exists()
+                )
+
+            for row in query.order_by(GreenDBTable.id).yield_per(chunk_size):
+                yield row.id, Product.model_validate(row)
+
+    def get_latest_products(
+        self, convert_orm: Optional[bool] = True, chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> Iterator[Product]:
+        """
+        Stream all `Product`s for latest available `timestamp`.
+
+        Args:
+            convert_orm (boolean): Convert the results to Product instances or not.
+            chunk_size (int, optional): Rows fetched at once. Defaults to 1000.
 
         Yields:
             Iterator[Product]: `Iterator` of domain object representation
         """
-        return self.get_products_for_timestamp(self.get_latest_timestamp(), convert_orm)
+        return self.get_products_for_timestamp(self.get_latest_timestamp(), convert_orm, chunk_size)
 
     def get_product_count_per_merchant_and_country(
         self, timestamp: Optional[datetime] = None
@@ -1111,16 +1481,23 @@ class GreenDB(Connection):
             res_df = pd.DataFrame(query, columns=columns).convert_dtypes()
             return res_df.sort_values("id", ascending=False).drop_duplicates("url", keep="first")
 
-    def get_products_with_ids(self, ids: list) -> Iterator[Product]:
+    def get_products_with_ids(
+        self, ids: list, convert_orm: Optional[bool] = True
+    ) -> Iterator[Product]:
         """Fetches the products for the given `ids`
 
         :param ids: A list of ids to filter the green-db::green-db rows.
+        :param convert_orm: Convert the results to Product instances or not. Table rows keep
+            their `id`.
         :return:
             An iterator of core.domain::Product.
         """
         with self._session_factory() as db_session:
             query = db_session.query(GreenDBTable).filter(GreenDBTable.id.in_(ids))
-            return (Product.model_validate(row) for row in query.all())
+            if convert_orm:
+                return (Product.model_validate(row) for row in query.all())
+            else:
+                return iter(query.all())
 
     def get_product_classifications_with_ids(
         self, ids: list, ml_model_name: Optional[str] = PRODUCT_CLASSIFICATION_MODEL
@@ -1155,6 +1532,48 @@ class GreenDB(Connection):
             db_session.add(db_object)
             db_session.commit()
 
+    def write_product_classifications(
+        self, product_classifications: Iterable[ProductClassification]
+    ) -> None:
+        """
+        Writes multiple `ProductClassification domain_objects` into the database within one
+            transaction.
+
+        Args:
+            product_classifications: The domain objects to write into the database.
+        """
+        self.write_many(product_classifications, database_class=ProductClassificationTable)
+
+    def upsert_product_classifications(
+        self, product_classifications: Iterable[ProductClassification]
+    ) -> None:
+        """
+        Writes multiple `ProductClassification domain_objects` into the database within one
+            transaction. Existing classifications of the same product and model are overwritten.
+
+        Args:
+            product_classifications: The domain objects to write into the database.
+        """
+        with self._session_factory() as db_session:
+            for batch in _batched(product_classifications, WRITE_BATCH_SIZE):
+                statement = postgres_insert(ProductClassificationTable).values(
+                    [self._to_row(product_classification) for product_classification in batch]
+                )
+                db_session.execute(
+                    statement.on_conflict_do_update(
+                        index_elements=["id", "ml_model_name"],
+                        set_={
+                            column: statement.excluded[column]
+                            for column in [
+                                "predicted_category",
+                                "confidence",
+                                "all_predicted_probabilities",
+                            ]
+                        },
+                    )
+                )
+            db_session.commit()
+
     def write_product_classification_dataframe(self, data_frame: pd.DataFrame) -> None:
         """
         Writes a pd.Dataframe with multiple `ProductClassification domain_objects` into the
@@ -1185,6 +1604,75 @@ class GreenDB(Connection):
                     db_session.commit()
                     logger.info(f"Committed {index} products")
 
+    def get_cached_predicted_probabilities(
+        self, content_hashes: Iterable[str]
+    ) -> Dict[str, List[float]]:
+        """
+        Fetch the cached predicted probabilities for the given `content_hashes`.
+
+        Args:
+            content_hashes (Iterable[str]): Hashes of model name and model features to fetch.
+
+        Returns:
+            Dict[str, List[float]]: Predicted probabilities of the cached `content_hashes`
+        """
+        with self._session_factory() as db_session:
+            query = db_session.query(
+                ProductClassificationCacheTable.content_hash,
+                ProductClassificationCacheTable.predicted_probabilities,
+            ).filter(ProductClassificationCacheTable.content_hash.in_(list(content_hashes)))
+            return {content_hash: probabilities for content_hash, probabilities in query}
+
+    def write_cached_predicted_probabilities(
+        self, ml_model_name: str, predicted_probabilities: Dict[str, List[float]]
+    ) -> None:
+        """
+        Writes predicted probabilities into the cache, already cached hashes are skipped.
+
+        Args:
+            ml_model_name (str): Name of the model that predicted the probabilities.
+            predicted_probabilities (Dict[str, List[float]]): Predicted probabilities per hash of
+                model name and model features.
+        """
+        if not predicted_probabilities:
+            return
+
+        with self._session_factory() as db_session:
+            db_session.execute(
+                postgres_insert(ProductClassificationCacheTable)
+                .values(
+                    [
+                        {
+                            "content_hash": content_hash,
+                            "ml_model_name": ml_model_name,
+                            "predicted_probabilities": probabilities,
+                        }
+                        for content_hash, probabilities in predicted_probabilities.items()
+                    ]
+                )
+                .on_conflict_do_nothing(index_elements=["content_hash"])
+            )
+            db_session.commit()
+
+    def delete_cached_predicted_probabilities(self, except_ml_model_name: str) -> int:
+        """
+        Deletes the cached predicted probabilities of all models except `except_ml_model_name`.
+
+        Args:
+            except_ml_model_name (str): Name of the model whose cache is kept.
+
+        Returns:
+            int: Number of deleted rows
+        """
+        with self._session_factory() as db_session:
+            deleted = (
+                db_session.query(ProductClassificationCacheTable)
+                .filter(ProductClassificationCacheTable.ml_model_name != except_ml_model_name)
+                .delete(synchronize_session=False)
+            )
+            db_session.commit()
+            return deleted
+
     def get_product_classification_thresholds(
         self, timestamp: datetime, ml_model_name: str = PRODUCT_CLASSIFICATION_MODEL
     ) -> Iterator[ProductClassificationThreshold]:
@@ -0,0 +1,81 @@
+from argparse import ArgumentParser
+from logging import getLogger
+from typing import Optional
+
+from core.constants import ALL_SCRAPING_TABLE_NAMES
+
+logger = getLogger(__name__)
+
+
+def migrate_html_compression(table: Optional[str]) -> None:
+    """
+    Adds the `html_compressed` column to the given scraping `table` or to all scraping tables
+        and makes their `html` column nullable. Run this once before deploying HTML compression.
+
+    Args:
+        table (Optional[str]): Scraping table to migrate, all if `None`
+    """
+    from .postgres import migrate_html_compression_columns
+
+    migrate_html_compression_columns([table] if table else ALL_SCRAPING_TABLE_NAMES)
+
+
+def compress_html(table: Optional[str], batch_size: int, start_id: int) -> None:
+    """
+    Compresses the uncompressed HTML of the given scraping `table` or of all scraping tables.
+
+    Args:
+        table (Optional[str]): Scraping table to compress, all if `None`
+        batch_size (int): Rows per batch and transaction
+        start_id (int): Only rows with a greater `id` are compressed, used to resume the given
+            `table`
+    """
+    from .connection import Scraping
+
+    if start_id and not table:
+        error_message = "Resuming with 'start_id' requires the 'table' to resume."
+        logger.error(error_message)
+        raise ValueError(error_message)
+
+    for table_name in [table] if table else ALL_SCRAPING_TABLE_NAMES:
+        Scraping(table_name).compress_stored_html(batch_size=batch_size, start_id=start_id)
+
+
+def start() -> None:
+    """
+    CLI implementation of the `database` command.
+    """
+    parser = ArgumentParser(description="CLI for maintenance tasks of the databases.")
+    subparsers = parser.add_subparsers()
+
+    # migrate-html-compression
+    migrate_html_compression_parser = subparsers.add_parser(
+        "migrate-html-compression",
+        help="Add the compressed HTML column to existing scraping tables.",
+    )
+    migrate_html_compression_parser.add_argument(
+        "--table", choices=ALL_SCRAPING_TABLE_NAMES, default=None
+    )
+    migrate_html_compression_parser.set_defaults(command_function=migrate_html_compression)
+
+    # compress-html
+    compress_html_parser = subparsers.add_parser(
+        "compress-html", help="Backfill compressed HTML for existing scraping table rows."
+    )
+    compress_html_parser.add_argument("--table", choices=ALL_SCRAPING_TABLE_NAMES, default=None)
+    compress_html_parser.add_argument("--batch-size", type=int, default=1000)
+    compress_html_parser.add_argument("--start-id", type=int, default=0)
+    compress_html_parser.set_defaults(command_function=compress_html)
+
+    args = parser.parse_args()
+
+    parsed_args = {
+        parameter: value
+        for parameter, value in vars(args).items()
+        if parameter != "command_function"
+    }
+
+    args.command_function(
+        # call given command function with parameters
+        **parsed_args
+    )
@@ -1,7 +1,10 @@
+import os
 from logging import getLogger
-from typing import Callable, Iterator
+from threading import Lock
+from typing import Callable, Dict, Iterator, List, Tuple
 
-from sqlalchemy import create_engine
+from sqlalchemy import LargeBinary, create_engine, inspect, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Session, sessionmaker
 
@@ -11,6 +14,11 @@ from core.postgres import (
     GREEN_DB_POSTGRES_PASSWORD,
     GREEN_DB_POSTGRES_PORT,
     GREEN_DB_POSTGRES_USER,
+    POSTGRES_MAX_OVERFLOW,
+    POSTGRES_POOL_PRE_PING,
+    POSTGRES_POOL_RECYCLE,
+    POSTGRES_POOL_SIZE,
+    POSTGRES_POOL_TIMEOUT,
     SCRAPING_POSTGRES_HOST,
     SCRAPING_POSTGRES_PASSWORD,
     SCRAPING_POSTGRES_PORT,
@@ -36,6 +44,14 @@ POSTGRES_BASE_CLASS_FOR = {
     DATABASE_NAME_GREEN_DB: GreenDBBaseTable,
 }
 
+# Process-wide registry of engines, one per database. Maps `database_name` to the
+# process id that created (or last reset) the engine and the engine itself.
+_ENGINE_FOR: Dict[str, Tuple[int, Engine]] = {}
+_ENGINE_LOCK = Lock()
+
+# Databases whose tables were already created by this process.
+_BOOTSTRAPPED_DATABASES: set = set()
+
 
 def __check_database(database_name: str) -> None:
     """
@@ -52,18 +68,115 @@ def __check_database(database_name: str) -> None:
         raise ValueError(error_message)
 
 
+def get_engine(database_name: str) -> Engine:
+    """
+    Returns the shared `Engine` for the `database_name`, creating it on first use.
+    All `Session` factories of a process share this engine and its connection pool.
+    If the process was forked (e.g. RQ work horses), the inherited pool is dropped
+        without closing the parent's connections.
+
+    Args:
+        database_name (str): Name of database to get the `Engine` for
+
+    Returns:
+        Engine: Shared `Engine` for the `database_name`
+    """
+    __check_database(database_name)
+
+    with _ENGINE_LOCK:
+        pid = os.getpid()
+
+        if database_name not in _ENGINE_FOR:
+            engine = create_engine(
+                POSTGRES_URL_FOR[database_name],
+                pool_size=POSTGRES_POOL_SIZE,
+                max_overflow=POSTGRES_MAX_OVERFLOW,
+                pool_timeout=POSTGRES_POOL_TIMEOUT,
+                pool_recycle=POSTGRES_POOL_RECYCLE,
+                pool_pre_ping=POSTGRES_POOL_PRE_PING,
+            )
+            _ENGINE_FOR[database_name] = (pid, engine)
+            logger.info(f"Created postgres engine for database '{database_name}'.")
+
+        else:
+            engine_pid, engine = _ENGINE_FOR[database_name]
+            if engine_pid != pid:
+                engine.dispose(close=False)
+                _ENGINE_FOR[database_name] = (pid, engine)
+                logger.debug(f"Reset inherited connection pool for database '{database_name}'.")
+
+        return engine
+
+
+def get_pool_statistics(database_name: str) -> Dict[str, int]:
+    """
+    Returns the current connection pool statistics of the shared `Engine` for `database_name`.
+
+    Args:
+        database_name (str): Name of database to get the pool statistics for
+
+    Returns:
+        Dict[str, int]: Configured `pool_size` and `max_overflow`, number of connections
+            `checked_in` (idle) and `checked_out` (in use), and current `overflow`
+    """
+    pool = get_engine(database_name).pool
+
+    return {
+        "pool_size": pool.size(),  # type: ignore[attr-defined]
+        "max_overflow": POSTGRES_MAX_OVERFLOW,
+        "checked_in": pool.checkedin(),  # type: ignore[attr-defined]
+        "checked_out": pool.checkedout(),  # type: ignore[attr-defined]
+        "overflow": pool.overflow(),  # type: ignore[attr-defined]
+    }
+
+
+def migrate_html_compression_columns(table_names: List[str]) -> None:
+    """
+    Prepares existing scraping tables, created before HTML could be stored compressed:
+    Adds the nullable `html_compressed` column and drops the `NOT NULL` constraint of `html`.
+        Both are cheap catalog-only changes in postgres. Tables that do not exist are skipped,
+        `bootstrap_tables` creates them with both columns.
+
+    Args:
+        table_names (List[str]): Scraping tables to migrate
+    """
+    engine = get_engine(DATABASE_NAME_SCRAPING)
+    inspector = inspect(engine)
+    html_compressed_type = LargeBinary().compile(dialect=engine.dialect)
+
+    with engine.begin() as connection:
+        for table_name in table_names:
+            if not inspector.has_table(table_name):
+                logger.info(f"Table '{table_name}' does not exist, skipping it.")
+                continue
+
+            connection.execute(
+                text(
+                    f'ALTER TABLE "{table_name}" '
+                    f'ADD COLUMN IF NOT EXISTS "html_compressed" {html_compressed_type}'
+                )
+            )
+            connection.execute(
+                text(f'ALTER TABLE "{table_name}" ALTER COLUMN "html" DROP NOT NULL')
+            )
+            logger.info(f"Migrated table '{table_name}' for compressed HTML.")
+
+
 def bootstrap_tables(database_name: str) -> None:
     """
     Creates all defined tables (if they do not exist) for the `database_name`.
+    This is done only once per process and database.
 
     Args:
         database_name (str): Name of database to bootstrap
     """
     __check_database(database_name)
 
-    POSTGRES_BASE_CLASS_FOR[database_name].metadata.create_all(
-        create_engine(POSTGRES_URL_FOR[database_name])
-    )
+    if database_name in _BOOTSTRAPPED_DATABASES:
+        return
+
+    POSTGRES_BASE_CLASS_FOR[database_name].metadata.create_all(get_engine(database_name))
+    _BOOTSTRAPPED_DATABASES.add(database_name)
 
 
 def get_session_factory(database_name: str) -> Callable[[], Session]:
@@ -79,7 +192,7 @@ def get_session_factory(database_name: str) -> Callable[[], Session]:
     """
     __check_database(database_name)
 
-    PostgresSession = sessionmaker(bind=create_engine(POSTGRES_URL_FOR[database_name]))
+    PostgresSession = sessionmaker()
 
     def _get_postgres_session() -> Iterator[Session]:
         """
@@ -92,7 +205,8 @@ def get_session_factory(database_name: str) -> Callable[[], Session]:
         """
         _get_postgres_session.session_number += 1  # type: ignore
 
-        session = PostgresSession()
+        # bind on every call, so forked processes get a fresh connection pool
+        session = PostgresSession(bind=get_engine(database_name))
         logger.debug(
             f"Created new postgres session #{_get_postgres_session.session_number} "  # type: ignore
             f"for database '{database_name}'."
@@ -12,11 +12,13 @@ from sqlalchemy import (
     VARCHAR,
     Column,
     ForeignKey,
+    LargeBinary,
 )
 
 from core.constants import (
     TABLE_NAME_GREEN_DB,
     TABLE_NAME_PRODUCT_CLASSIFICATION,
+    TABLE_NAME_PRODUCT_CLASSIFICATION_CACHE,
     TABLE_NAME_PRODUCT_CLASSIFICATION_THRESHOLDS,
     TABLE_NAME_SCRAPING_AMAZON_DE,
     TABLE_NAME_SCRAPING_AMAZON_FR,
@@ -28,6 +30,7 @@ from core.constants import (
     TABLE_NAME_SCRAPING_ZALANDO_FR,
     TABLE_NAME_SCRAPING_ZALANDO_GB,
     TABLE_NAME_SUSTAINABILITY_LABELS,
+    TABLE_NAME_UNCHANGED_PAGES,
 )
 
 # TODO: Here decide which database to use
@@ -35,6 +38,7 @@ from .postgres import (  # noqa
     GreenDBBaseTable,
     ScrapingBaseTable,
     bootstrap_tables,
+    get_pool_statistics,
     get_session_factory,
 )
 
@@ -93,7 +97,9 @@ class ScrapingTable(__TableMixin):
     country = Column(TEXT, nullable=False)
     category = Column(TEXT, nullable=False)
     url = Column(TEXT, nullable=False)
-    html = Column(TEXT, nullable=False)
+    # Exactly one of `html` and `html_compressed` is set, see `database.compression`
+    html = Column(TEXT, nullable=True)
+    html_compressed = Column(LargeBinary, nullable=True)
     page_type = Column(VARCHAR(length=10), nullable=False)
     gender = Column(TEXT, nullable=True)
     consumer_lifestage = Column(TEXT, nullable=True)
@@ -219,6 +225,32 @@ SCRAPING_TABLE_CLASS_FOR: Dict[str, Type[ScrapingTable]] = {
 }
 
 
+class UnchangedPagesTable(ScrapingBaseTable, __TableMixin):
+    """
+    Records that a page was scraped again but did not change since it was stored in its
+    scraping table, instead of storing it again.
+
+    Args:
+        ScrapingBaseTable ([type]): `sqlalchemy` base class for the Scraping database
+        __TableMixin ([type]): Mixin that implements some convenience methods
+    """
+
+    __tablename__ = TABLE_NAME_UNCHANGED_PAGES
+
+    id = Column(INTEGER, nullable=False, autoincrement=True, primary_key=True)
+    timestamp = Column(TIMESTAMP, nullable=False)
+    source = Column(TEXT, nullable=False)
+    merchant = Column(TEXT, nullable=False)
+    country = Column(TEXT, nullable=False)
+    category = Column(TEXT, nullable=False)
+    url = Column(TEXT, nullable=False)
+    page_type = Column(VARCHAR(length=10), nullable=False)
+    gender = Column(TEXT, nullable=True)
+    consumer_lifestage = Column(TEXT, nullable=True)
+    content_hash = Column(VARCHAR(length=64), nullable=False)
+    meta_information = Column(JSON, nullable=True)
+
+
 class GreenDBTable(GreenDBBaseTable, __TableMixin):
     """
     Defines the GreenDB columns.
@@ -326,3 +358,20 @@ class ProductClassificationThresholdsTable(GreenDBBaseTable, __TableMixin):
     merchant = Column(TEXT, nullable=False, primary_key=True)
     predicted_category = Column(TEXT, nullable=False, primary_key=True)
     threshold = Column(NUMERIC, nullable=False)
+
+
+class ProductClassificationCacheTable(GreenDBBaseTable, __TableMixin):
+    """
+    Defines the Product Classification Cache columns. Rows are identified by a hash of the model
+    name and the model features of a product.
+
+    Args:
+        GreenDBBaseTable ([type]): `sqlalchemy` base class for the GreenDB database
+        __TableMixin ([type]): Mixin that implements some convenience methods
+    """
+
+    __tablename__ = TABLE_NAME_PRODUCT_CLASSIFICATION_CACHE
+
+    content_hash = Column(VARCHAR(length=64), nullable=False, primary_key=True)
+    ml_model_name = Column(TEXT, nullable=False)
+    predicted_probabilities = Column(JSON, nullable=False)
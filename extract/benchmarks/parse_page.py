@@ -0,0 +1,87 @@
+"""
+Micro-benchmark of `parse_page` over the HTML test fixtures.
+
+Compares the previous `parse_page` (eager `BeautifulSoup` with "html.parser" and
+`extract_schema_org` on the HTML) with the current single lxml parse, accessing the lazy
+representations the extractors use.
+Run from the `extract` directory:
+
+    python benchmarks/parse_page.py
+"""
+from argparse import ArgumentParser
+from datetime import datetime
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Dict, List
+
+from bs4 import BeautifulSoup
+
+from core.domain import CountryType, PageType, ScrapedPage
+from extract.parse import JSON_LD, extract_schema_org, parse_page
+
+TEST_DATA_DIR = Path(__file__).parent.parent / "tests"
+
+
+def _load_pages() -> Dict[str, List[ScrapedPage]]:
+    pages: Dict[str, List[ScrapedPage]] = {}
+    for path in sorted(TEST_DATA_DIR.glob("*/data/*.html")):
+        merchant = path.parent.parent.name
+        pages.setdefault(merchant, []).append(
+            ScrapedPage(
+                timestamp=datetime(2022, 1, 1),
+                source=merchant,
+                merchant=merchant,
+                country=CountryType.DE,
+                url="dummy_url",
+                html=path.read_text(encoding="utf-8"),
+                category="",
+                gender=None,
+                consumer_lifestage=None,
+                page_type=PageType.PRODUCT,
+                meta_information={},
+            )
+        )
+    return pages
+
+
+def _best_ms(function: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started_at = perf_counter()
+        function()
+        timings.append(perf_counter() - started_at)
+    return min(timings) * 1000
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # Maps column name to how a page is parsed and which of its representations are accessed
+    parse_for_column: Dict[str, Callable[[ScrapedPage], object]] = {
+        # previous `parse_page`: eager `BeautifulSoup` and all syntaxes
+        "legacy": lambda page: (
+            BeautifulSoup(page.html, "html.parser"),
+            extract_schema_org(page.html),
+        ),
+        # all syntaxes, as the otto extractor
+        "lxml": lambda page: dict(parse_page(page).schema_org),
+        # only JSON-LD, as the h&m and zalando extractors
+        "lxml json-ld": lambda page: parse_page(page).schema_org[JSON_LD],
+        # only `BeautifulSoup`, as the amazon extractors
+        "lxml soup": lambda page: parse_page(page).beautiful_soup,
+    }
+
+    print(f"{'fixtures':<12}{'pages':>6}" + "".join(f"{c:>14}" for c in parse_for_column))
+    for merchant, pages in _load_pages().items():
+        timings = [
+            _best_ms(lambda: [parse(page) for page in pages], args.repeat) / len(pages)
+            for parse in parse_for_column.values()
+        ]
+        print(f"{merchant:<12}{len(pages):>6}" + "".join(f"{t:>14.1f}" for t in timings))
+    print("(ms/page)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Micro-benchmark of `sustainability_labels_to_certificates`.
+
+Compares the previous implementation, which scans all labels, languages and category synonyms for
+each call, with the current one, which uses indexes built at import time. Both have to return
+the same certificates. Run from the `extract` directory:
+
+    python benchmarks/sustainability_labels.py
+"""
+import re
+from argparse import ArgumentParser
+from random import Random
+from time import perf_counter
+from typing import Callable, Iterable, List, Optional
+
+from core.domain import CertificateType
+from extract.utils import (
+    SUSTAINABILITY_LABELS,
+    _certificate_category_names,
+    sustainability_labels_to_certificates,
+)
+
+
+def _legacy_sustainability_labels_to_certificates(
+    certificate_strings: Iterable[str],
+    certificate_mapping: dict,
+    source: str,
+    product_category: str = "",
+) -> Optional[list[str]]:
+    if not certificate_strings:
+        return None
+
+    result = dict.fromkeys(set(certificate_strings))
+
+    for certificate_id, localized_certificate_infos in SUSTAINABILITY_LABELS.items():
+        for certificate_string in result.keys():
+            if any(
+                localized_certificate_info["name"].lower() == certificate_string.lower()
+                for localized_certificate_info in localized_certificate_infos["languages"].values()
+            ):
+                result.update({certificate_string: CertificateType[certificate_id.split(":")[-1]]})
+
+    for certificate_string, certificate in result.items():
+        if certificate is None:
+            if certificate_string in certificate_mapping.keys():
+                result.update({certificate_string: certificate_mapping[certificate_string]})
+            else:
+                result.update({certificate_string: CertificateType.UNKNOWN})  # type: ignore
+
+    if product_category in _certificate_category_names.keys():
+        for certificate_string, certificate in result.items():
+            for label in SUSTAINABILITY_LABELS.keys():
+                for category_alt_name in _certificate_category_names.get(product_category, []):
+                    if re.search(f"^{certificate.value}.*{category_alt_name}$", label):  # type: ignore # noqa
+                        result.update({certificate_string: label})
+
+    return sorted(set(result.values()))  # type: ignore
+
+
+def _best_ms(function: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started_at = perf_counter()
+        function()
+        timings.append(perf_counter() - started_at)
+    return min(timings) * 1000
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    names = [
+        localized_certificate_info["name"]
+        for localized_certificate_infos in SUSTAINABILITY_LABELS.values()
+        for localized_certificate_info in localized_certificate_infos["languages"].values()
+    ]
+    # typical calls: a few known (differently cased) and unknown strings per product
+    random = Random(42)
+    calls: List[tuple] = [
+        (
+            random.sample(names, 2) + [random.choice(names).upper(), "unknown label"],
+            random.choice(["", *_certificate_category_names.keys()]),
+        )
+        for _ in range(args.calls)
+    ]
+
+    for certificate_strings, product_category in calls:
+        assert sustainability_labels_to_certificates(
+            certificate_strings, {}, "benchmark", product_category
+        ) == _legacy_sustainability_labels_to_certificates(
+            certificate_strings, {}, "benchmark", product_category
+        )
+
+    for name, function in [
+        ("legacy", _legacy_sustainability_labels_to_certificates),
+        ("indexed", sustainability_labels_to_certificates),
+    ]:
+        milliseconds = _best_ms(
+            lambda: [function(strings, {}, "benchmark", category) for strings, category in calls],
+            args.repeat,
+        )
+        print(f"{name:<8}{milliseconds * 1000 / len(calls):>10.1f} µs/call")
+
+
+if __name__ == "__main__":
+    main()
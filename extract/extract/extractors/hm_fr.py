@@ -6,7 +6,7 @@ from typing import Dict, List, Optional
 from urllib.parse import urlparse
 
 import chompjs
-from bs4 import BeautifulSoup
+from lxml.html import HtmlElement
 from pydantic import ValidationError
 
 from core.domain import CertificateType, Product
@@ -36,7 +36,9 @@ def extract_hm_fr(parsed_page: ParsedPage) -> Optional[Product]:
     if parsed_page.schema_org.get(JSON_LD):
         meta_data = get_product_from_JSON_LD(parsed_page.schema_org.get(JSON_LD, [{}]))
     else:
-        meta_data = json.loads(parsed_page.beautiful_soup.find(id="product-schema").get_text())
+        meta_data = json.loads(
+            parsed_page.html_tree.xpath('//*[@id="product-schema"]')[0].text_content()
+        )
 
     name = meta_data.get("name", None)
     description = meta_data.get("description", None)
@@ -56,12 +58,12 @@ def extract_hm_fr(parsed_page: ParsedPage) -> Optional[Product]:
     if price := first_offer.get("price", None):
         price = float(price)
 
-    if product_data := _get_product_details(parsed_page.beautiful_soup):
+    if product_data := _get_product_details(parsed_page.html_tree):
         sizes = check_and_create_attributes_list(
             [size.get("name") for size in product_data.get("sizes", [])]
         )
 
-    sustainability_labels = _get_sustainability(parsed_page.beautiful_soup, product_data)
+    sustainability_labels = _get_sustainability(parsed_page.html_tree, product_data)
 
     try:
         return Product(
@@ -137,7 +139,7 @@ _LABEL_MAPPING_HIGG = {
 }
 
 
-def _get_product_details(beautiful_soup: BeautifulSoup) -> Dict:
+def _get_product_details(html_tree: HtmlElement) -> Dict:
     """
     Extracts the JSON product data from script tag of HTML and returns the relevant information of
     the scraped color variant.
@@ -145,14 +147,14 @@ def _get_product_details(beautiful_soup: BeautifulSoup) -> Dict:
     The basic JSON package can not handle 'messy' JSON data, so we have to use chompjs.
 
     Args:
-        beautiful_soup (BeautifulSoup): Parsed HTML.
+        html_tree (HtmlElement): Parsed HTML.
 
     Returns:
         Dict: product data JSON
     """
-    for script in beautiful_soup.find_all("script"):
-        if script.string and "productArticleDetails = {" in script.string:
-            data = script.string.split("var productArticleDetails = ")[1][:-2]
+    for script in html_tree.iter("script"):
+        if script.text and "productArticleDetails = {" in script.text:
+            data = script.text.split("var productArticleDetails = ")[1][:-2]
             data = re.sub(r"isDesktop \? \'.*' : ", "", data)
             data = chompjs.parse_js_object(data)
             article_code = data.get("articleCode", "")
@@ -192,22 +194,26 @@ def _get_hm_conscious(product_data: Dict) -> CertificateType:
     return None
 
 
-def _get_sustainability(beautiful_soup: BeautifulSoup, product_data: Optional[Dict]) -> List[str]:
+def _get_sustainability(html_tree: HtmlElement, product_data: Optional[Dict]) -> List[str]:
     """
     Extracts the sustainability information from HTML and product_data.
 
     Args:
-        beautiful_soup (BeautifulSoup): Parsed HTML.
+        html_tree (HtmlElement): Parsed HTML.
         product_data (Dict): Product data JSON.
 
     Returns:
         List[str]: Ordered `list` of found sustainability labels.
     """
 
-    if materials := beautiful_soup.find("dt", text="Matériaux plus durables"):
-        materials = materials.parent.find("dd").get_text().strip()
-    elif materials := beautiful_soup.find("dt", text="Mat\\u00E9riaux plus durables'"):
-        materials = decode(materials.next_sibling.get_text().strip(), "unicode-escape")
+    if materials := html_tree.xpath('//dt[.="Matériaux plus durables"]'):
+        materials = materials[0].getparent().find(".//dd").text_content().strip()
+    elif materials := html_tree.xpath('//dt[.="Mat\\u00E9riaux plus durables\'"]'):
+        # the materials are the text or the element following the `dt` element
+        following_text = (materials[0].tail or "").strip()
+        if not following_text and (following_element := materials[0].getnext()) is not None:
+            following_text = following_element.text_content().strip()
+        materials = decode(following_text, "unicode-escape")
     else:
         materials = ""
 
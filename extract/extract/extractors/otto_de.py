@@ -4,6 +4,7 @@ from typing import List, Optional
 from urllib.parse import ParseResult, urlparse
 
 from bs4 import BeautifulSoup
+from lxml.html import HtmlElement
 from pydantic import ValidationError
 
 from core.domain import CertificateType, Product
@@ -70,7 +71,7 @@ def extract_otto_de(parsed_page: ParsedPage) -> Optional[Product]:
         description = BeautifulSoup(description, "lxml").text.replace("  ", " ").strip()
     gtin = int(gtin) if type(gtin) == str and len(gtin) > 0 else None
 
-    product_data = _get_product_data(parsed_page.beautiful_soup)
+    product_data = _get_product_data(parsed_page.html_tree)
     parsed_url = urlparse(parsed_page.scraped_page.url)
 
     # Check if the SUSTAINABILITY_FILTER was in the URL
@@ -168,23 +169,23 @@ _LABEL_MAPPING = {
 }
 
 
-def _get_product_data(beautiful_soup: BeautifulSoup) -> dict:
+def _get_product_data(html_tree: HtmlElement) -> dict:
     """
     Helper function to extract the embedded product data JSON.
 
     Args:
-        beautiful_soup (BeautifulSoup): Parsed HTML
+        html_tree (HtmlElement): Parsed HTML
 
     Returns:
         dict: Representation of the product data JSON
     """
-    product_data = beautiful_soup.find(attrs={"id": "productDataJson"})
+    product_data = html_tree.xpath('//*[@id="productDataJson"]')
 
-    if product_data is None:
+    if not product_data:
         # not a product page?
         return {}
 
-    return json.loads(product_data.string.strip())
+    return json.loads(product_data[0].text.strip())
 
 
 def _get_image_urls(
@@ -224,12 +225,12 @@ def _get_image_urls(
     return [url.geturl() for url in image_urls]
 
 
-def _get_sustainability_info(beautiful_soup: BeautifulSoup) -> List[str]:
+def _get_sustainability_info(html_tree: HtmlElement) -> List[str]:
     """
     Helper function that extracts the sustainability information from the parsed HTML.
 
     Args:
-        beautiful_soup (BeautifulSoup): Parsed HTML of Product Website.
+        html_tree (HtmlElement): Parsed HTML of Product Website.
 
     Returns:
         list: includes found sustainability strings.
@@ -241,19 +242,20 @@ def _get_sustainability_info(beautiful_soup: BeautifulSoup) -> List[str]:
     ]
 
     return [
-        label_html.text.strip()
+        label_html.text_content().strip()
         for sc in sustainability_classes
-        for label_html in beautiful_soup.find_all("figcaption", attrs={"class": sc})
+        for label_html in html_tree.find_class(sc)
+        if label_html.tag == "figcaption"
     ]
 
 
-def _get_energy_labels(product_data: dict, beautiful_soup: BeautifulSoup) -> List[str]:
+def _get_energy_labels(product_data: dict, html_tree: HtmlElement) -> List[str]:
     """
     Helper function that extracts the EU_ENERGY_LABEL from the product_data json.
 
     Args:
         product_data (dict): Representation of the product data JSON
-        beautiful_soup (BeautifulSoup): Parsed HTML of Product Website.
+        html_tree (HtmlElement): Parsed HTML of Product Website.
     Returns:
         List[str]: `list` of found energy_labels.
     """
@@ -272,8 +274,12 @@ def _get_energy_labels(product_data: dict, beautiful_soup: BeautifulSoup) -> Lis
                 json_values += json_array
 
     if not energy_labels:
-        if energy_label := beautiful_soup.find("div", attrs={"class": "p_energyLabelScala200"}):
-            energy_labels.append(energy_label.text)
+        if energy_label := [
+            element
+            for element in html_tree.find_class("p_energyLabelScala200")
+            if element.tag == "div"
+        ]:
+            energy_labels.append(energy_label[0].text_content())
 
     # Adding the prefix "EU Energy label" to allow automated mapping,
     # see file: core.sustainability_labels.sustainability_labels.json
@@ -297,8 +303,8 @@ def _get_sustainability(
     Returns:
         List[str]: Sorted `list` of found sustainability labels
     """
-    energy_labels = _get_energy_labels(product_data, parsed_page.beautiful_soup)
-    other_labels = _get_sustainability_info(parsed_page.beautiful_soup)
+    energy_labels = _get_energy_labels(product_data, parsed_page.html_tree)
+    other_labels = _get_sustainability_info(parsed_page.html_tree)
 
     certificate_strings = other_labels + energy_labels
 
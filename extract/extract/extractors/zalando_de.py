@@ -251,9 +251,9 @@ def get_sustainability_strings(parsed_page: ParsedPage) -> Iterator[str]:
     """
 
     # Loop over all JSON objects on the page to find sustainability information
-    for json_file in parsed_page.beautiful_soup.findAll("script", {"type": "application/json"}):
+    for json_file in parsed_page.html_tree.xpath('//script[@type="application/json"]'):
         try:
-            json_values = [get_json_data(json_file.get_text())]
+            json_values = [get_json_data(json_file.xpath("string()"))]
         except JSONDecodeError:
             # some json structures can not be decoded, so we just continue with the next json
             continue
@@ -0,0 +1,135 @@
+import os
+from argparse import ArgumentParser
+from datetime import datetime
+from itertools import islice
+from logging import getLogger
+from multiprocessing import Pool
+from time import monotonic
+from typing import Iterator, List, Optional, Tuple
+
+from core import log
+from core.constants import ALL_SCRAPING_TABLE_NAMES
+from core.domain import PageType, Product, ScrapedPage
+from database.connection import GreenDB, Scraping
+
+from . import extract_product
+
+log.setup_logger(__name__)
+logger = getLogger(__name__)
+
+
+def _extract_row(row: Tuple[int, str, ScrapedPage]) -> Tuple[int, Optional[Product]]:
+    """
+    Helper function that is executed in the pool's processes and extracts a single row.
+
+    Args:
+        row (Tuple[int, str, ScrapedPage]): Row id, scraping table name and `ScrapedPage`
+
+    Returns:
+        Tuple[int, Optional[Product]]: Row id and extracted `Product` or `None` if extraction
+            failed
+    """
+    row_id, table_name, scraped_page = row
+
+    try:
+        return row_id, extract_product(table_name=table_name, scraped_page=scraped_page)
+
+    except Exception as error:
+        logger.error(f"Extraction of row {row_id} of table '{table_name}' failed: {error}")
+        return row_id, None
+
+
+def reprocess(
+    table: str,
+    timestamp: Optional[datetime],
+    start_id: int,
+    batch_size: int,
+    processes: int,
+) -> None:
+    """
+    Re-extracts all product pages of the given scraping `table` and `timestamp` in parallel and
+        writes the `Product`s batch-wise to the GreenDB.
+    Progress is logged after each batch, including the `id` to resume from.
+
+    Args:
+        table (str): Scraping table to re-extract
+        timestamp (Optional[datetime]): Crawl to re-extract, latest if `None`
+        start_id (int): Only rows with a greater `id` are re-extracted, used to resume
+        batch_size (int): Products per write transaction
+        processes (int): Number of extraction processes
+    """
+    scraping_connection = Scraping(table)
+    green_db_connection = GreenDB()
+
+    if timestamp is None:
+        timestamp = scraping_connection.get_latest_timestamp()
+
+    logger.info(
+        f"Re-extracting table '{table}' for timestamp '{timestamp}' "
+        f"starting after id {start_id} with {processes} processes ..."
+    )
+
+    scraped_pages = scraping_connection.get_scraped_pages_with_row_ids_for_timestamp(
+        timestamp, start_id=start_id, page_type=PageType.PRODUCT
+    )
+    rows: Iterator[Tuple[int, str, ScrapedPage]] = (
+        (row_id, table, scraped_page) for row_id, scraped_page in scraped_pages
+    )
+
+    pages_processed, products_written, started_at = 0, 0, monotonic()
+
+    with Pool(processes=processes) as pool:
+        # `imap` keeps the order of the rows, so the last id of each batch is safe to resume from
+        results = pool.imap(_extract_row, rows, chunksize=max(1, batch_size // (processes * 4)))
+
+        while batch := list(islice(results, batch_size)):
+            products: List[Product] = [product for _, product in batch if product]
+            if products:
+                green_db_connection.write_many(products, batch_size=batch_size)
+
+            pages_processed += len(batch)
+            products_written += len(products)
+            logger.info(
+                f"Processed {pages_processed} pages, wrote {products_written} products "
+                f"({pages_processed / (monotonic() - started_at):.1f} pages/s). "
+                f"Resume with '--start-id {batch[-1][0]}'."
+            )
+
+    logger.info(f"Re-extraction of table '{table}' done.")
+
+
+def start() -> None:
+    """
+    CLI implementation of the `extract` command.
+    """
+    parser = ArgumentParser(description="CLI for bulk extraction of scraped pages.")
+    subparsers = parser.add_subparsers()
+
+    # reprocess
+    reprocess_parser = subparsers.add_parser(
+        "reprocess", help="Re-extract all product pages of a crawl and write them to the GreenDB."
+    )
+    reprocess_parser.add_argument("--table", choices=ALL_SCRAPING_TABLE_NAMES, required=True)
+    reprocess_parser.add_argument(
+        "--timestamp",
+        type=datetime.fromisoformat,
+        default=None,
+        help="Timestamp of the crawl in ISO format, defaults to the latest crawl.",
+    )
+    reprocess_parser.add_argument("--start-id", type=int, default=0)
+    reprocess_parser.add_argument("--batch-size", type=int, default=1000)
+    reprocess_parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    reprocess_parser.set_defaults(command_function=reprocess)
+
+    args = parser.parse_args()
+
+    parsed_args = {
+        parameter: value
+        for parameter, value in vars(args).items()
+        if parameter != "command_function"
+    }
+
+    args.command_function(
+        # call given command function with parameters
+        **parsed_args
+    )
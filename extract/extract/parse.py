@@ -1,9 +1,17 @@
 import html
+import json
 from dataclasses import dataclass
+from functools import cached_property
 from json import JSONDecodeError
+from typing import Any, Callable, Dict, Iterator, List, Mapping
 
 import extruct
 from bs4 import BeautifulSoup
+from extruct.dublincore import DublinCoreExtractor
+from extruct.utils import parse_xmldom_html
+from extruct.w3cmicrodata import MicrodataExtractor
+from lxml.etree import XPath
+from lxml.html import HtmlElement
 
 from core.domain import ScrapedPage
 
@@ -13,30 +21,40 @@ class ParsedPage:
     """
     Helper representation that bundles the original domain object `ScrapedPage`,
     the parsed HTML of it, and the extracted schema.org information.
+    The `BeautifulSoup` representation is only built when it is accessed, prefer the faster
+    `html_tree` for lookups. The same applies for each syntax of the schema.org information.
     """
 
     scraped_page: ScrapedPage
-    beautiful_soup: BeautifulSoup
-    schema_org: dict
+    html_tree: HtmlElement
+    schema_org: Mapping[str, List[Any]]
 
+    @cached_property
+    def beautiful_soup(self) -> BeautifulSoup:
+        return BeautifulSoup(self.scraped_page.html, "html.parser")
 
-def parse_page(scraped_page: ScrapedPage) -> ParsedPage:
+
+def parse_page(scraped_page: ScrapedPage, legacy_schema_org: bool = False) -> ParsedPage:
     """
-    Parses the given `scraped_page` and extract its schema.org information.
+    Parses the given `scraped_page` once with lxml. Its schema.org information is extracted
+        from the parsed tree, each syntax only when it is accessed.
 
     Args:
         scraped_page (ScrapedPage): Domain object `ScrapedPage`
+        legacy_schema_org (bool, optional): Extract the schema.org information with
+            `extract_schema_org`, which parses the HTML again, possibly multiple times.
+            Defaults to False.
 
     Returns:
         ParsedPage: Representation that bundles the `scraped_page` with intermediate representations
     """
-    beautiful_soup = BeautifulSoup(scraped_page.html, "html.parser")
-    schema_org = extract_schema_org(scraped_page.html)
-
-    return ParsedPage(
-        scraped_page=scraped_page, beautiful_soup=beautiful_soup, schema_org=schema_org
+    html_tree = parse_xmldom_html(scraped_page.html, encoding="UTF-8")
+    schema_org = (
+        extract_schema_org(scraped_page.html) if legacy_schema_org else LazySchemaOrg(html_tree)
     )
 
+    return ParsedPage(scraped_page=scraped_page, html_tree=html_tree, schema_org=schema_org)
+
 
 DUBLINCORE = "dublincore"
 JSON_LD = "json-ld"
@@ -73,3 +91,77 @@ def extract_schema_org(page_html: str) -> dict:
             unescaped_html = page_html.encode("utf-8").decode("unicode-escape")
             schema_org = extruct.extract(unescaped_html, syntaxes=_SYNTAXES, errors="ignore")
     return schema_org if schema_org else {}
+
+
+_JSON_LD_SCRIPTS = XPath('//script[@type="application/ld+json"]')
+
+
+def _extract_json_ld(tree: HtmlElement) -> List[Any]:
+    """
+    Helper function that extracts the JSON-LD information from the `tree`'s scripts.
+    Tries the same fallbacks as `extract_schema_org` but for each script separately.
+
+    Args:
+        tree (HtmlElement): Parsed HTML of the page
+
+    Returns:
+        List[Any]: JSON-LD items found in `tree`
+    """
+    items: List[Any] = []
+
+    for script in _JSON_LD_SCRIPTS(tree):
+        text = script.xpath("string()")
+
+        # same order as `extract_schema_org`: unescaped, escaped and unicode-escaped
+        for candidate in (html.unescape(text), text):
+            try:
+                data = json.loads(candidate, strict=False)
+                break
+            except ValueError:
+                continue
+        else:
+            try:
+                data = json.loads(text.encode("utf-8").decode("unicode-escape"), strict=False)
+            except ValueError:
+                continue
+
+        if isinstance(data, list):
+            items.extend(item for item in data if item)
+        elif isinstance(data, dict) and data:
+            items.append(data)
+
+    return items
+
+
+# Maps schema.org syntax to the function that extracts it from a parsed HTML tree
+_EXTRACTOR_FOR_SYNTAX: Dict[str, Callable[[HtmlElement], List[Any]]] = {
+    DUBLINCORE: lambda tree: list(DublinCoreExtractor().extract_items(tree, base_url=None)),
+    JSON_LD: _extract_json_ld,
+    MICRODATA: lambda tree: list(MicrodataExtractor().extract_items(tree, base_url=None)),
+}
+
+
+class LazySchemaOrg(Mapping[str, List[Any]]):
+    def __init__(self, tree: HtmlElement) -> None:
+        """
+        Read-only mapping from schema.org syntax to the information found in the `tree`.
+        Each syntax is extracted when it is accessed for the first time and then cached,
+            so syntaxes an extractor does not use are never extracted.
+
+        Args:
+            tree (HtmlElement): Parsed HTML of the page, as returned by
+                `extruct.utils.parse_xmldom_html`
+        """
+        self.__tree = tree
+        self.__extracted: Dict[str, List[Any]] = {}
+
+    def __getitem__(self, syntax: str) -> List[Any]:
+        if syntax not in self.__extracted:
+            self.__extracted[syntax] = _EXTRACTOR_FOR_SYNTAX[syntax](self.__tree)
+        return self.__extracted[syntax]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_EXTRACTOR_FOR_SYNTAX)
+
+    def __len__(self) -> int:
+        return len(_EXTRACTOR_FOR_SYNTAX)
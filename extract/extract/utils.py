@@ -1,6 +1,6 @@
 import re
 from logging import getLogger
-from typing import Any, Iterable, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 from core.domain import CertificateType, ProductCategory
 from core.sustainability_labels import load_and_get_sustainability_labels
@@ -16,6 +16,50 @@ _certificate_category_names = {
 }
 
 
+def _build_certificate_for_name() -> Dict[str, Any]:
+    """
+    Helper function that maps the casefolded name of each certificate in all languages
+        to its `CertificateType`. Names of later certificates take precedence.
+
+    Returns:
+        Dict[str, Any]: Mapping of casefolded certificate name to `CertificateType`
+    """
+    return {
+        localized_certificate_info["name"].casefold(): CertificateType[
+            certificate_id.split(":")[-1]
+        ]
+        for certificate_id, localized_certificate_infos in SUSTAINABILITY_LABELS.items()
+        for localized_certificate_info in localized_certificate_infos["languages"].values()
+    }
+
+
+def _build_category_specific_certificate() -> Dict[Tuple[Any, str], str]:
+    """
+    Helper function that maps each `CertificateType` and product category to the
+        category-specific version of the certificate, if there is one.
+        If multiple versions match, the last one is used.
+
+    Returns:
+        Dict[Tuple[Any, str], str]: Mapping of `CertificateType` and product category to the
+            category-specific certificate
+    """
+    category_specific_certificate = {}
+
+    for certificate in CertificateType:  # type: ignore[attr-defined]
+        for product_category, category_alt_names in _certificate_category_names.items():
+            for label in SUSTAINABILITY_LABELS.keys():
+                for category_alt_name in category_alt_names:
+                    if re.search(f"^{certificate.value}.*{category_alt_name}$", label):
+                        category_specific_certificate[(certificate, product_category)] = label
+
+    return category_specific_certificate
+
+
+# Indexes built once, so that matching certificate strings does not scan all labels
+_CERTIFICATE_FOR_NAME = _build_certificate_for_name()
+_CATEGORY_SPECIFIC_CERTIFICATE = _build_category_specific_certificate()
+
+
 def safely_return_first_element(list_object: List[Any], else_return: Any = {}) -> Any:
     """
     Helper function to safely return the first element of `list_object` if it exists.
@@ -100,17 +144,11 @@ def sustainability_labels_to_certificates(
     if not certificate_strings:
         return None
 
-    result = dict.fromkeys(set(certificate_strings))
-
     # check all known certificates
-    for certificate_id, localized_certificate_infos in SUSTAINABILITY_LABELS.items():
-        for certificate_string in result.keys():
-            if any(
-                _get_certificate_for_any_language(
-                    localized_certificate_infos["languages"].values(), certificate_string
-                )
-            ):
-                result.update({certificate_string: CertificateType[certificate_id.split(":")[-1]]})
+    result = {
+        certificate_string: _CERTIFICATE_FOR_NAME.get(certificate_string.casefold())
+        for certificate_string in set(certificate_strings)
+    }
 
     # check custom certificate_mappings for unassigned certificate strings
     for certificate_string, certificate in result.items():
@@ -123,39 +161,13 @@ def sustainability_labels_to_certificates(
 
     # assign (general) extracted certificates to a product category-specific version, if possible
     if product_category in _certificate_category_names.keys():
-        # loop over all extracted and stored labels and potential category synonyms
         for certificate_string, certificate in result.items():
-            for label in SUSTAINABILITY_LABELS.keys():
-                for category_alt_name in _certificate_category_names.get(product_category, []):
-                    # check for a product category-specific label
-                    if re.search(f"^{certificate.value}.*{category_alt_name}$", label):  # type: ignore # noqa
-                        result.update({certificate_string: label})
+            if label := _CATEGORY_SPECIFIC_CERTIFICATE.get((certificate, product_category)):
+                result.update({certificate_string: label})
 
     return sorted(set(result.values()))  # type: ignore
 
 
-def _get_certificate_for_any_language(
-    localized_certificate_infos: list[dict], certificate_string: str
-) -> list[dict]:
-    """
-    Helper function that checks if a certificate matches in a language with a certificate name.
-
-    Args:
-        localized_certificate_infos (list[dict]): List of `dict` objects with each object
-            containing the certificate information in a specific language
-        certificate_strings (str): Function that is processing the scan result
-
-    Returns:
-        list[dict]: `list` with `dict` objects representing the matched certificate information
-            in a specific language.
-    """
-    return [
-        localized_certificate_info
-        for localized_certificate_info in localized_certificate_infos
-        if localized_certificate_info["name"].lower() == certificate_string.lower()
-    ]
-
-
 def check_and_create_attributes_list(
     attributes: Union[str, List[str], None]
 ) -> Optional[List[str]]:
@@ -1,30 +1,92 @@
+import atexit
 from logging import getLogger
+from threading import RLock, Timer
+from time import monotonic
+from types import TracebackType
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
 
 from redis import Redis
+from redis.exceptions import ResponseError
 from rq import Queue, Retry
+from rq.job import Job
+from rq.queue import EnqueueData
 
 from core import log
 from core.constants import (
     TABLE_NAME_GREEN_DB,
     WORKER_FUNCTION_EXTRACT,
+    WORKER_FUNCTION_EXTRACT_BATCH,
     WORKER_FUNCTION_INFERENCE,
+    WORKER_FUNCTION_INFERENCE_BATCH,
     WORKER_FUNCTION_SCRAPING,
+    WORKER_FUNCTION_SCRAPING_BATCH,
+    WORKER_FUNCTION_SCRAPING_UNCHANGED,
     WORKER_QUEUE_EXTRACT,
     WORKER_QUEUE_INFERENCE,
     WORKER_QUEUE_SCRAPING,
 )
-from core.domain import ScrapedPage
-from core.redis import REDIS_HOST, REDIS_PASSWORD, REDIS_PORT, REDIS_USER
+from core.domain import FreshProduct, PageValidators, ScrapedPage, UnchangedPage
+from core.html_store import HTML_STORE_PATH
+from core.redis import (
+    REDIS_HOST,
+    REDIS_JOB_BATCH_LATENCY,
+    REDIS_JOB_BATCH_SIZE,
+    REDIS_JOB_MEMORY_SAMPLE_RATE,
+    REDIS_PASSWORD,
+    REDIS_PIPELINE_LATENCY,
+    REDIS_PIPELINE_SIZE,
+    REDIS_PORT,
+    REDIS_USER,
+)
+
+from .html_store import HTMLStore
 
 log.setup_logger(__name__)
 logger = getLogger(__name__)
 
 
 class MessageQueue:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        batch_size: int = REDIS_JOB_BATCH_SIZE,
+        batch_latency: float = REDIS_JOB_BATCH_LATENCY,
+        html_store: Optional[HTMLStore] = None,
+        memory_sample_rate: int = REDIS_JOB_MEMORY_SAMPLE_RATE,
+        pipeline_size: int = REDIS_PIPELINE_SIZE,
+        pipeline_latency: float = REDIS_PIPELINE_LATENCY,
+    ) -> None:
         """
         This `class` is for convenience and to avoid duplicated implementations of the same thing.
         It offers simple access to enqueue jobs.
+
+        If `batch_size` is greater than 1, `add_scraping`, `add_extract` and `add_inference`
+            collect their items per queue and table and enqueue a single batch job once
+            `batch_size` items are collected, or at the latest `batch_latency` seconds after the
+            oldest item was collected (by a timer thread). Remaining items are enqueued by
+            calling `flush`.
+
+        If `pipeline_size` is greater than 1, jobs are buffered per queue and enqueued within a
+            single Redis pipeline once `pipeline_size` jobs are buffered, or at the latest
+            `pipeline_latency` seconds after the oldest job was buffered (by a timer thread).
+            Remaining jobs are enqueued by calling `flush`, when leaving the `with` block of the
+            `MessageQueue` or at exit of the interpreter.
+
+        If an `html_store` is used (by default if `HTML_STORE_PATH` is set), scraping jobs carry
+            only a reference to the HTML stored in the `html_store` instead of the HTML itself.
+
+        Args:
+            batch_size (int, optional): Maximum number of items per job. Defaults to
+                `REDIS_JOB_BATCH_SIZE`.
+            batch_latency (float, optional): Maximum seconds an item waits for its batch.
+                Defaults to `REDIS_JOB_BATCH_LATENCY`.
+            html_store (Optional[HTMLStore], optional): Store for the HTML of scraping jobs.
+                Defaults to None.
+            memory_sample_rate (int, optional): Measure Redis memory of every n-th job.
+                Defaults to `REDIS_JOB_MEMORY_SAMPLE_RATE`.
+            pipeline_size (int, optional): Maximum number of jobs per Redis pipeline.
+                Defaults to `REDIS_PIPELINE_SIZE`.
+            pipeline_latency (float, optional): Maximum seconds a job is buffered.
+                Defaults to `REDIS_PIPELINE_LATENCY`.
         """
         self.__redis_connection = Redis(
             host=REDIS_HOST, port=REDIS_PORT, password=REDIS_PASSWORD, username=REDIS_USER
@@ -34,22 +96,346 @@ class MessageQueue:
         self.__extract_queue = Queue(WORKER_QUEUE_EXTRACT, connection=self.__redis_connection)
         self.__inference_queue = Queue(WORKER_QUEUE_INFERENCE, connection=self.__redis_connection)
 
+        self.batch_size = batch_size
+        self.batch_latency = batch_latency
+
+        if html_store is None and HTML_STORE_PATH:
+            html_store = HTMLStore()
+        self.html_store = html_store
+
+        # Maps queue name to number of enqueued jobs and number and total bytes of sampled jobs
+        self.memory_sample_rate = memory_sample_rate
+        self.__job_memory_statistics: Dict[str, Dict[str, int]] = {}
+
+        # Maps (queue name, table name) to the time the batch was started and its items
+        self.__batches: Dict[Tuple[str, str], Tuple[float, List[Any]]] = {}
+        self.__batches_lock = RLock()
+        self.__batch_flush_timer: Optional[Timer] = None
+
+        self.__enqueue_batch_for: Dict[str, Callable[[str, List[Any]], None]] = {
+            # scraping batches hold tuples of the scraped page, its validators and its mark
+            WORKER_QUEUE_SCRAPING: lambda table_name, pages: self.add_scraping_batch(
+                table_name,
+                [scraped_page for scraped_page, _, _ in pages],
+                page_validators=[page_validators for _, page_validators, _ in pages],
+                fresh_products=[fresh_product for _, _, fresh_product in pages],
+            ),
+            WORKER_QUEUE_EXTRACT: self.add_extract_batch,
+            WORKER_QUEUE_INFERENCE: lambda table_name, row_ids: self.add_inference_batch(
+                row_ids, table_name=table_name
+            ),
+        }
+
+        # Maps queue name to the time the oldest job was buffered and the buffered jobs
+        self.pipeline_size = pipeline_size
+        self.pipeline_latency = pipeline_latency
+        self.__buffered_jobs: Dict[str, Tuple[float, List[EnqueueData]]] = {}
+        self.__buffered_jobs_lock = RLock()
+        self.__flush_timer: Optional[Timer] = None
+        self.__queue_for: Dict[str, Queue] = {
+            queue.name: queue
+            for queue in [self.__scraping_queue, self.__extract_queue, self.__inference_queue]
+        }
+
+        # buffered jobs must not get lost if the owner forgets to call `flush`
+        atexit.register(self.flush)
+
         logger.info("Redis connection established and message queues initialized.")
 
-    def add_scraping(self, table_name: str, scraped_page: ScrapedPage) -> None:
+    def __enter__(self) -> "MessageQueue":
+        return self
+
+    def __exit__(
+        self,
+        exception_type: Optional[Type[BaseException]],
+        exception: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.flush()
+
+    def __enqueue(
+        self,
+        queue: Queue,
+        function_name: str,
+        args: Tuple[Any, ...],
+        job_timeout: int,
+        kwargs: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Helper method that enqueues a job, or buffers it if pipelined enqueue is enabled.
+
+        Args:
+            queue (Queue): `Queue` to enqueue the job to
+            function_name (str): Worker function that executes the job
+            args (Tuple[Any, ...]): Positional arguments of the worker function
+            job_timeout (int): Seconds after which the job is considered failed
+            kwargs (Optional[Dict[str, Any]], optional): Keyword arguments of the worker function.
+                Defaults to None.
+        """
+        job_data = Queue.prepare_data(
+            function_name,
+            args=args,
+            kwargs=kwargs,
+            timeout=job_timeout,
+            result_ttl=1,
+            retry=Retry(max=5, interval=30),
+        )
+
+        if self.pipeline_size <= 1:
+            self.__record_jobs(queue.name, queue.enqueue_many([job_data]))
+            return
+
+        with self.__buffered_jobs_lock:
+            buffered_at, job_datas = self.__buffered_jobs.setdefault(queue.name, (monotonic(), []))
+            job_datas.append(job_data)
+
+            if (
+                len(job_datas) >= self.pipeline_size
+                or monotonic() - buffered_at >= self.pipeline_latency
+            ):
+                del self.__buffered_jobs[queue.name]
+                self.__record_jobs(queue.name, queue.enqueue_many(job_datas))
+
+            elif self.__flush_timer is None:
+                # enqueues the buffered jobs in time, even if no further job is enqueued
+                self.__flush_timer = Timer(self.pipeline_latency, self.__flush_jobs_on_time)
+                self.__flush_timer.daemon = True
+                self.__flush_timer.start()
+
+    def __flush_jobs_on_time(self) -> None:
+        """
+        Helper method that is executed by the flush timer and enqueues all buffered jobs.
+        """
+        with self.__buffered_jobs_lock:
+            self.__flush_timer = None
+
+            try:
+                self.__flush_jobs()
+            except Exception:
+                logger.exception("Could not enqueue buffered jobs.")
+
+    def __flush_jobs(self) -> None:
+        """
+        Helper method that enqueues all buffered jobs, one Redis pipeline per queue.
+        """
+        with self.__buffered_jobs_lock:
+            buffered_jobs, self.__buffered_jobs = self.__buffered_jobs, {}
+
+            for queue_name, (_, job_datas) in buffered_jobs.items():
+                self.__record_jobs(queue_name, self.__queue_for[queue_name].enqueue_many(job_datas))
+
+    def __record_jobs(self, queue_name: str, jobs: List[Job]) -> None:
+        """
+        Helper method that counts the enqueued `jobs` and samples the Redis memory they use.
+
+        Args:
+            queue_name (str): Name of the `Queue` the `jobs` were enqueued to
+            jobs (List[Job]): Enqueued jobs
+        """
+        statistics = self.__job_memory_statistics.setdefault(
+            queue_name, {"jobs": 0, "sampled_jobs": 0, "sampled_bytes": 0}
+        )
+
+        for job in jobs:
+            statistics["jobs"] += 1
+
+            if self.memory_sample_rate and (statistics["jobs"] - 1) % self.memory_sample_rate == 0:
+                try:
+                    job_bytes = self.__redis_connection.memory_usage(job.key) or 0
+                except ResponseError:
+                    logger.warning(
+                        "Redis does not support 'MEMORY USAGE', disable job memory sampling."
+                    )
+                    self.memory_sample_rate = 0
+                    continue
+
+                statistics["sampled_jobs"] += 1
+                statistics["sampled_bytes"] += job_bytes
+                logger.debug(f"Job '{job.func_name}' uses {job_bytes} bytes of Redis memory.")
+
+    def get_job_memory_statistics(self) -> Dict[str, Dict[str, float]]:
+        """
+        Fetch statistics about the Redis memory used by the jobs enqueued by this instance.
+        Only every `memory_sample_rate`-th job is measured.
+
+        Returns:
+            Dict[str, Dict[str, float]]: For each queue: number of enqueued `jobs`,
+                number of `sampled_jobs` and their `mean_bytes_per_job`
+        """
+        return {
+            queue_name: {
+                "jobs": statistics["jobs"],
+                "sampled_jobs": statistics["sampled_jobs"],
+                "mean_bytes_per_job": statistics["sampled_bytes"] / statistics["sampled_jobs"]
+                if statistics["sampled_jobs"]
+                else 0.0,
+            }
+            for queue_name, statistics in self.__job_memory_statistics.items()
+        }
+
+    def __add_to_batch(self, queue_name: str, table_name: str, item: Any) -> None:
+        """
+        Helper method that adds `item` to the batch of `queue_name` and `table_name` and
+            enqueues the batch if it is full or too old.
+
+        Args:
+            queue_name (str): `Queue` the batch job will be enqueued to
+            table_name (str): Table name all items of the batch belong to
+            item (Any): Item to add to the batch
+        """
+        key = (queue_name, table_name)
+
+        with self.__batches_lock:
+            started_at, items = self.__batches.setdefault(key, (monotonic(), []))
+            items.append(item)
+
+            if len(items) >= self.batch_size or monotonic() - started_at >= self.batch_latency:
+                del self.__batches[key]
+                self.__enqueue_batch_for[queue_name](table_name, items)
+
+            elif self.__batch_flush_timer is None:
+                # enqueues the collected items in time, even if no further item is added
+                self.__batch_flush_timer = Timer(self.batch_latency, self.__flush_batches_on_time)
+                self.__batch_flush_timer.daemon = True
+                self.__batch_flush_timer.start()
+
+    def __flush_batches_on_time(self) -> None:
+        """
+        Helper method that is executed by the batch flush timer and enqueues all batches.
+        """
+        with self.__batches_lock:
+            self.__batch_flush_timer = None
+
+            try:
+                self.__flush_batches()
+            except Exception:
+                logger.exception("Could not enqueue collected batches.")
+
+    def __flush_batches(self) -> None:
+        """
+        Helper method that enqueues all incompletely collected batches.
+        """
+        with self.__batches_lock:
+            batches, self.__batches = self.__batches, {}
+
+            for (queue_name, table_name), (_, items) in batches.items():
+                self.__enqueue_batch_for[queue_name](table_name, items)
+
+    def flush(self) -> None:
+        """
+        Enqueue all incompletely collected batches and all buffered jobs.
+        Call this before shutting down.
+        """
+        self.__flush_batches()
+        self.__flush_jobs()
+
+    def add_scraping(
+        self,
+        table_name: str,
+        scraped_page: ScrapedPage,
+        page_validators: Optional[PageValidators] = None,
+        fresh_product: Optional[FreshProduct] = None,
+    ) -> None:
         """
         Enqueue job to "scraping" `Queue`.
 
         Args:
             table_name (str): Table name to insert the given `scraped_page`
             scraped_page (ScrapedPage): Domain object representation to add to scraping table
+            page_validators (Optional[PageValidators], optional): Validators of the page, stored
+                by the worker once `scraped_page` is written. Defaults to None.
+            fresh_product (Optional[FreshProduct], optional): Mark of the fetched product page,
+                stored by the worker once `scraped_page` is written. Defaults to None.
         """
-        self.__scraping_queue.enqueue(
+        if self.batch_size > 1:
+            self.__add_to_batch(
+                WORKER_QUEUE_SCRAPING, table_name, (scraped_page, page_validators, fresh_product)
+            )
+            return
+
+        kwargs: Dict[str, Any] = {}
+        if page_validators:
+            kwargs["page_validators"] = page_validators
+        if fresh_product:
+            kwargs["fresh_product"] = fresh_product
+
+        if self.html_store:
+            kwargs["html_reference"] = self.html_store.put(scraped_page.html)
+            scraped_page = scraped_page.model_copy(update={"html": ""})
+
+        self.__enqueue(
+            self.__scraping_queue,
             WORKER_FUNCTION_SCRAPING,
             args=(table_name, scraped_page),
+            kwargs=kwargs or None,
+            job_timeout=10,
+        )
+
+    def add_scraping_batch(
+        self,
+        table_name: str,
+        scraped_pages: List[ScrapedPage],
+        page_validators: Optional[List[Optional[PageValidators]]] = None,
+        fresh_products: Optional[List[Optional[FreshProduct]]] = None,
+    ) -> None:
+        """
+        Enqueue a single job for all `scraped_pages` to "scraping" `Queue`.
+
+        Args:
+            table_name (str): Table name to insert the given `scraped_pages`
+            scraped_pages (List[ScrapedPage]): Domain object representations to add to
+                scraping table
+            page_validators (Optional[List[Optional[PageValidators]]], optional): Validators of
+                each of the `scraped_pages`, stored by the worker once they are written.
+                Defaults to None.
+            fresh_products (Optional[List[Optional[FreshProduct]]], optional): Marks of each of
+                the `scraped_pages`, stored by the worker once they are written.
+                Defaults to None.
+        """
+        kwargs: Dict[str, Any] = {}
+        if page_validators and any(page_validators):
+            kwargs["page_validators"] = page_validators
+        if fresh_products and any(fresh_products):
+            kwargs["fresh_products"] = fresh_products
+
+        if self.html_store:
+            kwargs["html_references"] = [
+                self.html_store.put(scraped_page.html) for scraped_page in scraped_pages
+            ]
+            scraped_pages = [
+                scraped_page.model_copy(update={"html": ""}) for scraped_page in scraped_pages
+            ]
+
+        self.__enqueue(
+            self.__scraping_queue,
+            WORKER_FUNCTION_SCRAPING_BATCH,
+            args=(table_name, scraped_pages),
+            kwargs=kwargs or None,
+            job_timeout=10 * len(scraped_pages),
+        )
+
+    def add_unchanged_page(
+        self,
+        table_name: str,
+        unchanged_page: UnchangedPage,
+        fresh_product: Optional[FreshProduct] = None,
+    ) -> None:
+        """
+        Enqueue job to "scraping" `Queue` that records the `unchanged_page`.
+        The job is small and never batched, no extract job follows it.
+
+        Args:
+            table_name (str): Scraping table name the page was stored in
+            unchanged_page (UnchangedPage): Domain object representation of the unchanged page
+            fresh_product (Optional[FreshProduct], optional): Mark of the fetched product page,
+                stored by the worker once `unchanged_page` is written. Defaults to None.
+        """
+        self.__enqueue(
+            self.__scraping_queue,
+            WORKER_FUNCTION_SCRAPING_UNCHANGED,
+            args=(table_name, unchanged_page),
+            kwargs={"fresh_product": fresh_product} if fresh_product else None,
             job_timeout=10,
-            result_ttl=1,
-            retry=Retry(max=5, interval=30),
         )
 
     def add_extract(self, table_name: str, row_id: int) -> None:
@@ -60,12 +446,30 @@ class MessageQueue:
             table_name (str): Table name to fetch the `ScrapedPage` from
             row_id (int): id of the to-be-extracted-row
         """
-        self.__extract_queue.enqueue(
+        if self.batch_size > 1:
+            self.__add_to_batch(WORKER_QUEUE_EXTRACT, table_name, row_id)
+            return
+
+        self.__enqueue(
+            self.__extract_queue,
             WORKER_FUNCTION_EXTRACT,
             args=(table_name, row_id),
             job_timeout=10,
-            result_ttl=1,
-            retry=Retry(max=5, interval=30),
+        )
+
+    def add_extract_batch(self, table_name: str, row_ids: List[int]) -> None:
+        """
+        Enqueue a single job for all `row_ids` to "extract" `Queue`.
+
+        Args:
+            table_name (str): Table name to fetch the `ScrapedPage`s from
+            row_ids (List[int]): ids of the to-be-extracted-rows
+        """
+        self.__enqueue(
+            self.__extract_queue,
+            WORKER_FUNCTION_EXTRACT_BATCH,
+            args=(table_name, row_ids),
+            job_timeout=10 * len(row_ids),
         )
 
     # TODO: table name is not used within code, but needed for log messages
@@ -77,10 +481,30 @@ class MessageQueue:
             table_name (str): Table name used for logging purposes.
             row_id (int): id of the row used for inference.
         """
-        self.__inference_queue.enqueue(
+        if self.batch_size > 1:
+            self.__add_to_batch(WORKER_QUEUE_INFERENCE, table_name, row_id)
+            return
+
+        self.__enqueue(
+            self.__inference_queue,
             WORKER_FUNCTION_INFERENCE,
             args=(row_id, table_name),
             job_timeout=30,
-            result_ttl=1,
-            retry=Retry(max=5, interval=30),
+        )
+
+    def add_inference_batch(
+        self, row_ids: List[int], table_name: str = TABLE_NAME_GREEN_DB
+    ) -> None:
+        """
+        Enqueue a single job for all `row_ids` to "inference" `Queue`.
+
+        Args:
+            table_name (str): Table name used for logging purposes.
+            row_ids (List[int]): ids of the rows used for inference.
+        """
+        self.__enqueue(
+            self.__inference_queue,
+            WORKER_FUNCTION_INFERENCE_BATCH,
+            args=(row_ids, table_name),
+            job_timeout=30 * len(row_ids),
         )
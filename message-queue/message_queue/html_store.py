@@ -0,0 +1,93 @@
+import gzip
+import os
+from logging import getLogger
+from pathlib import Path
+from typing import Optional
+from uuid import uuid4
+
+from core.html_store import HTML_STORE_COMPRESSION_LEVEL, HTML_STORE_PATH
+
+logger = getLogger(__name__)
+
+
+class HTMLStore:
+    def __init__(
+        self,
+        path: Optional[str] = HTML_STORE_PATH,
+        compression_level: int = HTML_STORE_COMPRESSION_LEVEL,
+    ) -> None:
+        """
+        Stores gzip compressed HTML as files below `path`, which should be shared by all
+            processes that enqueue and execute scraping jobs.
+        Jobs then only carry the returned reference instead of the HTML (claim-check pattern).
+
+        Args:
+            path (Optional[str], optional): Root directory of the store. Defaults to
+                `HTML_STORE_PATH`.
+            compression_level (int, optional): gzip compression level. Defaults to
+                `HTML_STORE_COMPRESSION_LEVEL`.
+        """
+        if not path:
+            error_message = "'HTML_STORE_PATH' needs to be set to use the HTML store."
+            logger.error(error_message)
+            raise ValueError(error_message)
+
+        self.__path = Path(path)
+        self.__compression_level = compression_level
+
+    def __get_file_path(self, reference: str) -> Path:
+        """
+        Helper method that maps a `reference` to its file. Files are spread over sub directories
+            to keep directory listings small.
+
+        Args:
+            reference (str): Reference returned by `put`
+
+        Returns:
+            Path: File path of the `reference`
+        """
+        return self.__path / reference[:2] / f"{reference}.html.gz"
+
+    def put(self, html: str) -> str:
+        """
+        Compresses and stores `html`.
+
+        Args:
+            html (str): HTML to store
+
+        Returns:
+            str: Reference to fetch the `html` with `get`
+        """
+        reference = uuid4().hex
+        file_path = self.__get_file_path(reference)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # write to a temporary file first, so readers never see incomplete files
+        temporary_file_path = file_path.with_suffix(".tmp")
+        temporary_file_path.write_bytes(
+            gzip.compress(html.encode("utf-8"), compresslevel=self.__compression_level)
+        )
+        os.replace(temporary_file_path, file_path)
+
+        return reference
+
+    def get(self, reference: str) -> str:
+        """
+        Fetches and decompresses the HTML stored as `reference`.
+
+        Args:
+            reference (str): Reference returned by `put`
+
+        Returns:
+            str: The stored HTML
+        """
+        return gzip.decompress(self.__get_file_path(reference).read_bytes()).decode("utf-8")
+
+    def delete(self, reference: str) -> None:
+        """
+        Deletes the HTML stored as `reference`, if it exists.
+
+        Args:
+            reference (str): Reference returned by `put`
+        """
+        self.__get_file_path(reference).unlink(missing_ok=True)
@@ -0,0 +1,26 @@
+from threading import Event
+from typing import List, Tuple
+
+import pytest
+from message_queue import MessageQueue
+
+
+def test_incomplete_batches_are_enqueued_after_batch_latency(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    enqueued: List[Tuple[str, List[int]]] = []
+    batch_enqueued = Event()
+
+    def add_extract_batch(_: MessageQueue, table_name: str, row_ids: List[int]) -> None:
+        enqueued.append((table_name, row_ids))
+        batch_enqueued.set()
+
+    monkeypatch.setattr(MessageQueue, "add_extract_batch", add_extract_batch)
+    message_queue = MessageQueue(batch_size=10, batch_latency=0.2, pipeline_size=1)
+
+    message_queue.add_extract("otto_de", 1)
+    assert not enqueued
+
+    # without further items or a call of `flush`
+    assert batch_enqueued.wait(timeout=5)
+    assert enqueued == [("otto_de", [1])]
@@ -0,0 +1,149 @@
+"""
+Micro-benchmark of the post-processing of predicted probabilities at several batch sizes.
+
+Compares the previous row-wise `probs_to_ProductClassifications` and `apply_shop_thresholds`
+with the current vectorised ones, on random probabilities and the bootstrapped shop thresholds.
+Both have to return the same classifications. No model is loaded. Run from the
+`product-classification` directory:
+
+    python benchmarks/postprocessing.py
+"""
+from argparse import ArgumentParser
+from time import perf_counter
+from typing import Callable, List, Optional
+
+import numpy as np
+import pandas as pd
+from product_classification.InferenceEngine import InferenceEngine, le
+from product_classification.utils import to_df
+
+from core.constants import PRODUCT_CLASSIFICATION_MODEL
+from core.domain import ProductClassification
+from core.product_classification_thresholds.bootstrap_database import thresholds
+
+
+def _legacy_probs_to_ProductClassifications(
+    engine: InferenceEngine, probas: pd.DataFrame
+) -> pd.DataFrame:
+    probas.columns = le.inverse_transform(probas.columns)
+    predicted_category = [probas.columns[np.argmax(p)] for p in probas.values]
+    confidence = [np.max(p) for p in probas.values]
+
+    return pd.DataFrame(
+        {
+            "id": probas.index,
+            "ml_model_name": engine.name,
+            "predicted_category": predicted_category,
+            "confidence": confidence,
+            "all_predicted_probabilities": probas.to_dict(orient="records"),
+        }
+    )
+
+
+def _legacy_apply_shop_thresholds(
+    engine: InferenceEngine,
+    classification_df: pd.DataFrame,
+    product_df: Optional[pd.DataFrame] = None,
+) -> pd.DataFrame:
+    fallback_thresh_by_category = (
+        engine.shop_thresholds.groupby("predicted_category")["threshold"].agg(min).to_dict()
+    )
+    fallback_thresholds = classification_df["predicted_category"].apply(
+        lambda x: fallback_thresh_by_category.get(x)
+    )
+
+    if product_df is not None and {"source", "merchant"}.issubset(set(product_df.columns)):
+        combined = classification_df.join(product_df, on="id", lsuffix="_cls")
+        join_keys = ["ml_model_name", "source", "merchant", "predicted_category"]
+        combined = combined.join(engine.shop_thresholds.set_index(join_keys), on=join_keys)
+        combined["threshold"] = combined["threshold"].fillna(fallback_thresholds)
+    else:
+        combined = pd.concat([classification_df, fallback_thresholds.rename("threshold")], axis=1)
+
+    combined["category_thresholded"] = combined.apply(
+        lambda x: x["predicted_category"]
+        if x["confidence"] >= x["threshold"]
+        else "under_threshold",
+        axis=1,
+    )
+
+    return combined[
+        list(ProductClassification.model_fields.keys()) + ["category_thresholded", "threshold"]
+    ]
+
+
+def _random_batch(
+    engine: InferenceEngine, batch_size: int, random: np.random.Generator
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    # peaked probabilities, so that some predictions reach their threshold and others do not
+    logits = random.normal(size=(batch_size, len(engine.classes))) * 8
+    probabilities = np.exp(logits) / np.exp(logits).sum(axis=1, keepdims=True)
+    probas = pd.DataFrame(probabilities, columns=range(len(engine.classes)))
+
+    # products of known and unknown shops
+    shops = list(engine.shop_thresholds[["source", "merchant"]].drop_duplicates().itertuples())
+    shop = random.integers(len(shops) + 1, size=batch_size)
+    product_df = pd.DataFrame(
+        {
+            "id": range(batch_size),
+            "source": [shops[i].source if i < len(shops) else "unknown" for i in shop],
+            "merchant": [shops[i].merchant if i < len(shops) else "unknown" for i in shop],
+        }
+    )
+    return probas, product_df.set_index("id", drop=False).rename_axis(None)
+
+
+def _best_ms(function: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started_at = perf_counter()
+        function()
+        timings.append(perf_counter() - started_at)
+    return min(timings) * 1000
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 100, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    engine = InferenceEngine(PRODUCT_CLASSIFICATION_MODEL, "", to_df(thresholds))
+    random = np.random.default_rng(42)
+
+    # Maps column name to the post-processing of a batch, as in `run_pipeline`
+    postprocess_for_column: List[tuple[str, Callable[[pd.DataFrame, pd.DataFrame], pd.DataFrame]]]
+    postprocess_for_column = [
+        (
+            "legacy",
+            lambda probas, product_df: _legacy_apply_shop_thresholds(
+                engine, _legacy_probs_to_ProductClassifications(engine, probas), product_df
+            ),
+        ),
+        (
+            "vectorised",
+            lambda probas, product_df: engine.apply_shop_thresholds(
+                engine.probs_to_ProductClassifications(probas), product_df
+            ),
+        ),
+    ]
+
+    print(f"{'batch size':>10}" + "".join(f"{c:>14}" for c, _ in postprocess_for_column))
+    for batch_size in args.batch_sizes:
+        probas, product_df = _random_batch(engine, batch_size, random)
+
+        legacy, vectorised = [
+            postprocess(probas.copy(), product_df) for _, postprocess in postprocess_for_column
+        ]
+        pd.testing.assert_frame_equal(legacy, vectorised)
+
+        timings = [
+            _best_ms(lambda: postprocess(probas.copy(), product_df), args.repeat)
+            for _, postprocess in postprocess_for_column
+        ]
+        print(f"{batch_size:>10}" + "".join(f"{t:>14.1f}" for t in timings))
+    print("(ms/batch)")
+
+
+if __name__ == "__main__":
+    main()
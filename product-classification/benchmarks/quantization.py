@@ -0,0 +1,101 @@
+"""
+Accuracy parity and latency of the quantized model compared with the full precision model.
+
+Classifies a sample of the latest products with both backends and compares their predicted
+categories with the stored classifications of `PRODUCT_CLASSIFICATION_MODEL`, then measures the
+latency and throughput per batch size. Needs the model files and a GreenDB connection.
+Run from the `product-classification` directory:
+
+    python benchmarks/quantization.py --model-dir <model directory>
+"""
+from argparse import ArgumentParser
+from itertools import islice
+from time import perf_counter
+from typing import Callable
+
+import pandas as pd
+import torch
+from product_classification.InferenceEngine import InferenceEngine
+from product_classification.main import _to_product_df
+from product_classification.utils import to_df
+
+from core.constants import PRODUCT_CLASSIFICATION_MODEL
+from core.product_classification import PRODUCT_CLASSIFICATION_MODEL_DIR
+from database.connection import GreenDB
+
+
+def _best_ms(function: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started_at = perf_counter()
+        function()
+        timings.append(perf_counter() - started_at)
+    return min(timings) * 1000
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--model-dir", default=PRODUCT_CLASSIFICATION_MODEL_DIR)
+    parser.add_argument("--sample-size", type=int, default=2000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 32, 256])
+    parser.add_argument("--threads", type=int, default=torch.get_num_threads())
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    torch.set_num_threads(args.threads)
+
+    green_db_connection = GreenDB()
+    products = list(
+        islice(
+            green_db_connection.get_products_with_row_ids(
+                green_db_connection.get_latest_timestamp()
+            ),
+            args.sample_size,
+        )
+    )
+    stored = pd.DataFrame(
+        [
+            product_classification.model_dump()
+            for product_classification in green_db_connection.get_product_classifications_with_ids(
+                [row_id for row_id, _ in products]
+            )
+        ]
+    ).set_index("id")
+    # the test set: products with a stored classification of the current model
+    products = [(row_id, product) for row_id, product in products if row_id in stored.index]
+    shop_thresholds = to_df(green_db_connection.get_latest_product_classification_thresholds())
+
+    print(f"{len(products)} products classified by '{PRODUCT_CLASSIFICATION_MODEL}'")
+    print(
+        f"{'backend':<10}{'agreement':>10}{'load s':>8}"
+        + "".join(
+            f"{f'ms@{batch_size}':>10}{f'p/s@{batch_size}':>10}" for batch_size in args.batch_sizes
+        )
+    )
+    for backend, quantize in [("full", False), ("quantized", True)]:
+        inference_engine = InferenceEngine(
+            PRODUCT_CLASSIFICATION_MODEL, args.model_dir, shop_thresholds, quantize=quantize
+        )
+        metrics = inference_engine.warm_up()
+
+        batches = []
+        for start in range(0, len(products), 256):
+            end = start + 256
+            batches.append(inference_engine.classify(_to_product_df(products[start:end])))
+        classifications = pd.concat(batches).set_index("id")
+        agreement = (
+            classifications["predicted_category"]
+            == stored.loc[classifications.index, "predicted_category"]
+        ).mean()
+
+        row = f"{backend:<10}{agreement:>10.2%}"
+        row += f"{metrics['model_load_seconds']:>8.1f}"
+        for batch_size in args.batch_sizes:
+            df = _to_product_df(products[:batch_size])
+            milliseconds = _best_ms(lambda: inference_engine.predict_probabilities(df), args.repeat)
+            row += f"{milliseconds:>10.1f}{len(df) / milliseconds * 1000:>10.1f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Micro-benchmark of the (de)serialization of a classification request at several batch sizes.
+
+Compares the JSON format (a JSON string of the products wrapped in JSON, records of
+classifications back) with the Arrow IPC stream format, both ways, without the inference itself.
+Run from the `product-classification` directory:
+
+    python benchmarks/serialization.py
+"""
+import json
+from argparse import ArgumentParser
+from io import StringIO
+from time import perf_counter
+from typing import Callable, List
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from product_classification.InferenceEngine import MODEL_CLASSES
+from product_classification.utils import from_arrow, to_arrow
+
+
+def _json_round_trip(records: List[dict], classification_df: pd.DataFrame) -> List[dict]:
+    # client: `json=` of the previous workers' request
+    body = json.dumps(pd.DataFrame.from_records(records).to_json())
+    # server: `request.get_json()` and `InferenceEngine.eval_request`
+    pd.read_json(StringIO(json.loads(body)))
+    # server: response, client: `json.loads`
+    return json.loads(classification_df.to_json(orient="records"))
+
+
+def _arrow_round_trip(records: List[dict], classification_df: pd.DataFrame) -> List[dict]:
+    # client: as in the workers' request
+    table = pa.Table.from_pylist(records)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    # server: `from_arrow` and `to_arrow` of the response
+    from_arrow(sink.getvalue().to_pybytes())
+    body = to_arrow(classification_df)
+    # client: records of the response
+    return pa.ipc.open_stream(body).read_all().to_pylist()
+
+
+def _best_ms(function: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started_at = perf_counter()
+        function()
+        timings.append(perf_counter() - started_at)
+    return min(timings) * 1000
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    random = np.random.default_rng(42)
+
+    print(f"{'batch size':>10}{'json':>14}{'arrow':>14}")
+    for batch_size in args.batch_sizes:
+        records = [
+            {"name": f"product {i}", "description": "a product description " * 20, "id": i}
+            for i in range(batch_size)
+        ]
+        probabilities = random.dirichlet(np.ones(len(MODEL_CLASSES)), size=batch_size)
+        classification_df = pd.DataFrame(
+            {
+                "id": range(batch_size),
+                "ml_model_name": "model",
+                "predicted_category": np.array(MODEL_CLASSES)[probabilities.argmax(axis=1)],
+                "confidence": probabilities.max(axis=1),
+                "all_predicted_probabilities": [
+                    dict(zip(MODEL_CLASSES, row)) for row in probabilities.tolist()
+                ],
+            }
+        )
+
+        timings = [
+            _best_ms(lambda: round_trip(records, classification_df), args.repeat)
+            for round_trip in [_json_round_trip, _arrow_round_trip]
+        ]
+        print(f"{batch_size:>10}" + "".join(f"{t:>14.1f}" for t in timings))
+    print("(ms/request)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,21 @@
 import logging
-from typing import Optional
+import resource
+import threading
+from time import perf_counter
+from typing import Dict, Optional
 
 import numpy as np
 import pandas as pd
+import torch
 from autogluon.multimodal import MultiModalPredictor
 from sklearn.preprocessing import LabelEncoder
 
 from core.constants import PRODUCT_CLASSIFICATION_MODEL_FEATURES
 from core.domain import ProductClassification
+from database.connection import GreenDB
+
+from .batching import MicroBatcher
+from .cache import PredictionCache
 
 logger = logging.getLogger("waitress")
 logger.setLevel(logging.INFO)
@@ -61,28 +69,140 @@ MODEL_CLASSES = [
 le = LabelEncoder()
 le.fit(MODEL_CLASSES)
 
+# Products predicted by `InferenceEngine.warm_up`
+WARM_UP_PRODUCTS = pd.DataFrame(
+    {
+        "id": [0, 1],
+        "name": ["sneakers blue", "t-shirt red"],
+        "description": ["blue sneakers", "red t-shirt"],
+    }
+)
+
+SHOP_THRESHOLD_KEYS = ["ml_model_name", "source", "merchant", "predicted_category"]
+
 
 class InferenceEngine:
     """A class to load the XLM from autogluon and perform inference."""
 
-    def __init__(self, model_name: str, model_path: str, shop_thresholds: pd.DataFrame):
+    def __init__(
+        self,
+        model_name: str,
+        model_path: str,
+        shop_thresholds: pd.DataFrame,
+        quantize: bool = False,
+    ):
         """
         Args:
             model_name (str): The name of the model.
             model_path (str): The path to the model on the system.
             shop_thresholds (pd.DataFrame): The thresholds for each shop to use for thresholding.
+            quantize (bool): Whether to quantize the model's linear layers to int8 after loading.
         """
         self.name = model_name
         self.path = model_path
+        self.quantize = quantize
         self.shop_thresholds = shop_thresholds
         self.classes = MODEL_CLASSES
+
+        # use smallest threshold from all shops as fallback if a shop/category was not present
+        # during evaluation
+        self.__fallback_thresholds = shop_thresholds.groupby("predicted_category")[
+            "threshold"
+        ].min()
+        self.__thresholds_by_shop = shop_thresholds.set_index(SHOP_THRESHOLD_KEYS)["threshold"]
         self.model = None
+        self.model_metrics: Dict[str, float] = {}
+        self.__model_lock = threading.Lock()
+        self.batcher: Optional[MicroBatcher] = None
+        self.cache: Optional[PredictionCache] = None
 
     def load_model(self) -> None:
+        """
+        Loads the model, quantizes it if enabled and records the seconds it took and the increase
+        of the peak memory (resident set size) in `model_metrics`.
+        """
+        started_at = perf_counter()
+        max_rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
         self.model = MultiModalPredictor.load(self.path)
         if self.model is not None:
             self.model.set_num_gpus(0)
 
+            if self.quantize:
+                # weights are stored as int8, activations are quantized on the fly
+                self.model._model = torch.quantization.quantize_dynamic(
+                    self.model._model, {torch.nn.Linear}, dtype=torch.qint8
+                )
+
+        # `ru_maxrss` is given in kilobytes on linux
+        self.model_metrics["model_load_seconds"] = perf_counter() - started_at
+        self.model_metrics["model_memory_mb"] = (
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - max_rss_before
+        ) / 1024
+        logger.info(
+            f"Loaded model '{self.name}' in {self.model_metrics['model_load_seconds']:.1f}s "
+            f"using {self.model_metrics['model_memory_mb']:.0f}MB."
+        )
+
+    def warm_up(self) -> Dict[str, float]:
+        """
+        Loads the model and predicts `WARM_UP_PRODUCTS`, so that the first request does not pay
+        the model loading and the initialization of the first prediction.
+
+        Raises:
+            ValueError: If the model failed to load.
+
+        Returns:
+            Dict[str, float]: `model_metrics` with the seconds of loading the model, its memory
+                and the seconds of the warm-up prediction.
+        """
+        with self.__model_lock:
+            if self.model is None:
+                self.load_model()
+
+        started_at = perf_counter()
+        if len(self.predict_probabilities(WARM_UP_PRODUCTS)) != len(WARM_UP_PRODUCTS):
+            logger.error(f"Warm-up of model '{self.name}' failed.")
+            raise ValueError(f"Warm-up of model '{self.name}' failed.")
+
+        self.model_metrics["warm_up_seconds"] = perf_counter() - started_at
+        logger.info(f"Warmed up model in {self.model_metrics['warm_up_seconds']:.1f}s.")
+        return self.model_metrics
+
+    def enable_micro_batching(
+        self, max_batch_size: int, max_wait_ms: float, max_queue_depth: int
+    ) -> MicroBatcher:
+        """
+        Coalesces the predictions of concurrent `run_pipeline` calls into batches,
+        see `MicroBatcher`.
+
+        Args:
+            max_batch_size (int): Maximum number of products per batch.
+            max_wait_ms (float): Maximum milliseconds a request waits for further requests.
+            max_queue_depth (int): Maximum number of requests waiting for inference.
+
+        Returns:
+            MicroBatcher: The batcher used by `run_pipeline`, e.g., to fetch its metrics.
+        """
+        self.batcher = MicroBatcher(
+            self.predict_probabilities, max_batch_size, max_wait_ms, max_queue_depth
+        )
+        return self.batcher
+
+    def enable_prediction_cache(self, db_connection: GreenDB) -> PredictionCache:
+        """
+        Reuses the predicted probabilities of products with identical model features,
+        see `PredictionCache`.
+
+        Args:
+            db_connection (GreenDB): Connection used to store the cache.
+
+        Returns:
+            PredictionCache: The cache used by `run_pipeline`, e.g., to fetch its metrics.
+        """
+        self.cache = PredictionCache(self.name, db_connection, len(self.classes))
+        return self.cache
+
     def predict_probabilities(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         This function is used to perform inference on the retrieved products. The function
@@ -95,8 +215,10 @@ class InferenceEngine:
             pd.DataFrame: pd.DataFrame with predicted probabilities for each product category /
             model_class.
         """
-        if self.model is None:
-            self.load_model()
+        # concurrent requests (or the warm-up) must not load the model twice
+        with self.__model_lock:
+            if self.model is None:
+                self.load_model()
 
         if self.model is not None:
             probas = self.model.predict_proba(df)
@@ -125,19 +247,14 @@ class InferenceEngine:
         """
 
         # add fallback threshold if a shop/category was not present during evaluation
-        # use smallest threshold from all shops as fallback
-        fallback_thresh_by_category = (
-            self.shop_thresholds.groupby("predicted_category")["threshold"].agg(min).to_dict()
-        )
-        fallback_thresholds = classification_df["predicted_category"].apply(
-            lambda x: fallback_thresh_by_category.get(x)
+        fallback_thresholds = classification_df["predicted_category"].map(
+            self.__fallback_thresholds
         )
 
         # set shop specific thresholds if source and merchant are sent along with request
         if product_df is not None and {"source", "merchant"}.issubset(set(product_df.columns)):
             combined = classification_df.join(product_df, on="id", lsuffix="_cls")
-            join_keys = ["ml_model_name", "source", "merchant", "predicted_category"]
-            combined = combined.join(self.shop_thresholds.set_index(join_keys), on=join_keys)
+            combined = combined.join(self.__thresholds_by_shop, on=SHOP_THRESHOLD_KEYS)
             combined["threshold"] = combined["threshold"].fillna(fallback_thresholds)
         else:
             combined = pd.concat(
@@ -147,11 +264,10 @@ class InferenceEngine:
         # Based on the retrieved thresholds for each category (and shop) we check whether the
         # prediction reaches the threshold. If so, we set the predicted category, if not we set it
         # to "under_threshold", so that it can be excluded later on.
-        combined["category_thresholded"] = combined.apply(
-            lambda x: x["predicted_category"]
-            if x["confidence"] >= x["threshold"]
-            else "under_threshold",
-            axis=1,
+        combined["category_thresholded"] = np.where(
+            combined["confidence"] >= combined["threshold"],
+            combined["predicted_category"],
+            "under_threshold",
         )
 
         return combined[
@@ -171,8 +287,14 @@ class InferenceEngine:
         """
 
         probas.columns = le.inverse_transform(probas.columns)
-        predicted_category = [probas.columns[np.argmax(p)] for p in probas.values]
-        confidence = [np.max(p) for p in probas.values]
+        values = probas.to_numpy()
+        # `argmax` fails without columns, e.g., if the model failed to load
+        best = values.argmax(axis=1) if values.size else np.zeros(len(values), dtype=int)
+        predicted_category = probas.columns.to_numpy()[best]
+        confidence = values[np.arange(len(values)), best]
+
+        categories = probas.columns.tolist()
+        all_predicted_probabilities = [dict(zip(categories, row)) for row in values.tolist()]
 
         result = pd.DataFrame(
             {
@@ -180,7 +302,7 @@ class InferenceEngine:
                 "ml_model_name": self.name,
                 "predicted_category": predicted_category,
                 "confidence": confidence,
-                "all_predicted_probabilities": probas.to_dict(orient="records"),
+                "all_predicted_probabilities": all_predicted_probabilities,
             }
         )
 
@@ -198,7 +320,29 @@ class InferenceEngine:
             A pd.Dataframe containing the predictions.
         """
         df = self.eval_request(request_data)
-        pred_probs = self.predict_probabilities(df)
+        return self.classify(df, apply_shop_thresholds)
+
+    def classify(self, df: pd.DataFrame, apply_shop_thresholds: bool = False) -> pd.DataFrame:
+        """
+        Performs inference on the products in `df`, using the micro-batching and prediction cache
+        if enabled.
+
+        Args:
+            df (pd.DataFrame): Dataframe with Product instances, indexed by their `id`.
+            apply_shop_thresholds (bool): boolean, whether to apply thresholding or not.
+
+        Returns:
+            pd.DataFrame: pd.DataFrame of ProductClassification objects.
+        """
+        predict = (
+            self.batcher.predict_probabilities
+            if self.batcher is not None
+            else self.predict_probabilities
+        )
+        if self.cache is not None:
+            pred_probs = self.cache.predict_probabilities(df, predict)
+        else:
+            pred_probs = predict(df)
 
         classification_df = self.probs_to_ProductClassifications(pred_probs)
         if apply_shop_thresholds:
@@ -225,8 +369,22 @@ class InferenceEngine:
             Optional(pd.DataFrame): pd.DataFrame of the request data.
         """
 
-        df = pd.read_json(request_data)
+        return InferenceEngine.eval_dataframe(pd.read_json(request_data), data_format)
+
+    @staticmethod
+    def eval_dataframe(df: pd.DataFrame, data_format: str = "products") -> Optional[pd.DataFrame]:
+        """
+        Checks whether all necessary columns/features are part of the already deserialized
+        request data, see `eval_request`.
 
+        Args:
+            df (pd.DataFrame): data which was sent along the POST request.
+            data_format (str): format to use for evaluating the request data. Either
+            'products' or 'classifications'.
+
+        Returns:
+            Optional(pd.DataFrame): pd.DataFrame of the request data, indexed by `id`.
+        """
         if data_format == "products":
             required_columns = PRODUCT_CLASSIFICATION_MODEL_FEATURES + ["id"]
         elif data_format == "classifications":
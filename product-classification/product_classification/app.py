@@ -1,52 +1,108 @@
+import json
 import logging
+import threading
+from typing import Dict
 
+import torch
 from flask import Flask, Response, request
+from product_classification.batching import BatcherOverloadedError
 from product_classification.InferenceEngine import InferenceEngine
-from product_classification.utils import to_df
+from product_classification.utils import ARROW_STREAM_MIMETYPE, from_arrow, to_arrow, to_df
 from waitress import serve
 
 from core.constants import PRODUCT_CLASSIFICATION_MODEL
+from core.product_classification import (
+    PRODUCT_CLASSIFICATION_CACHE,
+    PRODUCT_CLASSIFICATION_EAGER_LOAD,
+    PRODUCT_CLASSIFICATION_INTRA_OP_THREADS,
+    PRODUCT_CLASSIFICATION_MAX_BATCH_SIZE,
+    PRODUCT_CLASSIFICATION_MAX_BATCH_WAIT_MS,
+    PRODUCT_CLASSIFICATION_MAX_QUEUE_DEPTH,
+    PRODUCT_CLASSIFICATION_MODEL_DIR,
+    PRODUCT_CLASSIFICATION_QUANTIZE,
+    PRODUCT_CLASSIFICATION_SERVER_THREADS,
+)
 from database.connection import GreenDB
 
 app = Flask(__name__)
 
-MODEL_DIR = f"/usr/src/app/data/models/{PRODUCT_CLASSIFICATION_MODEL}"
-
 db_connection = GreenDB()
 shop_thresholds = to_df(db_connection.get_latest_product_classification_thresholds())
 
-IE = InferenceEngine(PRODUCT_CLASSIFICATION_MODEL, MODEL_DIR, shop_thresholds)
+if PRODUCT_CLASSIFICATION_INTRA_OP_THREADS > 0:
+    torch.set_num_threads(PRODUCT_CLASSIFICATION_INTRA_OP_THREADS)
+
+IE = InferenceEngine(
+    PRODUCT_CLASSIFICATION_MODEL,
+    PRODUCT_CLASSIFICATION_MODEL_DIR,
+    shop_thresholds,
+    quantize=PRODUCT_CLASSIFICATION_QUANTIZE,
+)
+if PRODUCT_CLASSIFICATION_CACHE:
+    IE.enable_prediction_cache(db_connection)
+if PRODUCT_CLASSIFICATION_MAX_BATCH_SIZE > 1:
+    IE.enable_micro_batching(
+        PRODUCT_CLASSIFICATION_MAX_BATCH_SIZE,
+        PRODUCT_CLASSIFICATION_MAX_BATCH_WAIT_MS,
+        PRODUCT_CLASSIFICATION_MAX_QUEUE_DEPTH,
+    )
 
 logger = logging.getLogger("waitress")
 logger.setLevel(logging.INFO)
 
+# set once the model is warmed up, or right away if it is loaded lazily by the first request
+model_ready = threading.Event()
 
-@app.route("/", methods=["POST"])
-def product_classifier_handler() -> Response:
-    """Reads the JSON data from the POST request, which is expected to include product data,
-    which is used for inference.
+
+def warm_up_model() -> None:
+    """Loads the model and predicts a warm-up batch, before the readiness probe succeeds."""
+    try:
+        IE.warm_up()
+    except Exception:
+        logger.exception("Warm-up failed, the server does not become ready.")
+    else:
+        model_ready.set()
+
+
+def classify_request(apply_shop_thresholds: bool) -> Response:
+    """Classifies the products of the request. Requests with the content type
+    `ARROW_STREAM_MIMETYPE` are read and answered in the Arrow IPC stream format, all others in
+    JSON.
 
     :return:
         A flask Response containing the predictions.
     """
+    if request.mimetype == ARROW_STREAM_MIMETYPE:
+        df = IE.eval_dataframe(from_arrow(request.get_data()))
+        classification_df = IE.classify(df, apply_shop_thresholds=apply_shop_thresholds)
+        return Response(to_arrow(classification_df), mimetype=ARROW_STREAM_MIMETYPE)
+
     request_data = request.get_json()
-    classification_df = IE.run_pipeline(request_data)
+    classification_df = IE.run_pipeline(request_data, apply_shop_thresholds=apply_shop_thresholds)
 
     return Response(classification_df.to_json(orient="records"), mimetype="application/json")
 
 
+@app.route("/", methods=["POST"])
+def product_classifier_handler() -> Response:
+    """Reads the JSON data (or Arrow record batches) from the POST request, which is expected to
+    include product data, which is used for inference.
+
+    :return:
+        A flask Response containing the predictions.
+    """
+    return classify_request(apply_shop_thresholds=False)
+
+
 @app.route("/with_thresholds", methods=["POST"])
 def thresholded_product_classifier_handler() -> Response:
-    """Reads the JSON data from the POST request, which is expected to include product data,
-    which is used for inference.
+    """Reads the JSON data (or Arrow record batches) from the POST request, which is expected to
+    include product data, which is used for inference.
 
     :return:
         A flask Response containing the predictions.
     """
-    request_data = request.get_json()
-    classification_df = IE.run_pipeline(request_data, apply_shop_thresholds=True)
-
-    return Response(classification_df.to_json(orient="records"), mimetype="application/json")
+    return classify_request(apply_shop_thresholds=True)
 
 
 @app.route("/apply_thresholds", methods=["POST"])
@@ -69,16 +125,53 @@ def apply_thresholds_handler() -> Response:
     return Response(classification_df.to_json(orient="records"), mimetype="application/json")
 
 
+@app.errorhandler(BatcherOverloadedError)
+def overloaded_handler(error: BatcherOverloadedError) -> Response:
+    """Rejects requests if too many are waiting for inference, so that clients retry later.
+
+    :return:
+        A flask Response with status code 503.
+    """
+    return Response(str(error), status=503)
+
+
+@app.route("/metrics", methods=["GET"])
+def metrics() -> Response:
+    """Returns latency and throughput metrics of the micro-batched inference, the hit rate of
+    the prediction cache and the load time, memory and warm-up time of the model.
+
+    :return:
+        A flask Response containing the metrics of the enabled features.
+    """
+    inference_metrics: Dict[str, float] = {}
+    if IE.batcher is not None:
+        inference_metrics.update(IE.batcher.get_metrics())
+    if IE.cache is not None:
+        inference_metrics.update(IE.cache.get_metrics())
+    inference_metrics.update(IE.model_metrics)
+    return Response(json.dumps(inference_metrics), mimetype="application/json")
+
+
 @app.route("/test", methods=["GET"])
 def test() -> Response:
     """test endpoint used for test purposes and kubernetes readiness/liveness probes.
 
     :return:
-        A flask Response containing the message: 'Successful'.
+        A flask Response containing the message: 'Successful', or status code 503 until the
+        model is warmed up.
     """
+    if not model_ready.is_set():
+        return Response("Model is not warmed up yet.", status=503)
     return Response("Successful!")
 
 
 def create_app() -> Flask:
-    serve(app, host="0.0.0.0", port=8282)
+    # warm up in the background, so that the server already answers the probes
+    if PRODUCT_CLASSIFICATION_EAGER_LOAD:
+        threading.Thread(target=warm_up_model, name="warm-up", daemon=True).start()
+    else:
+        model_ready.set()
+
+    # waitress' default of 4 threads would limit batches to 4 concurrent requests
+    serve(app, host="0.0.0.0", port=8282, threads=PRODUCT_CLASSIFICATION_SERVER_THREADS)
     return app
@@ -0,0 +1,211 @@
+import logging
+import queue
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Callable, Deque, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger("waitress")
+logger.setLevel(logging.INFO)
+
+# Number of most recent requests used to compute the latency percentiles and the throughput
+METRICS_WINDOW = 10000
+
+
+class BatcherOverloadedError(Exception):
+    """Raised if more requests are waiting than the queue of the `MicroBatcher` can hold."""
+
+
+@dataclass
+class _Request:
+    """
+    Helper representation of a single request waiting for its predicted probabilities.
+    """
+
+    df: pd.DataFrame
+    submitted_at: float = field(default_factory=monotonic)
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Optional[pd.DataFrame] = None
+    error: Optional[BaseException] = None
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent prediction requests into a single call of `predict_probabilities`.
+
+    A background thread takes the oldest waiting request and collects further requests until
+    `max_batch_size` products are collected or the oldest request waited `max_wait_ms`
+    milliseconds. It then predicts all products at once and hands each request its rows.
+    """
+
+    def __init__(
+        self,
+        predict_probabilities: Callable[[pd.DataFrame], pd.DataFrame],
+        max_batch_size: int,
+        max_wait_ms: float,
+        max_queue_depth: int,
+    ):
+        """
+        Args:
+            predict_probabilities (Callable[[pd.DataFrame], pd.DataFrame]): Function that returns
+                the predicted probabilities with one row per row of the given products.
+            max_batch_size (int): Maximum number of products per call, larger requests are
+                predicted alone.
+            max_wait_ms (float): Maximum milliseconds a request waits for further requests.
+            max_queue_depth (int): Maximum number of waiting requests.
+        """
+        self.predict = predict_probabilities
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.__requests: queue.Queue[_Request] = queue.Queue(maxsize=max_queue_depth)
+        # request taken from the queue that did not fit into the previous batch
+        self.__pending: Optional[_Request] = None
+
+        self.__metrics_lock = threading.Lock()
+        self.__latencies: Deque[float] = deque(maxlen=METRICS_WINDOW)
+        self.__finished_at: Deque[tuple[float, int]] = deque(maxlen=METRICS_WINDOW)
+        self.__batch_count = 0
+        self.__product_count = 0
+
+        self.__thread = threading.Thread(target=self.__run, name="micro-batcher", daemon=True)
+        self.__thread.start()
+
+    def predict_probabilities(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Predicts the probabilities of the products in `df` together with concurrent requests.
+        Blocks until the prediction is done.
+
+        Args:
+            df (pd.DataFrame): Dataframe with Product instances.
+
+        Raises:
+            BatcherOverloadedError: If the queue of waiting requests is full.
+
+        Returns:
+            pd.DataFrame: Predicted probabilities for each product category, with the index of
+                `df`.
+        """
+        request = _Request(df)
+
+        try:
+            self.__requests.put_nowait(request)
+        except queue.Full:
+            raise BatcherOverloadedError(
+                f"More than {self.__requests.maxsize} requests are waiting for inference."
+            )
+
+        request.done.wait()
+
+        if request.error is not None:
+            raise request.error
+
+        return request.result  # type: ignore[return-value]
+
+    def __collect_batch(self) -> List[_Request]:
+        """
+        Helper method that blocks until a request is available and collects further requests
+            until the batch is full or the first request waited too long.
+
+        Returns:
+            List[_Request]: Requests to predict at once
+        """
+        if self.__pending is not None:
+            batch, self.__pending = [self.__pending], None
+        else:
+            batch = [self.__requests.get()]
+
+        product_count = len(batch[0].df)
+        deadline = batch[0].submitted_at + self.max_wait
+
+        while product_count < self.max_batch_size:
+            try:
+                request = self.__requests.get(timeout=max(0.0, deadline - monotonic()))
+            except queue.Empty:
+                break
+
+            # a request that does not fit into the batch anymore starts the next batch
+            if product_count + len(request.df) > self.max_batch_size:
+                self.__pending = request
+                break
+
+            batch.append(request)
+            product_count += len(request.df)
+
+        return batch
+
+    def __predict(self, batch: List[_Request]) -> None:
+        """
+        Helper method that predicts all products of the `batch` at once and hands each request
+            its rows.
+
+        Args:
+            batch (List[_Request]): Requests to predict
+        """
+        try:
+            probabilities = self.predict(
+                pd.concat([request.df for request in batch], ignore_index=True)
+            )
+
+            start = 0
+            for request in batch:
+                end = start + len(request.df)
+                request.result = probabilities.iloc[start:end].set_axis(request.df.index)
+                start = end
+
+        except Exception as error:
+            logger.exception("Inference of batch failed.")
+            for request in batch:
+                request.error = error
+
+        finished_at = monotonic()
+        product_count = sum(len(request.df) for request in batch)
+
+        with self.__metrics_lock:
+            self.__batch_count += 1
+            self.__product_count += product_count
+            self.__finished_at.append((finished_at, product_count))
+            self.__latencies.extend(finished_at - request.submitted_at for request in batch)
+
+        for request in batch:
+            request.done.set()
+
+    def __run(self) -> None:
+        """
+        Helper method that predicts batches in the background thread.
+        """
+        while True:
+            self.__predict(self.__collect_batch())
+
+    def get_metrics(self) -> Dict[str, float]:
+        """
+        Fetches metrics about the latest (up to `METRICS_WINDOW`) requests and batches.
+
+        Returns:
+            Dict[str, float]: Latency percentiles (`p50_ms`, `p99_ms`) of the latest requests,
+                throughput (`products_per_second`) of the latest batches, total number of
+                `batches` and `products`, mean batch size and number of waiting requests.
+        """
+        with self.__metrics_lock:
+            latencies = np.array(self.__latencies) * 1000
+            finished_at = list(self.__finished_at)
+            batch_count, product_count = self.__batch_count, self.__product_count
+
+        throughput = 0.0
+        if len(finished_at) > 1 and finished_at[-1][0] > finished_at[0][0]:
+            # products of the first batch were finished before the measured time span
+            products = sum(products for _, products in finished_at[1:])
+            throughput = products / (finished_at[-1][0] - finished_at[0][0])
+
+        return {
+            "p50_ms": float(np.percentile(latencies, 50)) if len(latencies) else 0.0,
+            "p99_ms": float(np.percentile(latencies, 99)) if len(latencies) else 0.0,
+            "products_per_second": throughput,
+            "batches": batch_count,
+            "products": product_count,
+            "mean_batch_size": product_count / batch_count if batch_count else 0.0,
+            "waiting_requests": self.__requests.qsize(),
+        }
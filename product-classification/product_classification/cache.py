@@ -0,0 +1,129 @@
+import hashlib
+import json
+import logging
+import threading
+from typing import Callable, Dict
+
+import pandas as pd
+
+from core.constants import PRODUCT_CLASSIFICATION_MODEL_FEATURES
+from database.connection import GreenDB
+
+logger = logging.getLogger("waitress")
+logger.setLevel(logging.INFO)
+
+
+def content_hash(model_name: str, product: pd.Series) -> str:
+    """
+    Hashes the model name and the model features of `product`, so that identical products share
+    their predictions and predictions of other models are never reused.
+
+    Args:
+        model_name (str): The name of the model.
+        product (pd.Series): Product with (at least) the model features.
+
+    Returns:
+        str: Hex digest of the hash
+    """
+    features = [
+        None if pd.isna(product[feature]) else str(product[feature])
+        for feature in PRODUCT_CLASSIFICATION_MODEL_FEATURES
+    ]
+    return hashlib.sha256(json.dumps([model_name, *features]).encode("utf-8")).hexdigest()
+
+
+class PredictionCache:
+    """
+    Caches the predicted probabilities of products in the GreenDB, keyed by `content_hash`.
+
+    Cached probabilities are stored as list in the order of the model's (label encoded) classes.
+    """
+
+    def __init__(self, model_name: str, db_connection: GreenDB, class_count: int):
+        """
+        Deletes the cached probabilities of all other models.
+
+        Args:
+            model_name (str): The name of the model whose predictions are cached.
+            db_connection (GreenDB): Connection used to store the cache.
+            class_count (int): Number of the model's classes.
+        """
+        self.model_name = model_name
+        self.db_connection = db_connection
+        self.columns = list(range(class_count))
+
+        deleted = self.db_connection.delete_cached_predicted_probabilities(model_name)
+        if deleted:
+            logger.info(f"Deleted {deleted} cached predictions of other models.")
+
+        self.__metrics_lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+    def predict_probabilities(
+        self, df: pd.DataFrame, predict: Callable[[pd.DataFrame], pd.DataFrame]
+    ) -> pd.DataFrame:
+        """
+        Returns the cached probabilities of the products in `df` and predicts the others with
+        `predict`, once per distinct product. The new predictions are cached.
+
+        Args:
+            df (pd.DataFrame): Dataframe with Product instances.
+            predict (Callable[[pd.DataFrame], pd.DataFrame]): Function that predicts the
+                probabilities, e.g., `InferenceEngine.predict_probabilities`.
+
+        Returns:
+            pd.DataFrame: Predicted probabilities for each product category, with the index of
+                `df`.
+        """
+        hashes = [content_hash(self.model_name, product) for _, product in df.iterrows()]
+        probabilities = self.db_connection.get_cached_predicted_probabilities(set(hashes))
+
+        # maps hashes that are not cached to the position of their first product
+        missing: Dict[str, int] = {}
+        for position, product_hash in enumerate(hashes):
+            if product_hash not in probabilities:
+                missing.setdefault(product_hash, position)
+
+        hits = sum(product_hash in probabilities for product_hash in hashes)
+        with self.__metrics_lock:
+            self.__hits += hits
+            self.__misses += len(hashes) - hits
+
+        if missing:
+            predicted = predict(df.iloc[list(missing.values())])
+
+            if len(predicted) != len(missing):
+                # e.g. model failed to load
+                return predicted
+
+            new_probabilities = {
+                product_hash: [float(probability) for probability in row]
+                for product_hash, row in zip(missing, predicted[self.columns].to_numpy())
+            }
+            self.db_connection.write_cached_predicted_probabilities(
+                self.model_name, new_probabilities
+            )
+            probabilities.update(new_probabilities)
+
+        return pd.DataFrame(
+            [probabilities[product_hash] for product_hash in hashes],
+            index=df.index,
+            columns=self.columns,
+        )
+
+    def get_metrics(self) -> Dict[str, float]:
+        """
+        Fetches the number of products whose probabilities were cached (hits) or not (misses).
+
+        Returns:
+            Dict[str, float]: `cache_hits`, `cache_misses` and `cache_hit_rate`
+        """
+        with self.__metrics_lock:
+            hits, misses = self.__hits, self.__misses
+
+        return {
+            "cache_hits": hits,
+            "cache_misses": misses,
+            "cache_hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+        }
@@ -0,0 +1,204 @@
+import os
+from argparse import ArgumentParser
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from itertools import islice
+from logging import getLogger
+from time import monotonic
+from typing import Deque, Iterator, List, Optional, Tuple
+
+import pandas as pd
+import torch
+from product_classification.InferenceEngine import InferenceEngine
+from product_classification.utils import to_df
+
+from core import log
+from core.constants import PRODUCT_CLASSIFICATION_MODEL, PRODUCT_CLASSIFICATION_MODEL_FEATURES
+from core.domain import Product, ProductClassification
+from core.product_classification import (
+    PRODUCT_CLASSIFICATION_CACHE,
+    PRODUCT_CLASSIFICATION_MODEL_DIR,
+    PRODUCT_CLASSIFICATION_QUANTIZE,
+)
+from database.connection import GreenDB
+
+log.setup_logger(__name__)
+logger = getLogger(__name__)
+
+
+def _to_product_df(batch: List[Tuple[int, Product]]) -> pd.DataFrame:
+    """
+    Helper function that converts products into the model input, as `InferenceEngine.eval_request`
+        does for requests.
+
+    Args:
+        batch (List[Tuple[int, Product]]): Row ids and `Product`s
+
+    Returns:
+        pd.DataFrame: Row ids and model features, indexed by the row ids
+    """
+    df = pd.DataFrame(
+        [
+            {
+                "id": row_id,
+                **{
+                    feature: getattr(product, feature)
+                    for feature in PRODUCT_CLASSIFICATION_MODEL_FEATURES
+                },
+            }
+            for row_id, product in batch
+        ]
+    )
+    return df.set_index("id", drop=False).rename_axis(None)
+
+
+def _classify_batch(
+    inference_engine: InferenceEngine, batch: List[Tuple[int, Product]]
+) -> Tuple[int, List[ProductClassification]]:
+    """
+    Helper function that is executed in the pool's threads and classifies a batch of products.
+
+    Args:
+        inference_engine (InferenceEngine): Engine used for inference
+        batch (List[Tuple[int, Product]]): Row ids and `Product`s
+
+    Returns:
+        Tuple[int, List[ProductClassification]]: Last row id of the batch and its classifications
+    """
+    classification_df = inference_engine.classify(_to_product_df(batch))
+    return batch[-1][0], [
+        ProductClassification.model_validate(row)
+        for row in classification_df.to_dict(orient="records")
+    ]
+
+
+def classify(
+    timestamp: Optional[datetime],
+    missing_only: bool,
+    start_id: int,
+    batch_size: int,
+    threads: int,
+    model_dir: str,
+    quantize: bool,
+) -> None:
+    """
+    Classifies all products of the given `timestamp` (or of all timestamps) in-process and
+        writes their `ProductClassification`s batch-wise to the GreenDB. Existing classifications
+        of `PRODUCT_CLASSIFICATION_MODEL` are overwritten.
+    Progress is logged after each batch, including the `id` to resume from.
+
+    Args:
+        timestamp (Optional[datetime]): Crawl to classify, all crawls if `None`
+        missing_only (bool): Only classify products without a classification of the model
+        start_id (int): Only products with a greater `id` are classified, used to resume
+        batch_size (int): Products per inference call and write transaction
+        threads (int): Number of batches classified concurrently
+        model_dir (str): Directory of the model files
+        quantize (bool): Whether to quantize the model to int8
+    """
+    # torch parallelizes each prediction as well, share the cores between the threads
+    torch.set_num_threads(max(1, (os.cpu_count() or 1) // threads))
+
+    green_db_connection = GreenDB()
+
+    inference_engine = InferenceEngine(
+        PRODUCT_CLASSIFICATION_MODEL,
+        model_dir,
+        to_df(green_db_connection.get_latest_product_classification_thresholds()),
+        quantize=quantize,
+    )
+    if PRODUCT_CLASSIFICATION_CACHE:
+        # products of several crawls are often identical
+        inference_engine.enable_prediction_cache(green_db_connection)
+    inference_engine.warm_up()
+
+    logger.info(
+        f"Classifying {'unclassified ' if missing_only else ''}products of "
+        f"{f'timestamp {timestamp}' if timestamp else 'all timestamps'} "
+        f"starting after id {start_id} with {threads} threads ..."
+    )
+
+    products = green_db_connection.get_products_with_row_ids(
+        timestamp,
+        start_id=start_id,
+        unclassified_by_ml_model_name=PRODUCT_CLASSIFICATION_MODEL if missing_only else None,
+    )
+    batches: Iterator[List[Tuple[int, Product]]] = iter(
+        lambda: list(islice(products, batch_size)), []
+    )
+
+    products_written, started_at = 0, monotonic()
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        # bounded number of batches in flight, results are written in the order of the rows,
+        # so the last id of each written batch is safe to resume from
+        in_flight: Deque[Future] = deque()
+        while True:
+            while len(in_flight) < 2 * threads and (batch := next(batches, None)):
+                in_flight.append(executor.submit(_classify_batch, inference_engine, batch))
+
+            if not in_flight:
+                break
+
+            last_id, product_classifications = in_flight.popleft().result()
+            green_db_connection.upsert_product_classifications(product_classifications)
+
+            products_written += len(product_classifications)
+            logger.info(
+                f"Wrote {products_written} classifications "
+                f"({products_written / (monotonic() - started_at):.1f} products/s). "
+                f"Resume with '--start-id {last_id}'."
+            )
+
+    logger.info("Classification done.")
+
+
+def start() -> None:
+    """
+    CLI implementation of the `product-classification` command.
+    """
+    parser = ArgumentParser(description="CLI for bulk classification of products.")
+    subparsers = parser.add_subparsers()
+
+    # classify
+    classify_parser = subparsers.add_parser(
+        "classify",
+        help=f"Classify products with '{PRODUCT_CLASSIFICATION_MODEL}' and write the results to "
+        "the GreenDB.",
+    )
+    classify_parser.add_argument(
+        "--timestamp",
+        type=datetime.fromisoformat,
+        default=None,
+        help="Timestamp of the crawl in ISO format, defaults to all crawls.",
+    )
+    classify_parser.add_argument(
+        "--missing-only",
+        action="store_true",
+        help="Only classify products without a classification of the current model.",
+    )
+    classify_parser.add_argument("--start-id", type=int, default=0)
+    classify_parser.add_argument("--batch-size", type=int, default=256)
+    classify_parser.add_argument("--threads", type=int, default=os.cpu_count() or 1)
+    classify_parser.add_argument("--model-dir", default=PRODUCT_CLASSIFICATION_MODEL_DIR)
+    classify_parser.add_argument(
+        "--quantize",
+        action="store_true",
+        default=PRODUCT_CLASSIFICATION_QUANTIZE,
+        help="Quantize the model's linear layers to int8 for faster inference.",
+    )
+    classify_parser.set_defaults(command_function=classify)
+
+    args = parser.parse_args()
+
+    parsed_args = {
+        parameter: value
+        for parameter, value in vars(args).items()
+        if parameter != "command_function"
+    }
+
+    args.command_function(
+        # call given command function with parameters
+        **parsed_args
+    )
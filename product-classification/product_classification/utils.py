@@ -1,6 +1,10 @@
 from typing import Iterator, Union
 
 import pandas as pd
+import pyarrow as pa
+
+# Content type of requests and responses in the Arrow IPC stream format
+ARROW_STREAM_MIMETYPE = "application/vnd.apache.arrow.stream"
 
 
 def to_df(objects: Union[list, Iterator]) -> pd.DataFrame:
@@ -11,3 +15,27 @@ def to_df(objects: Union[list, Iterator]) -> pd.DataFrame:
         A dataframe from the `objects`.
     """
     return pd.DataFrame([obj.__dict__ for obj in objects])
+
+
+def from_arrow(data: bytes) -> pd.DataFrame:
+    """Reads a df from the Arrow IPC stream format.
+
+    :param data: The serialized record batches.
+    :return:
+        A dataframe with the columns of the record batches.
+    """
+    return pa.ipc.open_stream(data).read_pandas()
+
+
+def to_arrow(df: pd.DataFrame) -> bytes:
+    """Serializes a df into the Arrow IPC stream format, without its index.
+
+    :param df: The dataframe to be serialized.
+    :return:
+        The serialized record batches.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
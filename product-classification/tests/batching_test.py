@@ -0,0 +1,74 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+from fakes import FakeModel, products
+from product_classification.batching import BatcherOverloadedError, MicroBatcher
+
+
+def test_concurrent_requests_are_batched() -> None:
+    model = FakeModel()
+    batcher = MicroBatcher(
+        model.predict_probabilities, max_batch_size=8, max_wait_ms=200, max_queue_depth=16
+    )
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(batcher.predict_probabilities, [products(i) for i in range(8)]))
+
+    assert sum(model.batch_sizes) == 8
+    assert len(model.batch_sizes) < 8
+    for i, result in enumerate(results):
+        assert list(result.index) == [i]
+        assert result.loc[i, 0] == i / 100
+
+    metrics = batcher.get_metrics()
+    assert metrics["products"] == 8
+    assert metrics["p99_ms"] >= metrics["p50_ms"] > 0
+
+
+def test_batches_do_not_exceed_max_batch_size() -> None:
+    model = FakeModel()
+    batcher = MicroBatcher(
+        model.predict_probabilities, max_batch_size=3, max_wait_ms=100, max_queue_depth=16
+    )
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(
+            executor.map(batcher.predict_probabilities, [products(i, i + 10) for i in range(4)])
+        )
+
+    assert max(model.batch_sizes) <= 3
+    assert [list(result.index) for result in results] == [[i, i + 10] for i in range(4)]
+
+
+def test_full_queue_is_rejected() -> None:
+    block = threading.Event()
+    model = FakeModel(block)
+    batcher = MicroBatcher(
+        model.predict_probabilities, max_batch_size=1, max_wait_ms=0, max_queue_depth=1
+    )
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        # first request is predicted (blocked), second one waits in the queue
+        futures = [executor.submit(batcher.predict_probabilities, products(0))]
+        model.started.wait()
+        futures.append(executor.submit(batcher.predict_probabilities, products(1)))
+        while batcher.get_metrics()["waiting_requests"] < 1:
+            pass
+
+        with pytest.raises(BatcherOverloadedError):
+            batcher.predict_probabilities(products(2))
+
+        block.set()
+        assert [len(future.result()) for future in futures] == [1, 1]
+
+
+def test_errors_are_raised_for_each_request() -> None:
+    def failing_predict(df: pd.DataFrame) -> pd.DataFrame:
+        raise RuntimeError("model failed")
+
+    batcher = MicroBatcher(failing_predict, max_batch_size=4, max_wait_ms=0, max_queue_depth=4)
+
+    with pytest.raises(RuntimeError):
+        batcher.predict_probabilities(products(0))
@@ -0,0 +1,72 @@
+from typing import Dict, Iterable, List
+
+from fakes import FakeModel, products
+from product_classification.cache import PredictionCache, content_hash
+
+
+class FakeGreenDB:
+    def __init__(self) -> None:
+        self.cache: Dict[str, List[float]] = {}
+        self.model_for_hash: Dict[str, str] = {}
+
+    def get_cached_predicted_probabilities(
+        self, content_hashes: Iterable[str]
+    ) -> Dict[str, List[float]]:
+        return {h: self.cache[h] for h in content_hashes if h in self.cache}
+
+    def write_cached_predicted_probabilities(
+        self, ml_model_name: str, predicted_probabilities: Dict[str, List[float]]
+    ) -> None:
+        for h, probabilities in predicted_probabilities.items():
+            self.cache.setdefault(h, probabilities)
+            self.model_for_hash[h] = ml_model_name
+
+    def delete_cached_predicted_probabilities(self, except_ml_model_name: str) -> int:
+        deleted = [h for h, model in self.model_for_hash.items() if model != except_ml_model_name]
+        for h in deleted:
+            del self.cache[h], self.model_for_hash[h]
+        return len(deleted)
+
+
+def test_content_hash_depends_on_model_and_features() -> None:
+    product = products(0, names=["shirt"]).iloc[0]
+    other_id = product.copy()
+    other_id["id"] = 42
+
+    assert content_hash("model", product) == content_hash("model", other_id)
+    assert content_hash("model", product) != content_hash("other-model", product)
+    assert content_hash("model", product) != content_hash(
+        "model", products(0, names=["shoe"]).iloc[0]
+    )
+
+
+def test_cached_products_are_not_predicted_again() -> None:
+    model, db_connection = FakeModel(), FakeGreenDB()
+    cache = PredictionCache("model", db_connection, class_count=2)  # type: ignore[arg-type]
+
+    first = cache.predict_probabilities(
+        products(1, 2, 3, names=["shirt", "shoe", "shirt"]), model.predict_probabilities
+    )
+    assert model.predicted == [1, 2]
+    assert list(first.index) == [1, 2, 3]
+    assert first.loc[3, 0] == first.loc[1, 0] == 0.01
+
+    second = cache.predict_probabilities(
+        products(4, 5, names=["shoe", "dress"]), model.predict_probabilities
+    )
+    assert model.predicted == [1, 2, 5]
+    assert second.loc[4, 0] == 0.02
+    assert second.loc[5, 0] == 0.05
+
+    assert cache.get_metrics() == {"cache_hits": 1, "cache_misses": 4, "cache_hit_rate": 0.2}
+
+
+def test_cache_of_other_models_is_deleted() -> None:
+    db_connection = FakeGreenDB()
+    PredictionCache("old-model", db_connection, 2).predict_probabilities(  # type: ignore[arg-type]
+        products(1, names=["shirt"]), FakeModel().predict_probabilities
+    )
+
+    PredictionCache("new-model", db_connection, 2)  # type: ignore[arg-type]
+
+    assert db_connection.cache == {}
@@ -0,0 +1,31 @@
+import threading
+from typing import List, Optional
+
+import pandas as pd
+
+
+class FakeModel:
+    """
+    Stands in for `InferenceEngine.predict_probabilities` and records its calls. The probability
+    of class 0 is the product's id / 100, to check that results are not mixed up.
+    """
+
+    def __init__(self, block: Optional[threading.Event] = None) -> None:
+        self.predicted: List[int] = []
+        self.batch_sizes: List[int] = []
+        self.block = block
+        self.started = threading.Event()
+
+    def predict_probabilities(self, df: pd.DataFrame) -> pd.DataFrame:
+        self.started.set()
+        if self.block is not None:
+            self.block.wait()
+        self.predicted += list(df["id"])
+        self.batch_sizes.append(len(df))
+        return pd.DataFrame({0: df["id"] / 100, 1: 1 - df["id"] / 100}, index=df.index)
+
+
+def products(*ids: int, names: Optional[List[str]] = None) -> pd.DataFrame:
+    names = names or ["name"] * len(ids)
+    df = pd.DataFrame({"id": ids, "name": names, "description": [f"{name}!" for name in names]})
+    return df.set_index("id", drop=False).rename_axis(None)
@@ -0,0 +1,23 @@
+import pandas as pd
+from product_classification.utils import from_arrow, to_arrow
+
+
+def test_arrow_round_trip() -> None:
+    classification_df = pd.DataFrame(
+        {
+            "id": [3, 7],
+            "ml_model_name": "model",
+            "predicted_category": ["SNEAKERS", "TSHIRT"],
+            "confidence": [0.9, 0.6],
+            "all_predicted_probabilities": [
+                {"SNEAKERS": 0.9, "TSHIRT": 0.1},
+                {"SNEAKERS": 0.4, "TSHIRT": 0.6},
+            ],
+        },
+        index=[3, 7],
+    )
+
+    result = from_arrow(to_arrow(classification_df))
+
+    pd.testing.assert_frame_equal(result, classification_df.reset_index(drop=True))
+    assert result.to_dict(orient="records") == classification_df.to_dict(orient="records")
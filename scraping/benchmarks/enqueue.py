@@ -0,0 +1,113 @@
+"""
+Benchmark of the time the reactor thread spends handing scraped pages over to the message queue.
+
+Compares the previous synchronous `MessageQueue.add_scraping` in the spider callbacks with the
+current `BackgroundEnqueuer`, for pages arriving at `--pages-per-second`. No download progresses
+while a callback blocks the reactor, so the mean reactor time per page limits the crawl
+throughput; the benchmark reports the resulting maximum pages per minute. `--latency-ms` adds a
+simulated network latency to each enqueue call. Jobs are enqueued to the configured Redis and
+removed afterwards, use a Redis without running workers.
+Run from the `scraping` directory:
+
+    python benchmarks/enqueue.py
+"""
+from argparse import ArgumentParser
+from datetime import datetime
+from time import perf_counter, sleep
+from typing import Callable, List, Optional
+
+from message_queue import MessageQueue
+from redis import Redis
+from rq import Queue
+
+from core.constants import WORKER_QUEUE_SCRAPING
+from core.domain import CountryType, FreshProduct, PageType, PageValidators, ScrapedPage
+from core.redis import REDIS_HOST, REDIS_PASSWORD, REDIS_PORT, REDIS_USER
+from scraping.enqueuer import BackgroundEnqueuer
+
+
+class _SlowMessageQueue(MessageQueue):
+    def __init__(self, latency_seconds: float) -> None:
+        super().__init__()
+        self.latency_seconds = latency_seconds
+
+    def add_scraping(
+        self,
+        table_name: str,
+        scraped_page: ScrapedPage,
+        page_validators: Optional[PageValidators] = None,
+        fresh_product: Optional[FreshProduct] = None,
+    ) -> None:
+        sleep(self.latency_seconds)
+        super().add_scraping(table_name, scraped_page, page_validators, fresh_product)
+
+
+def _stalls_ms(
+    add_scraping: Callable[[str, ScrapedPage], None], pages: List[ScrapedPage], interval: float
+) -> List[float]:
+    # pages arrive every `interval` seconds, as downloads complete during a crawl
+    stalls = []
+    for page in pages:
+        sleep(interval)
+        started_at = perf_counter()
+        add_scraping("benchmark", page)
+        stalls.append((perf_counter() - started_at) * 1000)
+    return stalls
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--pages-per-second", type=float, default=50)
+    parser.add_argument("--latency-ms", type=float, nargs="+", default=[0, 1, 5])
+    parser.add_argument("--html-kb", type=int, default=300)
+    args = parser.parse_args()
+
+    pages = [
+        ScrapedPage(
+            timestamp=datetime.now(),
+            source="benchmark",
+            merchant="benchmark",
+            country=CountryType.DE,
+            url=f"https://www.example.com/{i}",
+            html="x" * args.html_kb * 1024,
+            category="SHIRT",
+            gender=None,
+            consumer_lifestage=None,
+            page_type=PageType.PRODUCT,
+            meta_information=None,
+        )
+        for i in range(args.pages)
+    ]
+    scraping_queue = Queue(
+        WORKER_QUEUE_SCRAPING,
+        connection=Redis(
+            host=REDIS_HOST, port=REDIS_PORT, password=REDIS_PASSWORD, username=REDIS_USER
+        ),
+    )
+
+    print(f"{'latency':>8}{'mode':>12}{'mean ms':>10}{'max ms':>10}{'max p/min':>12}")
+    for latency_ms in args.latency_ms:
+        message_queue = _SlowMessageQueue(latency_ms / 1000)
+        enqueuer = BackgroundEnqueuer(_SlowMessageQueue(latency_ms / 1000))
+
+        for mode, add_scraping in [
+            ("sync", message_queue.add_scraping),
+            ("background", enqueuer.add_scraping),
+        ]:
+            stalls = _stalls_ms(add_scraping, pages, 1 / args.pages_per_second)
+            mean_ms = sum(stalls) / len(stalls)
+            print(
+                f"{latency_ms:>8.1f}{mode:>12}{mean_ms:>10.3f}{max(stalls):>10.3f}"
+                f"{60_000 / mean_ms:>12.0f}"
+            )
+
+        message_queue.flush()
+        enqueuer.close()
+        assert enqueuer.get_metrics()["pages_enqueued"] == len(pages)
+        scraping_queue.empty()
+    print("(reactor ms per page, maximum pages/min)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark of the crawl throughput of one merchant crawl shared by several scrapyd jobs.
+
+Crawls `--pages` pages of the given spider with 1, 2, ... `--jobs` jobs that share their frontier
+through the `RedisScheduler`, and reports the wall-clock time, the pages per minute and the pages
+downloaded by each job. The jobs run in this process and share its reactor, like jobs on
+one scrapyd node; each job still keeps its own politeness delay. Needs the Splash service at
+`SPLASH_URL` (unless the spider disables it) and a Redis without running workers, the scraped
+pages are enqueued to it. Run from the `scraping` directory:
+
+    python benchmarks/frontier.py otto_DE --jobs 1 2 4
+"""
+from argparse import ArgumentParser
+from datetime import datetime
+from time import perf_counter
+from typing import Any, List
+
+from scrapy.crawler import Crawler, CrawlerRunner
+from scrapy.utils.log import configure_logging
+from scrapy.utils.project import get_project_settings
+from twisted.internet import defer, reactor
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("spider")
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    settings = get_project_settings()
+    settings.set("SCHEDULER", "scraping.scheduler.RedisScheduler")
+    settings.set("DUPEFILTER_CLASS", "scraping.dupefilter.SharedMetaAwareDupeFilter")
+    settings.set("DISTRIBUTED_CRAWL_IDLE_SECONDS", 10)
+    settings.set("LOG_LEVEL", "WARNING")
+    configure_logging(settings)
+
+    runner = CrawlerRunner(settings)
+    print(f"{'jobs':>6}{'pages':>8}{'seconds':>10}{'pages/min':>12}  pages per job")
+
+    @defer.inlineCallbacks
+    def crawl() -> Any:
+        for jobs in args.jobs:
+            # a new timestamp, i.e., a new frontier for each number of jobs
+            timestamp = datetime.now()
+            settings.set("CLOSESPIDER_PAGECOUNT", args.pages // jobs)
+            crawlers: List[Crawler] = [runner.create_crawler(args.spider) for _ in range(jobs)]
+
+            started_at = perf_counter()
+            yield defer.DeferredList(
+                [runner.crawl(crawler, timestamp=timestamp) for crawler in crawlers]
+            )
+            seconds = perf_counter() - started_at
+
+            pages_per_job = [
+                crawler.stats.get_value("response_received_count", 0) for crawler in crawlers
+            ]
+            pages = sum(pages_per_job)
+            print(
+                f"{jobs:>6}{pages:>8}{seconds:>10.1f}{pages * 60 / seconds:>12.1f}  "
+                + "/".join(str(job_pages) for job_pages in pages_per_job)
+            )
+        reactor.stop()  # type: ignore[attr-defined]
+
+    crawl()
+    reactor.run()  # type: ignore[attr-defined]
+
+
+if __name__ == "__main__":
+    main()
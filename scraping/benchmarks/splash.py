@@ -0,0 +1,71 @@
+"""
+Benchmark of the crawl throughput per merchant with and without Splash.
+
+Crawls the first `--pages` pages of each given spider twice, with `use_splash` enabled and
+disabled, and reports the pages per minute, the scraped product pages and the downloaded bytes
+per page. Without Splash the spider sees the server-side rendered HTML, so compare the number of
+product pages as well: if it drops, the spider needs Splash. `--download-delay` overrides the
+spiders' politeness delay, which otherwise dominates the throughput. Needs the Splash service
+at `SPLASH_URL` and a Redis without running workers, the scraped pages are enqueued to it.
+Run from the `scraping` directory:
+
+    python benchmarks/splash.py otto_de zalando_de
+"""
+from argparse import ArgumentParser
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from scrapy.crawler import CrawlerRunner
+from scrapy.utils.log import configure_logging
+from scrapy.utils.project import get_project_settings
+from twisted.internet import defer, reactor
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("spiders", nargs="+")
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--download-delay", type=float, default=None)
+    args = parser.parse_args()
+
+    settings = get_project_settings()
+    settings.set("CLOSESPIDER_PAGECOUNT", args.pages)
+    settings.set("LOG_LEVEL", "WARNING")
+    if args.download_delay is not None:
+        settings.set("DOWNLOAD_DELAY", args.download_delay, priority="cmdline")
+    configure_logging(settings)
+
+    runner = CrawlerRunner(settings)
+    results: List[Tuple[str, str, Dict[str, Any]]] = []
+
+    @defer.inlineCallbacks
+    def crawl() -> Any:
+        # sequentially, so that both modes crawl at the same politeness
+        for spider_name in args.spiders:
+            for use_splash in ["true", "false"]:
+                crawler = runner.create_crawler(spider_name)
+                yield runner.crawl(crawler, timestamp=datetime.now(), use_splash=use_splash)
+                results.append((spider_name, use_splash, crawler.stats.get_stats()))
+        reactor.stop()  # type: ignore[attr-defined]
+
+    crawl()
+    reactor.run()  # type: ignore[attr-defined]
+
+    def _ratio(value: Optional[float], total: Optional[float]) -> float:
+        return (value or 0) / total if total else 0.0
+
+    print(
+        f"{'spider':<14}{'splash':>8}{'pages':>8}{'pages/min':>12}{'products':>10}{'kB/page':>10}"
+    )
+    for spider_name, use_splash, stats in results:
+        pages = stats.get("response_received_count", 0)
+        print(
+            f"{spider_name:<14}{use_splash:>8}{pages:>8}"
+            f"{_ratio(pages * 60, stats.get('elapsed_time_seconds')):>12.1f}"
+            f"{stats.get('pages/PRODUCT', 0):>10}"
+            f"{_ratio(stats.get('downloader/response_bytes'), pages) / 1000:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,30 @@
 """
 To handle Request meta info properly a custom DupeFilter must be set.
 """
-from typing import Iterable, Optional, Union
+from logging import getLogger
+from typing import Any, Iterable, Optional, Union
 
+from redis import Redis
+from scrapy import Spider, signals
+from scrapy.crawler import Crawler
 from scrapy.http.request import Request as ScrapyHttpRequest
+from scrapy.http.response import Response as ScrapyHttpResponse
 from scrapy_splash.dupefilter import SplashAwareDupeFilter, splash_request_fingerprint
 from scrapy_splash.request import SplashRequest
 from scrapy_splash.utils import dict_hash
 
+from core.domain import FreshProduct
+from core.redis import REDIS_HOST, REDIS_PASSWORD, REDIS_PORT, REDIS_USER
+
+from .scheduler import get_frontier_key
+
+logger = getLogger(__name__)
+
 META_KEYS_FOR_FINGERPRINT = ["category", "gender", "consumer_lifestage"]
 
+# Prefix of the Redis keys of recently fetched product pages, followed by spider and fingerprint
+FRESH_PRODUCT_KEY_PREFIX = "scraping:fresh_product"
+
 
 class MetaAwareDupeFilter(SplashAwareDupeFilter):
     """
@@ -52,3 +67,153 @@ class MetaAwareDupeFilter(SplashAwareDupeFilter):
         'SplashAwareDupeFilter'.
         """
         return self.meta_request_fingerprint(request)
+
+
+class PersistentMetaAwareDupeFilter(MetaAwareDupeFilter):
+    """
+    'MetaAwareDupeFilter' that additionally filters product pages that were fetched by a previous
+    run of the same spider within the last `PRODUCT_FRESHNESS_SECONDS` seconds.
+
+    The fingerprints of fetched product pages (requests with the `parse_PRODUCT` callback and a
+    successful response) are stored in Redis, keyed by spider name and 'meta_request_fingerprint',
+    and expire after `PRODUCT_FRESHNESS_SECONDS`. They are handed over as `new_fresh_product` in
+    the response's meta and stored by the `scraping` worker once the page is written into its
+    scraping table, so that pages lost on their way there are fetched again. SERPs are always
+    fetched, so that new products are found. Setting `PRODUCT_FRESHNESS_SECONDS` to 0 (default)
+    disables the persistence. Spiders can set their own freshness window in their
+    `custom_settings`.
+    """
+
+    fresh_product_key_prefix = ""
+    freshness_seconds = 0
+    redis_connection: Optional[Redis] = None
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "PersistentMetaAwareDupeFilter":
+        dupefilter = super().from_crawler(crawler)
+        dupefilter.freshness_seconds = crawler.settings.getint("PRODUCT_FRESHNESS_SECONDS")
+
+        if dupefilter.freshness_seconds > 0:
+            dupefilter.fresh_product_key_prefix = (
+                f"{FRESH_PRODUCT_KEY_PREFIX}:{crawler.spider.name}"  # type: ignore[union-attr]
+            )
+            dupefilter.redis_connection = Redis(
+                host=REDIS_HOST, port=REDIS_PORT, password=REDIS_PASSWORD, username=REDIS_USER
+            )
+            crawler.signals.connect(dupefilter.response_received, signal=signals.response_received)
+
+        return dupefilter
+
+    @staticmethod
+    def is_product_request(request: Union[ScrapyHttpRequest, SplashRequest]) -> bool:
+        """
+        Product pages are requested with the spiders' `parse_PRODUCT` callback.
+
+        Args:
+            request (Union[ScrapyHttpRequest, SplashRequest]): Request to check
+
+        Returns:
+            bool: Whether `request` requests a product page
+        """
+        return getattr(request.callback, "__name__", None) == "parse_PRODUCT"
+
+    def request_seen(self, request: Union[ScrapyHttpRequest, SplashRequest]) -> bool:
+        """
+        Filters requests seen within this run and product pages that are still fresh.
+            The fingerprint of product requests is stored in their meta information, so that
+            they are marked as fetched once their response is received.
+        """
+        if self.seen_in_crawl(request):
+            return True
+
+        if self.redis_connection is None or not self.is_product_request(request):
+            return False
+
+        fingerprint = self.request_fingerprint(request)
+        if self.redis_connection.exists(f"{self.fresh_product_key_prefix}:{fingerprint}"):
+            request.meta["fresh_product"] = True
+            return True
+
+        request.meta["product_fingerprint"] = fingerprint
+        return False
+
+    def seen_in_crawl(self, request: Union[ScrapyHttpRequest, SplashRequest]) -> bool:
+        """
+        Whether `request` was already seen within the current crawl.
+
+        Args:
+            request (Union[ScrapyHttpRequest, SplashRequest]): Request to check
+
+        Returns:
+            bool: Whether `request` is a duplicate
+        """
+        return super().request_seen(request)
+
+    def response_received(
+        self,
+        response: ScrapyHttpResponse,
+        request: Union[ScrapyHttpRequest, SplashRequest],
+        spider: Spider,
+    ) -> None:
+        """
+        Handler of the `response_received` signal, hands successfully fetched product pages
+            over to be marked as fresh for `freshness_seconds`. Captcha pages, which the
+            `AdaptiveThrottleMiddleware` passes on once its retries are exhausted, are not fresh.
+        """
+        if self.redis_connection is None or not 200 <= response.status < 300:
+            return
+
+        if request.meta.get("captcha"):
+            return
+
+        if fingerprint := request.meta.get("product_fingerprint"):
+            request.meta["new_fresh_product"] = FreshProduct(
+                key=f"{self.fresh_product_key_prefix}:{fingerprint}",
+                ttl_seconds=self.freshness_seconds,
+            )
+
+    def log(self, request: Union[ScrapyHttpRequest, SplashRequest], spider: Any) -> None:
+        """
+        Counts filtered fresh product pages separately from duplicates within this run.
+        """
+        if request.meta.get("fresh_product"):
+            spider.crawler.stats.inc_value("dupefilter/fresh_product", spider=spider)
+            logger.debug(f"Filtered fresh product page: {request}")
+            return
+
+        super().log(request, spider)
+
+
+class SharedMetaAwareDupeFilter(PersistentMetaAwareDupeFilter):
+    """
+    'PersistentMetaAwareDupeFilter' that shares the fingerprints seen within a crawl between all
+    scrapyd jobs of the crawl, see 'scraping.scheduler.RedisScheduler'. The fingerprints are
+    stored in a Redis set next to the crawl's frontier and expire with it.
+    """
+
+    seen_key = ""
+    ttl = 0
+    seen_redis_connection: Optional[Redis] = None
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "SharedMetaAwareDupeFilter":
+        dupefilter = super().from_crawler(crawler)
+        dupefilter.seen_key = f"{get_frontier_key(crawler.spider)}:seen"  # type: ignore[arg-type]
+        dupefilter.ttl = crawler.settings.getint("DISTRIBUTED_CRAWL_TTL_SECONDS")
+        dupefilter.seen_redis_connection = Redis(
+            host=REDIS_HOST, port=REDIS_PORT, password=REDIS_PASSWORD, username=REDIS_USER
+        )
+        return dupefilter  # type: ignore[return-value]
+
+    def seen_in_crawl(self, request: Union[ScrapyHttpRequest, SplashRequest]) -> bool:
+        """
+        Adds the fingerprint of `request` to the shared set. The request was seen by a job of
+            this crawl if it was already a member.
+        """
+        pipeline = self.seen_redis_connection.pipeline(  # type: ignore[union-attr]
+            transaction=False
+        )
+        pipeline.sadd(self.seen_key, self.request_fingerprint(request))
+        pipeline.expire(self.seen_key, self.ttl)
+        added, _ = pipeline.execute()
+        return not added
@@ -0,0 +1,178 @@
+"""
+Hands scraped pages over to the `MessageQueue` without blocking Scrapy's reactor thread.
+"""
+from logging import getLogger
+from queue import Queue
+from threading import Lock, Thread
+from time import monotonic
+from typing import Dict, Optional, Tuple, Union
+
+from message_queue import MessageQueue
+
+from core.domain import FreshProduct, PageValidators, ScrapedPage, UnchangedPage
+
+logger = getLogger(__name__)
+
+# Default number of pages that are waiting to be enqueued before `add_scraping` blocks
+DEFAULT_MAX_PENDING_PAGES = 100
+
+# Scraping table name, the page to enqueue, the validators of a scraped product page and the
+# mark of a fetched product page
+PendingPage = Tuple[
+    str, Union[ScrapedPage, UnchangedPage], Optional[PageValidators], Optional[FreshProduct]
+]
+
+
+class BackgroundEnqueuer:
+    def __init__(
+        self, message_queue: MessageQueue, max_pending_pages: int = DEFAULT_MAX_PENDING_PAGES
+    ) -> None:
+        """
+        Enqueues scraped pages with `message_queue` on a background thread, so that Redis
+            latency (and writes to the `HTMLStore`) do not stall concurrent downloads.
+
+        At most `max_pending_pages` pages wait for the background thread. If more pages are
+            added, e.g. while Redis is unavailable, `add_scraping` blocks until the background
+            thread caught up (backpressure), which bounds the memory used by pending pages.
+
+        Args:
+            message_queue (MessageQueue): Used to enqueue the pages, only by the background thread
+            max_pending_pages (int, optional): Maximum number of pages waiting to be enqueued.
+                Defaults to `DEFAULT_MAX_PENDING_PAGES`.
+        """
+        self.message_queue = message_queue
+
+        # `None` signals the background thread to stop
+        self.__pending_pages: Queue[Optional[PendingPage]] = Queue(max_pending_pages)
+
+        self.__metrics_lock = Lock()
+        self.__metrics: Dict[str, float] = {
+            "pages_added": 0,
+            "pages_enqueued": 0,
+            "pages_failed": 0,
+            "max_pending_pages": 0,
+            "blocked_seconds": 0.0,
+            "enqueue_seconds": 0.0,
+        }
+
+        self.__thread = Thread(target=self.__run, name="BackgroundEnqueuer", daemon=True)
+        self.__thread.start()
+
+    def add_scraping(
+        self,
+        table_name: str,
+        scraped_page: ScrapedPage,
+        page_validators: Optional[PageValidators] = None,
+        fresh_product: Optional[FreshProduct] = None,
+    ) -> None:
+        """
+        Hands `scraped_page` over to the background thread, which enqueues it to the
+            "scraping" `Queue`. Blocks only if `max_pending_pages` pages are pending.
+
+        Args:
+            table_name (str): Table name to insert the given `scraped_page`
+            scraped_page (ScrapedPage): Domain object representation to add to scraping table
+            page_validators (Optional[PageValidators], optional): Validators to store once the
+                `scraped_page` is written. Defaults to None.
+            fresh_product (Optional[FreshProduct], optional): Mark to store once the
+                `scraped_page` is written. Defaults to None.
+        """
+        self.__put(table_name, scraped_page, page_validators, fresh_product)
+
+    def add_unchanged_page(
+        self,
+        table_name: str,
+        unchanged_page: UnchangedPage,
+        fresh_product: Optional[FreshProduct] = None,
+    ) -> None:
+        """
+        Hands `unchanged_page` over to the background thread, which enqueues it with
+            `MessageQueue.add_unchanged_page`. Blocks only if `max_pending_pages` pages are
+            pending.
+
+        Args:
+            table_name (str): Scraping table name the page was stored in
+            unchanged_page (UnchangedPage): Domain object representation of the unchanged page
+            fresh_product (Optional[FreshProduct], optional): Mark to store once the
+                `unchanged_page` is written. Defaults to None.
+        """
+        self.__put(table_name, unchanged_page, fresh_product=fresh_product)
+
+    def __put(
+        self,
+        table_name: str,
+        page: Union[ScrapedPage, UnchangedPage],
+        page_validators: Optional[PageValidators] = None,
+        fresh_product: Optional[FreshProduct] = None,
+    ) -> None:
+        """
+        Helper method that adds `page` to the pending pages and measures how long it blocked.
+
+        Args:
+            table_name (str): Scraping table name of the `page`
+            page (Union[ScrapedPage, UnchangedPage]): Page to enqueue
+            page_validators (Optional[PageValidators], optional): Validators of a scraped
+                product page. Defaults to None.
+            fresh_product (Optional[FreshProduct], optional): Mark of a fetched product page.
+                Defaults to None.
+        """
+        started_at = monotonic()
+        self.__pending_pages.put((table_name, page, page_validators, fresh_product))
+        blocked_seconds = monotonic() - started_at
+
+        with self.__metrics_lock:
+            self.__metrics["pages_added"] += 1
+            self.__metrics["blocked_seconds"] += blocked_seconds
+            self.__metrics["max_pending_pages"] = max(
+                self.__metrics["max_pending_pages"], self.__pending_pages.qsize()
+            )
+
+    def __run(self) -> None:
+        """
+        Helper method that is executed on the background thread and enqueues pending pages.
+        """
+        while (pending_page := self.__pending_pages.get()) is not None:
+            table_name, page, page_validators, fresh_product = pending_page
+
+            started_at = monotonic()
+            try:
+                if isinstance(page, UnchangedPage):
+                    self.message_queue.add_unchanged_page(
+                        table_name=table_name, unchanged_page=page, fresh_product=fresh_product
+                    )
+                else:
+                    self.message_queue.add_scraping(
+                        table_name=table_name,
+                        scraped_page=page,
+                        page_validators=page_validators,
+                        fresh_product=fresh_product,
+                    )
+                succeeded = True
+            except Exception:
+                logger.exception(f"Could not enqueue page '{page.url}'.")
+                succeeded = False
+
+            with self.__metrics_lock:
+                self.__metrics["pages_enqueued" if succeeded else "pages_failed"] += 1
+                self.__metrics["enqueue_seconds"] += monotonic() - started_at
+
+    def close(self) -> None:
+        """
+        Waits until all pending pages are enqueued, stops the background thread and flushes the
+            `message_queue`. Call this before shutting down.
+        """
+        self.__pending_pages.put(None)
+        self.__thread.join()
+        self.message_queue.flush()
+
+    def get_metrics(self) -> Dict[str, float]:
+        """
+        Fetches the number of added, enqueued and failed pages, the maximum number of pending
+            pages, the seconds `add_scraping` blocked its callers and the seconds the background
+            thread spent enqueuing.
+
+        Returns:
+            Dict[str, float]: Metrics of this instance
+        """
+        with self.__metrics_lock:
+            return dict(self.__metrics)
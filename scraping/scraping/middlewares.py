@@ -1,11 +1,20 @@
+from hashlib import sha256
 from logging import getLogger
 from random import choice, uniform
 from time import monotonic
-from typing import Any, Optional
+from typing import Any, Dict, Optional, Union
 
+from redis import Redis
+from scrapy.crawler import Crawler
+from scrapy.exceptions import NotConfigured
+from scrapy.http import Request, Response
 from twisted.internet import reactor
 from twisted.internet.defer import Deferred
 
+from core.domain import PageValidators
+from core.redis import REDIS_HOST, REDIS_PASSWORD, REDIS_PORT, REDIS_USER
+
+from .dupefilter import MetaAwareDupeFilter, PersistentMetaAwareDupeFilter
 from .utils import get_json_data
 
 logger = getLogger(__name__)
@@ -15,6 +24,9 @@ AMAZON_MAX_REQUESTS_BEFORE_BREAK = 250
 AMAZON_MINIMUM_BREAK_LENGTH = 60**2 * 4  # 4 hours
 AMAZON_MAXIMUM_BREAK_LENGTH = 60**2 * 8
 
+# Prefix of the Redis keys of product page validators, followed by spider and fingerprint
+PAGE_VALIDATORS_KEY_PREFIX = "scraping:page_validators"
+
 
 class AmazonSchedulerMiddleware(object):
     """
@@ -54,3 +66,238 @@ class RandomUserAgentMiddleware(object):
 
     def process_request(self, request: Any, spider: Any) -> None:
         request.headers["User-Agent"] = choice(user_agents)["useragent"]
+
+
+class AdaptiveThrottleMiddleware(object):
+    """
+    Adapt the download delay and concurrency of each downloader slot, i.e., merchant domain,
+    to how the site responds, within the bounds of the `ADAPTIVE_THROTTLE_*` settings. Unless
+    `ADAPTIVE_THROTTLE_MIN_DELAY` and `ADAPTIVE_THROTTLE_MAX_CONCURRENCY` are set, the spider's
+    `DOWNLOAD_DELAY` and `CONCURRENT_REQUESTS_PER_DOMAIN` bound the delay and concurrency.
+
+    Responses with a status of `ADAPTIVE_THROTTLE_HTTP_CODES` (e.g. 429 or 503) or a body that
+    contains one of `ADAPTIVE_THROTTLE_CAPTCHA_MARKERS` double the delay (at least to its
+    `Retry-After` header) and halve the concurrency. Other responses move the delay towards
+    the observed latency divided by the concurrency, and every
+    `ADAPTIVE_THROTTLE_SUCCESSES_BEFORE_SPEEDUP` of them in a row increase the concurrency by
+    one. Captcha pages are requested again up to `ADAPTIVE_THROTTLE_CAPTCHA_RETRIES` times.
+
+    It needs to process responses after the `SplashMiddleware`, i.e., with a lower order, so that
+    captchas are found in the rendered HTML.
+    """
+
+    def __init__(self, crawler: Crawler) -> None:
+        settings = crawler.settings
+        if not settings.getbool("ADAPTIVE_THROTTLE_ENABLED"):
+            raise NotConfigured
+
+        self.crawler = crawler
+        # by default, never faster than the spider's own politeness settings
+        self.min_delay = settings.getfloat(
+            "ADAPTIVE_THROTTLE_MIN_DELAY", settings.getfloat("DOWNLOAD_DELAY")
+        )
+        self.max_delay = settings.getfloat("ADAPTIVE_THROTTLE_MAX_DELAY")
+        self.max_concurrency = settings.getint(
+            "ADAPTIVE_THROTTLE_MAX_CONCURRENCY", settings.getint("CONCURRENT_REQUESTS_PER_DOMAIN")
+        )
+        self.successes_before_speedup = settings.getint(
+            "ADAPTIVE_THROTTLE_SUCCESSES_BEFORE_SPEEDUP"
+        )
+        self.http_codes = {int(code) for code in settings.getlist("ADAPTIVE_THROTTLE_HTTP_CODES")}
+        self.captcha_markers = [
+            marker.encode("utf-8")
+            for marker in settings.getlist("ADAPTIVE_THROTTLE_CAPTCHA_MARKERS")
+        ]
+        self.captcha_retries = settings.getint("ADAPTIVE_THROTTLE_CAPTCHA_RETRIES")
+
+        # Maps downloader slot to the number of successful responses in a row
+        self.successes: Dict[str, int] = {}
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "AdaptiveThrottleMiddleware":
+        return cls(crawler)
+
+    def is_captcha(self, response: Response) -> bool:
+        return any(marker in response.body for marker in self.captcha_markers)
+
+    def process_response(
+        self, request: Request, response: Response, spider: Any
+    ) -> Union[Request, Response]:
+        key = request.meta.get("download_slot")
+        slot = self.crawler.engine.downloader.slots.get(key)  # type: ignore[union-attr]
+        latency = request.meta.get("download_latency")
+        if slot is None or latency is None:
+            return response
+
+        stats = self.crawler.stats
+        is_captcha = self.is_captcha(response)
+
+        if is_captcha or response.status in self.http_codes:
+            stats.inc_value(  # type: ignore[union-attr]
+                "adaptive_throttle/captcha" if is_captcha else "adaptive_throttle/throttled"
+            )
+            self.successes[key] = 0
+            # back off by at least a second, even if the spider crawls without delay
+            delay = slot.delay * 2 or max(self.min_delay, 1.0)
+            if retry_after := response.headers.get("Retry-After", b"").decode("utf-8"):
+                delay = max(delay, float(retry_after)) if retry_after.isdigit() else delay
+            self.update_slot(key, slot, delay, max(1, slot.concurrency // 2))
+
+            retries = request.meta.get("captcha_retries", 0)
+            if is_captcha and retries < self.captcha_retries:
+                logger.info(f"Captcha for {request}, retrying with a delay of {slot.delay:.1f}s")
+                retry_request = request.replace(dont_filter=True)
+                retry_request.meta["captcha_retries"] = retries + 1
+                return retry_request
+
+            # later middlewares, e.g., `ConditionalRequestMiddleware`, skip captcha pages
+            request.meta["captcha"] = is_captcha
+            return response
+
+        # if a site needs `latency` seconds to respond, a request every `latency / concurrency`
+        # seconds keeps `concurrency` requests in flight
+        target_delay = latency / slot.concurrency
+        concurrency = slot.concurrency
+        self.successes[key] = self.successes.get(key, 0) + 1
+        if self.successes[key] >= self.successes_before_speedup:
+            self.successes[key] = 0
+            concurrency += 1
+        self.update_slot(key, slot, (slot.delay + target_delay) / 2, concurrency)
+
+        return response
+
+    def update_slot(self, key: str, slot: Any, delay: float, concurrency: int) -> None:
+        """
+        Sets the delay and concurrency of the downloader `slot` within the configured bounds.
+
+        Args:
+            key (str): Key of the downloader slot, usually the domain
+            slot (Any): Downloader slot to update
+            delay (float): New download delay in seconds
+            concurrency (int): New number of concurrent requests
+        """
+        delay = min(max(delay, self.min_delay), self.max_delay)
+        concurrency = min(concurrency, self.max_concurrency)
+
+        if concurrency != slot.concurrency:
+            logger.info(
+                f"Slot '{key}': concurrency {slot.concurrency} -> {concurrency}, "
+                f"delay {slot.delay:.2f}s -> {delay:.2f}s"
+            )
+
+        slot.delay, slot.concurrency = delay, concurrency
+        self.crawler.stats.set_value(  # type: ignore[union-attr]
+            f"adaptive_throttle/{key}/delay", delay
+        )
+        self.crawler.stats.set_value(  # type: ignore[union-attr]
+            f"adaptive_throttle/{key}/concurrency", concurrency
+        )
+
+
+class ConditionalRequestMiddleware(object):
+    """
+    Detect product pages (requests with the `parse_PRODUCT` callback) that did not change since
+    they were scraped the last time, so that spiders record them as `UnchangedPage` instead of
+    sending them through the whole pipeline again.
+
+    The content hash, `ETag` and `Last-Modified` header of each product page are stored in
+    Redis for `PAGE_VALIDATORS_TTL_SECONDS`, keyed by spider name and
+    'meta_request_fingerprint', i.e., URL and the meta information of the product. Validators of
+    new or changed pages are handed over as `new_page_validators` in the response's meta and
+    stored by the `scraping` worker once the page is written into its scraping table. Requests
+    without Splash are sent as conditional requests, a `304 Not Modified` response marks the page
+    as unchanged. Otherwise, the page is unchanged if its content hash did not change.
+    The result is available as `page_unchanged` and `content_hash` in the response's meta.
+
+    It needs to process responses after the `SplashMiddleware` and the
+    `AdaptiveThrottleMiddleware`, i.e., with a lower order than both, so that the rendered HTML is
+    hashed and captcha pages, which the `AdaptiveThrottleMiddleware` flags, are skipped.
+    """
+
+    def __init__(self, crawler: Crawler, redis_connection: Optional[Redis] = None) -> None:
+        if not crawler.settings.getbool("CONDITIONAL_REQUESTS_ENABLED"):
+            raise NotConfigured
+
+        self.ttl = crawler.settings.getint("PAGE_VALIDATORS_TTL_SECONDS")
+        self.redis_connection = redis_connection or Redis(
+            host=REDIS_HOST, port=REDIS_PORT, password=REDIS_PASSWORD, username=REDIS_USER
+        )
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "ConditionalRequestMiddleware":
+        return cls(crawler)
+
+    def process_request(self, request: Request, spider: Any) -> None:
+        # Splash requests pass again once they are processed by the `SplashMiddleware`
+        if "page_validators_key" in request.meta:
+            return None
+
+        if not PersistentMetaAwareDupeFilter.is_product_request(request):
+            return None
+
+        key = (
+            f"{PAGE_VALIDATORS_KEY_PREFIX}:{spider.name}:"
+            f"{MetaAwareDupeFilter.meta_request_fingerprint(request)}"
+        )
+        validators = {
+            field.decode("utf-8"): value.decode("utf-8")
+            for field, value in self.redis_connection.hgetall(key).items()
+        }
+        request.meta["page_validators_key"] = key
+        request.meta["page_validators"] = validators
+
+        # Splash requests the page itself and does not forward a `304` response
+        if "splash" not in request.meta and "content_hash" in validators:
+            if etag := validators.get("etag"):
+                request.headers["If-None-Match"] = etag
+            if last_modified := validators.get("last_modified"):
+                request.headers["If-Modified-Since"] = last_modified
+            request.meta["handle_httpstatus_list"] = request.meta.get(
+                "handle_httpstatus_list", []
+            ) + [304]
+
+        return None
+
+    def process_response(self, request: Request, response: Response, spider: Any) -> Response:
+        if (key := request.meta.get("page_validators_key")) is None:
+            return response
+
+        if request.meta.get("captcha"):
+            return response
+
+        validators = request.meta["page_validators"]
+
+        if response.status == 304:
+            request.meta["page_unchanged"] = True
+            request.meta["content_hash"] = validators["content_hash"]
+            self.redis_connection.expire(key, self.ttl)
+            return response
+
+        if not 200 <= response.status < 300:
+            return response
+
+        content_hash = sha256(response.body).hexdigest()
+        request.meta["content_hash"] = content_hash
+
+        if content_hash == validators.get("content_hash"):
+            request.meta["page_unchanged"] = True
+            self.redis_connection.expire(key, self.ttl)
+            return response
+
+        request.meta["page_unchanged"] = False
+        # stored by the `scraping` worker once the page is written into its scraping table,
+        # a page lost on its way there is then not taken as unchanged by the next crawl
+        etag: Optional[bytes] = None
+        last_modified: Optional[bytes] = None
+        if "splash" not in request.meta:
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+        request.meta["new_page_validators"] = PageValidators(
+            key=key,
+            ttl_seconds=self.ttl,
+            content_hash=content_hash,
+            etag=etag.decode("utf-8") if etag else None,
+            last_modified=last_modified.decode("utf-8") if last_modified else None,
+        )
+
+        return response
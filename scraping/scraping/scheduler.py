@@ -0,0 +1,155 @@
+"""
+Redis-backed scheduler that shares the crawl frontier of a spider between scrapyd jobs.
+"""
+import pickle
+from logging import getLogger
+from time import monotonic
+from typing import Any, Optional
+
+from redis import Redis
+from scrapy import Spider, signals
+from scrapy.core.scheduler import BaseScheduler
+from scrapy.crawler import Crawler
+from scrapy.dupefilters import BaseDupeFilter
+from scrapy.exceptions import DontCloseSpider
+from scrapy.http import Request
+from scrapy.utils.misc import create_instance, load_object
+from scrapy.utils.request import request_from_dict
+
+from core.redis import REDIS_HOST, REDIS_PASSWORD, REDIS_PORT, REDIS_USER
+
+logger = getLogger(__name__)
+
+# Prefix of the Redis keys of a crawl's frontier, followed by spider name and timestamp
+FRONTIER_KEY_PREFIX = "scraping:frontier"
+
+
+def get_frontier_key(spider: Spider) -> str:
+    """
+    All scrapyd jobs of a spider that are started with the same `timestamp` belong to the same
+    crawl and share its frontier.
+
+    Args:
+        spider (Spider): Spider of the crawl, needs the `timestamp` attribute of `BaseSpider`
+
+    Returns:
+        str: Prefix of the Redis keys of the crawl's frontier
+    """
+    return f"{FRONTIER_KEY_PREFIX}:{spider.name}:{spider.timestamp}"
+
+
+class RedisScheduler(BaseScheduler):
+    """
+    Scheduler that keeps the pending requests of a crawl in a Redis sorted set, ordered by
+    their priority, instead of in memory. Multiple scrapyd jobs of the same spider and
+    `timestamp` (possibly on different scrapyd nodes) therefore cooperate on one crawl: each job
+    downloads the requests it pops from the shared frontier, and the requests found by any job
+    are available to all of them.
+
+    Requests are filtered with `DUPEFILTER_CLASS`, which needs to share its fingerprints, too,
+    i.e., 'SharedMetaAwareDupeFilter'. A job that has nothing to do keeps waiting for requests
+    of the other jobs for `DISTRIBUTED_CRAWL_IDLE_SECONDS` before it closes. The frontier
+    expires `DISTRIBUTED_CRAWL_TTL_SECONDS` after the last request was added.
+    """
+
+    def __init__(
+        self,
+        crawler: Crawler,
+        dupefilter: BaseDupeFilter,
+        redis_connection: Optional[Redis] = None,
+    ) -> None:
+        self.crawler = crawler
+        self.stats = crawler.stats
+        self.dupefilter = dupefilter
+        self.idle_seconds = crawler.settings.getfloat("DISTRIBUTED_CRAWL_IDLE_SECONDS")
+        self.ttl = crawler.settings.getint("DISTRIBUTED_CRAWL_TTL_SECONDS")
+        self.redis_connection = redis_connection or Redis(
+            host=REDIS_HOST, port=REDIS_PORT, password=REDIS_PASSWORD, username=REDIS_USER
+        )
+
+        self.spider: Optional[Spider] = None
+        self.requests_key = ""
+        self.idle_since: Optional[float] = None
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "RedisScheduler":
+        dupefilter_class = load_object(crawler.settings["DUPEFILTER_CLASS"])
+        dupefilter = create_instance(dupefilter_class, crawler.settings, crawler)
+        scheduler = cls(crawler, dupefilter)
+        crawler.signals.connect(scheduler.spider_idle, signal=signals.spider_idle)
+        return scheduler
+
+    def open(self, spider: Spider) -> Any:
+        self.spider = spider
+        self.requests_key = f"{get_frontier_key(spider)}:requests"
+        logger.info(
+            f"Sharing the frontier '{self.requests_key}' with "
+            f"{self.redis_connection.zcard(self.requests_key)} pending requests."
+        )
+        return self.dupefilter.open()
+
+    def close(self, reason: str) -> Any:
+        return self.dupefilter.close(reason)
+
+    def has_pending_requests(self) -> bool:
+        return self.redis_connection.zcard(self.requests_key) > 0
+
+    def enqueue_request(self, request: Request) -> bool:
+        if not request.dont_filter and self.dupefilter.request_seen(request):
+            self.dupefilter.log(request, self.spider)
+            return False
+
+        pipeline = self.redis_connection.pipeline(transaction=False)
+        # the lowest score is popped first, Scrapy requests with higher priority first
+        pipeline.zadd(self.requests_key, {self.serialize(request): -request.priority})
+        pipeline.expire(self.requests_key, self.ttl)
+        pipeline.execute()
+
+        self.stats.inc_value("scheduler/enqueued/redis", spider=self.spider)
+        self.stats.inc_value("scheduler/enqueued", spider=self.spider)
+        return True
+
+    def next_request(self) -> Optional[Request]:
+        popped = self.redis_connection.zpopmin(self.requests_key)
+        if not popped:
+            return None
+
+        self.idle_since = None
+        self.stats.inc_value("scheduler/dequeued/redis", spider=self.spider)
+        self.stats.inc_value("scheduler/dequeued", spider=self.spider)
+        return self.deserialize(popped[0][0])
+
+    def serialize(self, request: Request) -> bytes:
+        """
+        Requests are stored as pickled `dict`, which references the spider's callbacks by name.
+
+        Args:
+            request (Request): Request to store in the frontier
+
+        Returns:
+            bytes: Serialized `request`
+        """
+        return pickle.dumps(request.to_dict(spider=self.spider), protocol=4)
+
+    def deserialize(self, serialized_request: bytes) -> Request:
+        """
+        Restores requests stored by `serialize`, including their class, e.g., `SplashRequest`.
+
+        Args:
+            serialized_request (bytes): Request as stored in the frontier
+
+        Returns:
+            Request: Request with the callbacks of this job's spider
+        """
+        return request_from_dict(pickle.loads(serialized_request), spider=self.spider)
+
+    def spider_idle(self, spider: Spider) -> None:
+        """
+        Handler of the `spider_idle` signal, keeps the spider open for `idle_seconds` after its
+            last request, since the other jobs might still add requests to the frontier.
+        """
+        if self.idle_since is None:
+            self.idle_since = monotonic()
+
+        if monotonic() - self.idle_since < self.idle_seconds:
+            raise DontCloseSpider
@@ -7,6 +7,8 @@
 #     https://docs.scrapy.org/en/latest/topics/downloader-middleware.html
 #     https://docs.scrapy.org/en/latest/topics/spider-middleware.html
 
+import os
+
 BOT_NAME = "scraping"
 
 SPIDER_MODULES = ["scraping.spiders"]
@@ -59,6 +61,8 @@ SPIDER_MIDDLEWARES = {
 #    'scraping.middlewares.ScrapingDownloaderMiddleware': 543,
 # }
 DOWNLOADER_MIDDLEWARES = {
+    "scraping.middlewares.ConditionalRequestMiddleware": 690,
+    "scraping.middlewares.AdaptiveThrottleMiddleware": 700,
     "scrapy_splash.SplashCookiesMiddleware": 723,
     "scrapy_splash.SplashMiddleware": 725,
     "scrapy.downloadermiddlewares.httpcompression.HttpCompressionMiddleware": 810,
@@ -89,6 +93,26 @@ DOWNLOADER_MIDDLEWARES = {
 # Enable showing throttling stats for every response received:
 # AUTOTHROTTLE_DEBUG = False
 
+# Adapt delay and concurrency per merchant domain to its latency, throttling responses and
+# captchas, see `AdaptiveThrottleMiddleware`. The `DOWNLOAD_DELAY` is the start delay.
+# Do not enable it together with AutoThrottle, both set the delay.
+ADAPTIVE_THROTTLE_ENABLED = True
+# Politeness bounds. By default, the delay does not fall below the spider's `DOWNLOAD_DELAY` and
+# the concurrency does not exceed its `CONCURRENT_REQUESTS_PER_DOMAIN`, i.e., the middleware
+# only slows down. Spiders allow it to go faster in their `custom_settings`, e.g. otto.de:
+# ADAPTIVE_THROTTLE_MIN_DELAY = 1
+# ADAPTIVE_THROTTLE_MAX_CONCURRENCY = 4
+ADAPTIVE_THROTTLE_MAX_DELAY = 120
+# Successful responses in a row before the concurrency is increased by one
+ADAPTIVE_THROTTLE_SUCCESSES_BEFORE_SPEEDUP = 50
+ADAPTIVE_THROTTLE_HTTP_CODES = [429, 503]
+ADAPTIVE_THROTTLE_CAPTCHA_MARKERS = [
+    "/errors/validateCaptcha",  # Amazon
+    "captcha-delivery.com",  # DataDome
+    "px-captcha",  # PerimeterX
+]
+ADAPTIVE_THROTTLE_CAPTCHA_RETRIES = 2
+
 # Enable and configure HTTP caching (disabled by default)
 # See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html#httpcache-middleware-settings  # noqa
 # HTTPCACHE_ENABLED = True
@@ -98,7 +122,29 @@ DOWNLOADER_MIDDLEWARES = {
 # HTTPCACHE_STORAGE = 'scrapy.extensions.httpcache.FilesystemCacheStorage'
 
 # Further Splash settings
-DUPEFILTER_CLASS = "scraping.dupefilter.MetaAwareDupeFilter"
+DUPEFILTER_CLASS = "scraping.dupefilter.PersistentMetaAwareDupeFilter"
 HTTPCACHE_STORAGE = "scrapy_splash.SplashAwareFSCacheStorage"
 
 SPLASH_URL = "http://splash:8050"
+
+# Skip product pages fetched by a previous run within this many seconds (0 disables),
+# see `PersistentMetaAwareDupeFilter`. Spiders can override it in their `custom_settings`.
+PRODUCT_FRESHNESS_SECONDS = int(os.environ.get("PRODUCT_FRESHNESS_SECONDS", 0))
+
+# Record product pages that did not change since they were scraped the last time as unchanged
+# pages, instead of storing, extracting and classifying them again,
+# see `ConditionalRequestMiddleware`. Their validators are kept for this many seconds.
+CONDITIONAL_REQUESTS_ENABLED = (
+    os.environ.get("CONDITIONAL_REQUESTS_ENABLED", "false").lower() == "true"
+)
+PAGE_VALIDATORS_TTL_SECONDS = 60 * 60 * 24 * 30
+
+# Share the request queue and dupefilter of a crawl in Redis, so that all scrapyd jobs of a spider
+# started with the same `timestamp` cooperate on the crawl, see `RedisScheduler`. Idle jobs wait
+# this many seconds for requests of the other jobs, the frontier expires after the TTL.
+DISTRIBUTED_CRAWL_ENABLED = os.environ.get("DISTRIBUTED_CRAWL_ENABLED", "false").lower() == "true"
+DISTRIBUTED_CRAWL_IDLE_SECONDS = 300
+DISTRIBUTED_CRAWL_TTL_SECONDS = 60 * 60 * 24
+if DISTRIBUTED_CRAWL_ENABLED:
+    SCHEDULER = "scraping.scheduler.RedisScheduler"
+    DUPEFILTER_CLASS = "scraping.dupefilter.SharedMetaAwareDupeFilter"
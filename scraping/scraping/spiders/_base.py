@@ -2,10 +2,12 @@ import json
 from abc import abstractmethod
 from datetime import datetime
 from logging import getLogger
-from typing import Any, Dict, Iterator, List, Optional, Union
+from time import monotonic
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
 
 from message_queue import MessageQueue
 from scrapy import Spider
+from scrapy.http.request import Request as ScrapyHttpRequest
 from scrapy.http.response import Response as ScrapyHttpResponse
 from scrapy.http.response.text import TextResponse as ScrapyTextResponse
 from scrapy_splash import SplashJsonResponse, SplashRequest
@@ -21,8 +23,16 @@ from core.constants import (
     TABLE_NAME_SCRAPING_ZALANDO_FR,
     TABLE_NAME_SCRAPING_ZALANDO_GB,
 )
-from core.domain import ConsumerLifestageType, CountryType, GenderType, PageType, ScrapedPage
+from core.domain import (
+    ConsumerLifestageType,
+    CountryType,
+    GenderType,
+    PageType,
+    ScrapedPage,
+    UnchangedPage,
+)
 
+from ..enqueuer import DEFAULT_MAX_PENDING_PAGES, BackgroundEnqueuer
 from ..splash import minimal_script
 from ..start_scripts.amazon_eu import get_settings as get_amazon_eu_settings
 from ..start_scripts.asos_fr import get_settings as get_asos_fr_settings
@@ -48,6 +58,10 @@ SETTINGS = {
 
 
 class BaseSpider(Spider):
+    # Whether pages are requested through Splash, spiders of server-side rendered pages can
+    # disable it. It can also be set per crawl with the spider argument 'use_splash'.
+    use_splash = True
+
     def __init__(
         self,
         timestamp: datetime,
@@ -58,6 +72,7 @@ class BaseSpider(Spider):
         search_term: Optional[str] = None,
         meta_data: Optional[Union[str, Dict[str, str]]] = None,
         products_per_page: Optional[int] = None,
+        use_splash: Optional[Union[str, bool]] = None,
         **kwargs: Dict[str, Any],
     ) -> None:
         """
@@ -77,6 +92,8 @@ class BaseSpider(Spider):
                 that could be useful downstream. Defaults to None.
             products_per_page (Optional[int], optional): Limits how many products should be
                 scraped for each starting page. Defaults to None.
+            use_splash (Optional[Union[str, bool]], optional): Whether pages are requested
+                through Splash, overrides the spider's `use_splash` attribute. Defaults to None.
         """
 
         if not self.name:
@@ -98,10 +115,16 @@ class BaseSpider(Spider):
 
         # set default value
         self.request_timeout = getattr(self, "request_timeout", 0.5)
-        self.StartRequest = SplashRequest
+        if use_splash is not None:
+            self.use_splash = str(use_splash).lower() == "true"
+        self.StartRequest = SplashRequest if self.use_splash else ScrapyHttpRequest
 
         self.timestamp = timestamp
         self.message_queue = MessageQueue()
+        # enqueue pages on a background thread, Redis latency would stall all downloads otherwise
+        self.max_pending_pages = int(getattr(self, "max_pending_pages", DEFAULT_MAX_PENDING_PAGES))
+        self.enqueuer = BackgroundEnqueuer(self.message_queue, self.max_pending_pages)
+        self.started_at = monotonic()
 
         if start_urls:
             self.start_urls = start_urls
@@ -223,12 +246,58 @@ class BaseSpider(Spider):
                 )
             logger.info(f"Crawling setting: {setting}")
 
+    def page_request(
+        self,
+        url: str,
+        callback: Callable,
+        meta: dict,
+        priority: int = 0,
+        cb_kwargs: Optional[dict] = None,
+        wait: float = 5,
+    ) -> Union[SplashRequest, ScrapyHttpRequest]:
+        """
+        Helper method for child classes. Creates the request of a SERP or product page, rendered
+            by Splash with the `minimal_script` or, if `use_splash` is disabled, as plain
+            `Scrapy` request for pages that render server-side.
+
+        Args:
+            url (str): URL of the page
+            callback (Callable): Method that parses the response
+            meta (dict): Meta information of the request
+            priority (int, optional): Priority of the request. Defaults to 0.
+            cb_kwargs (Optional[dict], optional): Keyword arguments of the `callback`.
+                Defaults to None.
+            wait (float, optional): Seconds Splash waits after loading the page. Defaults to 5.
+
+        Returns:
+            Union[SplashRequest, ScrapyHttpRequest]: Request that will be performed
+        """
+        if not self.use_splash:
+            return ScrapyHttpRequest(
+                url=url, callback=callback, meta=meta, priority=priority, cb_kwargs=cb_kwargs
+            )
+
+        return SplashRequest(
+            url=url,
+            callback=callback,
+            cb_kwargs=cb_kwargs,
+            meta=meta,
+            endpoint="execute",
+            priority=priority,
+            args={  # passed to Splash HTTP API
+                "wait": wait,
+                "lua_source": minimal_script,
+                "timeout": 180,
+                "allowed_content_type": "text/html",
+            },
+        )
+
     def _save_SERP(
         self, response: Union[SplashJsonResponse, ScrapyHttpResponse, ScrapyTextResponse]
     ) -> None:
         """
         Helper method for child classes. Simply instantiates a `SrapedPage` object
-            and enqueues this to the scraping `Queue`.
+            and hands this over to the `enqueuer`, which enqueues it to the scraping `Queue`.
 
         Args:
             response (SplashJsonResponse): Response from a performed request
@@ -248,12 +317,14 @@ class BaseSpider(Spider):
             meta_information=response.meta.get("meta_data"),
         )
 
-        self.message_queue.add_scraping(table_name=self.table_name, scraped_page=scraped_page)
+        self.enqueuer.add_scraping(table_name=self.table_name, scraped_page=scraped_page)
+        self.crawler.stats.inc_value(f"pages/{PageType.SERP.value}")
 
     def parse_PRODUCT(self, response: Union[SplashJsonResponse, ScrapyHttpResponse]) -> None:
         """
         Helper method for child classes. Simply instantiates a `SrapedPage` object
-            and enqueues this to the scraping `Queue`.
+            and hands this over to the `enqueuer`, which enqueues it to the scraping `Queue`.
+            Pages that did not change since the last crawl are handed over as `UnchangedPage`.
 
         Args:
             response (SplashJsonResponse): Response from a performed request
@@ -266,6 +337,29 @@ class BaseSpider(Spider):
 
         meta_information["original_URL"] = response.meta.get("original_URL", None)
 
+        # see `ConditionalRequestMiddleware`
+        if response.meta.get("page_unchanged"):
+            unchanged_page = UnchangedPage(
+                timestamp=self.timestamp,
+                source=self.source,
+                merchant=self.merchant,
+                country=self.country,
+                url=response.url,
+                category=response.meta.get("category"),
+                gender=response.meta.get("gender"),
+                consumer_lifestage=response.meta.get("consumer_lifestage"),
+                page_type=PageType.PRODUCT,
+                content_hash=response.meta["content_hash"],
+                meta_information=meta_information,
+            )
+            self.enqueuer.add_unchanged_page(
+                table_name=self.table_name,
+                unchanged_page=unchanged_page,
+                fresh_product=response.meta.get("new_fresh_product"),
+            )
+            self.crawler.stats.inc_value("pages/unchanged")
+            return
+
         scraped_page = ScrapedPage(
             timestamp=self.timestamp,
             source=self.source,
@@ -280,7 +374,36 @@ class BaseSpider(Spider):
             meta_information=meta_information,
         )
 
-        self.message_queue.add_scraping(table_name=self.table_name, scraped_page=scraped_page)
+        self.enqueuer.add_scraping(
+            table_name=self.table_name,
+            scraped_page=scraped_page,
+            page_validators=response.meta.get("new_page_validators"),
+            fresh_product=response.meta.get("new_fresh_product"),
+        )
+        self.crawler.stats.inc_value(f"pages/{PageType.PRODUCT.value}")
+
+    def closed(self, reason: str) -> None:
+        """
+        The `Scrapy` framework executes this method when the spider closes.
+        Makes sure that all pending pages and collected batches are enqueued, logs the Redis
+            memory used by the enqueued jobs and the crawl throughput, and adds the `enqueuer`'s
+            metrics to the crawl stats.
+
+        Args:
+            reason (str): Why the spider was closed
+        """
+        self.enqueuer.close()
+        logger.info(f"Redis job memory: {self.message_queue.get_job_memory_statistics()}")
+
+        metrics = self.enqueuer.get_metrics()
+        pages_per_minute = metrics["pages_added"] / (monotonic() - self.started_at) * 60
+        logger.info(
+            f"Scraped {metrics['pages_added']} pages ({pages_per_minute:.1f} pages/min), "
+            f"enqueuing blocked the crawl for {metrics['blocked_seconds']:.2f} seconds and took "
+            f"{metrics['enqueue_seconds']:.2f} seconds in the background."
+        )
+        for key, value in (metrics | {"pages_per_minute": pages_per_minute}).items():
+            self.crawler.stats.set_value(f"enqueuer/{key}", value)
 
     @abstractmethod
     def parse_SERP(self, response: SplashJsonResponse) -> Iterator[SplashRequest]:
@@ -5,7 +5,6 @@ from scrapy_splash import SplashJsonResponse, SplashRequest
 
 from core.constants import TABLE_NAME_SCRAPING_AMAZON_DE
 
-from ..splash import minimal_script
 from ..utils import strip_url
 from ._base import BaseSpider
 
@@ -20,6 +19,8 @@ class AmazonSpider(BaseSpider):
         "DOWNLOADER_MIDDLEWARES": {
             "scraping.middlewares.RandomUserAgentMiddleware": 400,
             "scraping.middlewares.AmazonSchedulerMiddleware": 543,
+            "scraping.middlewares.ConditionalRequestMiddleware": 690,
+            "scraping.middlewares.AdaptiveThrottleMiddleware": 700,
             "scrapy.downloadermiddlewares.retry.RetryMiddleware": None,
         },
         "DEFAULT_REQUEST_HEADERS": {
@@ -75,7 +76,7 @@ class AmazonSpider(BaseSpider):
 
         for url, price in zip(urls, prices):
             if "refinements=p_n_cpf_eligible" in url:
-                yield SplashRequest(
+                yield self.page_request(
                     url=strip_url(response.urljoin(url)),
                     callback=self.parse_PRODUCT,
                     meta={
@@ -85,14 +86,8 @@ class AmazonSpider(BaseSpider):
                         "dont_merge_cookies": True,
                     }
                     | self.create_default_request_meta(response),
-                    endpoint="execute",
                     priority=1,  # higher priority than SERP
-                    args={  # passed to Splash HTTP API
-                        "wait": self.request_timeout,
-                        "lua_source": minimal_script,
-                        "timeout": 180,
-                        "allowed_content_type": "text/html",
-                    },
+                    wait=self.request_timeout,
                 )
 
         # Pagination
@@ -103,18 +98,12 @@ class AmazonSpider(BaseSpider):
 
             logger.info(f"Next page found, number {page_number} at {next_page}")
 
-            yield SplashRequest(
+            yield self.page_request(
                 url=next_page,
                 callback=self.parse_SERP,
                 meta=self.create_default_request_meta(response, original_url=next_page)
                 | {"dont_merge_cookies": True},
-                endpoint="execute",
-                args={  # passed to Splash HTTP API
-                    "wait": self.request_timeout,
-                    "lua_source": minimal_script,
-                    "timeout": 180,
-                    "allowed_content_type": "text/html",
-                },
+                wait=self.request_timeout,
             )
         else:
             logger.info(f"No further pages found for {response.url}")
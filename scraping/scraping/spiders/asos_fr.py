@@ -1,6 +1,5 @@
 import json
 import math
-from datetime import datetime
 from logging import getLogger
 from typing import Iterator
 from urllib.parse import parse_qs, urlparse
@@ -19,6 +18,7 @@ class AsosSpider(BaseSpider):
     name = TABLE_NAME_SCRAPING_ASOS_FR
     source, _ = name.rsplit("_", 1)
     allowed_domains = ["asos.com"]
+    use_splash = False
     _product_api = "https://www.asos.com/api/product/catalogue/v3/products/"
     _filters = "?currency=EUR&lang=fr-FR&sizeSchema=FR&store=FR&keyStoreDataversion=dup0qtf-35"
 
@@ -42,10 +42,6 @@ class AsosSpider(BaseSpider):
         "DEFAULT_REQUEST_HEADERS": headers,
     }
 
-    def __init__(self, timestamp: datetime, **kwargs):  # type: ignore
-        super().__init__(timestamp, **kwargs)
-        self.StartRequest = ScrapyHttpRequest
-
     def parse_SERP(self, response: ScrapyHttpResponse) -> Iterator[ScrapyHttpRequest]:
         # Save HTML to database
         self._save_SERP(response)
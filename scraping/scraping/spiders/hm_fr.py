@@ -20,9 +20,14 @@ class HMSpider(BaseSpider):
     name = TABLE_NAME_SCRAPING_HM_FR
     source, _ = name.rsplit("_", 1)
     allowed_domains = ["hm.com"]
+    use_splash = False
 
     custom_settings = {
         "DOWNLOAD_DELAY": 2,
+        # bounds of the `AdaptiveThrottleMiddleware`, while H&M responds normally, each
+        # request renders the page in a browser
+        "ADAPTIVE_THROTTLE_MIN_DELAY": 1,
+        "ADAPTIVE_THROTTLE_MAX_CONCURRENCY": 3,
         "USER_AGENT": "Green Consumption Assistant",
         "DOWNLOAD_HANDLERS": {
             "http": "scrapy_playwright.handler.ScrapyPlaywrightDownloadHandler",
@@ -60,7 +65,6 @@ class HMSpider(BaseSpider):
     def __init__(self, timestamp: datetime.datetime, **kwargs):  # type: ignore
         super().__init__(timestamp, **kwargs)
         self._check_time()
-        self.StartRequest = ScrapyHttpRequest
 
     def parse_SERP(self, response: ScrapyHttpResponse) -> Iterator[ScrapyHttpRequest]:
         self._save_SERP(response)
@@ -7,7 +7,6 @@ from scrapy_splash import SplashJsonResponse, SplashRequest
 
 from core.constants import TABLE_NAME_SCRAPING_OTTO_DE
 
-from ..splash import minimal_script
 from ..start_scripts.otto_de import SUSTAINABILITY_FILTER
 from ._base import BaseSpider
 
@@ -18,7 +17,12 @@ class OttoSpider(BaseSpider):
     name = TABLE_NAME_SCRAPING_OTTO_DE
     source, _ = name.rsplit("_", 1)
     allowed_domains = ["otto.de"]
-    custom_settings = {"DOWNLOAD_DELAY": 4}
+    custom_settings = {
+        "DOWNLOAD_DELAY": 4,
+        # bounds of the `AdaptiveThrottleMiddleware`, while otto.de responds normally
+        "ADAPTIVE_THROTTLE_MIN_DELAY": 1,
+        "ADAPTIVE_THROTTLE_MAX_CONCURRENCY": 4,
+    }
 
     def parse_SERP(self, response: SplashJsonResponse) -> Iterator[SplashRequest]:
         # Save HTML to database
@@ -46,18 +50,11 @@ class OttoSpider(BaseSpider):
         logger.info(f"Number of products per page {len(all_product_links)} to be scraped")
 
         for product_link in all_product_links:
-            yield SplashRequest(
+            yield self.page_request(
                 url=product_link,
                 callback=self.parse_PRODUCT,
-                endpoint="execute",
                 priority=2,
                 meta=self.create_default_request_meta(response),
-                args={  # passed to Splash HTTP API
-                    "wait": 5,
-                    "lua_source": minimal_script,
-                    "timeout": 180,
-                    "allowed_content_type": "text/html",
-                },
             )
 
         # Pagination uses parameters 'l' and 'o' to load next batch of products
@@ -81,19 +78,12 @@ class OttoSpider(BaseSpider):
                 else:
                     url = f'{url}?l={pagination_info["l"]}&o={pagination_info["o"]}'
 
-                yield SplashRequest(
+                yield self.page_request(
                     url=url,
                     callback=self.parse_SERP,
                     meta={"o": int(pagination_info["o"])}
                     | self.create_default_request_meta(response),
-                    endpoint="execute",
                     priority=1,
-                    args={  # passed to Splash HTTP API
-                        "wait": 5,
-                        "lua_source": minimal_script,
-                        "timeout": 180,
-                        "allowed_content_type": "text/html",
-                    },
                 )
             else:
                 logger.info(f"No further pages: {response.url}")
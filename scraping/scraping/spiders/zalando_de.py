@@ -7,7 +7,6 @@ from scrapy_splash import SplashJsonResponse, SplashRequest
 
 from core.constants import TABLE_NAME_SCRAPING_ZALANDO_DE
 
-from ..splash import minimal_script
 from ._base import BaseSpider
 
 logger = getLogger(__name__)
@@ -17,7 +16,12 @@ class ZalandoSpider(BaseSpider):
     name = TABLE_NAME_SCRAPING_ZALANDO_DE
     source, _ = name.rsplit("_", 1)
     allowed_domains = ["zalando.de"]
-    custom_settings = {"DOWNLOAD_DELAY": 2}
+    custom_settings = {
+        "DOWNLOAD_DELAY": 2,
+        # bounds of the `AdaptiveThrottleMiddleware`, while Zalando responds normally
+        "ADAPTIVE_THROTTLE_MIN_DELAY": 0.5,
+        "ADAPTIVE_THROTTLE_MAX_CONCURRENCY": 4,
+    }
 
     def parse_SERP(
         self, response: SplashJsonResponse, is_first_page: bool = True
@@ -57,18 +61,11 @@ class ZalandoSpider(BaseSpider):
         logger.info(f"Number of products per page {len(all_product_links)} to be scraped")
 
         for product_link in all_product_links:
-            yield SplashRequest(
+            yield self.page_request(
                 url=product_link,
                 callback=self.parse_PRODUCT,
-                endpoint="execute",
                 priority=2,
                 meta=self.create_default_request_meta(response),
-                args={  # passed to Splash HTTP API
-                    "wait": 5,
-                    "lua_source": minimal_script,
-                    "timeout": 180,
-                    "allowed_content_type": "text/html",
-                },
             )
 
         # Pagination: Parse next SERP 'recursively'
@@ -76,19 +73,12 @@ class ZalandoSpider(BaseSpider):
 
         if (is_first_page and pagination) or len(pagination) == 2:
             next_page = response.urljoin(pagination[-1])
-            yield SplashRequest(
+            yield self.page_request(
                 url=next_page,
                 callback=self.parse_SERP,
                 cb_kwargs=dict(is_first_page=False),
                 meta=self.create_default_request_meta(response, original_url=next_page),
-                endpoint="execute",
                 priority=1,
-                args={  # passed to Splash HTTP API
-                    "wait": 5,
-                    "lua_source": minimal_script,
-                    "timeout": 180,
-                    "allowed_content_type": "text/html",
-                },
             )
         else:
             logger.info(f"No further pages: {response.url}")
@@ -0,0 +1,130 @@
+from typing import Any, Callable, Dict, List, Tuple
+
+import pytest
+from scrapy import Spider
+from scrapy.crawler import Crawler
+from scrapy.http import Response
+from scrapy.utils.test import get_crawler
+
+from scraping import dupefilter, middlewares, scheduler
+
+
+class InMemoryRedis:
+    """
+    Stands in for the Redis server of the components under test, every `Redis` connection they
+    open shares its data. Implements the commands they use, returning what Redis returns.
+    """
+
+    def __init__(self) -> None:
+        self.data: Dict[str, Any] = {}
+        self.ttls: Dict[str, int] = {}
+
+    def set(self, key: str, value: Any, ex: int) -> bool:
+        self.data[key] = str(value).encode()
+        self.ttls[key] = ex
+        return True
+
+    def exists(self, key: str) -> int:
+        return int(key in self.data)
+
+    def delete(self, key: str) -> int:
+        self.ttls.pop(key, None)
+        return int(self.data.pop(key, None) is not None)
+
+    def expire(self, key: str, seconds: int) -> bool:
+        if key not in self.data:
+            return False
+        self.ttls[key] = seconds
+        return True
+
+    def hgetall(self, key: str) -> Dict[bytes, bytes]:
+        return dict(self.data.get(key, {}))
+
+    def hset(self, key: str, mapping: Dict[str, str]) -> int:
+        fields = self.data.setdefault(key, {})
+        added = len(set(mapping) - {field.decode() for field in fields})
+        fields.update({field.encode(): value.encode() for field, value in mapping.items()})
+        return added
+
+    def sadd(self, key: str, *values: str) -> int:
+        members = self.data.setdefault(key, set())
+        added = len(set(values) - members)
+        members.update(values)
+        return added
+
+    def zadd(self, key: str, mapping: Dict[bytes, float]) -> int:
+        members = self.data.setdefault(key, {})
+        added = len(set(mapping) - set(members))
+        members.update(mapping)
+        return added
+
+    def zcard(self, key: str) -> int:
+        return len(self.data.get(key, {}))
+
+    def zpopmin(self, key: str) -> List[Tuple[bytes, float]]:
+        members = self.data.get(key, {})
+        if not members:
+            return []
+        member = min(members, key=lambda member: (members[member], member))
+        return [(member, members.pop(member))]
+
+    def pipeline(self, transaction: bool) -> "InMemoryPipeline":
+        return InMemoryPipeline(self)
+
+
+class InMemoryPipeline:
+    """
+    Queues the commands of the `InMemoryRedis` until `execute` is called.
+    """
+
+    def __init__(self, redis: InMemoryRedis) -> None:
+        self.redis = redis
+        self.commands: List[Callable[[], Any]] = []
+
+    def __getattr__(self, name: str) -> Callable[..., "InMemoryPipeline"]:
+        command = getattr(self.redis, name)
+
+        def queue(*args: Any, **kwargs: Any) -> "InMemoryPipeline":
+            self.commands.append(lambda: command(*args, **kwargs))
+            return self
+
+        return queue
+
+    def execute(self) -> List[Any]:
+        results = [command() for command in self.commands]
+        self.commands = []
+        return results
+
+
+class ProductSpider(Spider):
+    name = "otto_DE"
+    timestamp = "2022-01-01 00:00:00"
+
+    def parse_SERP(self, response: Response) -> None:
+        pass
+
+    def parse_PRODUCT(self, response: Response) -> None:
+        pass
+
+
+@pytest.fixture
+def redis(monkeypatch: pytest.MonkeyPatch) -> InMemoryRedis:
+    redis = InMemoryRedis()
+    for module in [dupefilter, middlewares, scheduler]:
+        monkeypatch.setattr(module, "Redis", lambda **_: redis)
+    return redis
+
+
+@pytest.fixture
+def create_crawler() -> Callable[..., Crawler]:
+    """
+    Returns:
+        Callable[..., Crawler]: Creates a crawler of the `ProductSpider` with the given settings
+    """
+
+    def create(**settings: Any) -> Crawler:
+        crawler = get_crawler(ProductSpider, settings_dict=settings)
+        crawler.spider = ProductSpider.from_crawler(crawler)
+        return crawler
+
+    return create
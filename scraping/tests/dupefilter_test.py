@@ -1,10 +1,13 @@
 from itertools import combinations
-from typing import List
+from typing import Callable, List
 
-from scrapy import Request
+from conftest import InMemoryRedis
+from scrapy import Request, signals
+from scrapy.crawler import Crawler
+from scrapy.http import Response
 
 from core.domain import ConsumerLifestageType, GenderType
-from scraping.dupefilter import MetaAwareDupeFilter
+from scraping.dupefilter import MetaAwareDupeFilter, PersistentMetaAwareDupeFilter
 
 dupefilter = MetaAwareDupeFilter()
 
@@ -44,3 +47,70 @@ def test_requests_fingerprint_equality() -> None:
     for request in requests:
         request2 = request
         assert dupefilter.request_fingerprint(request) == dupefilter.request_fingerprint(request2)
+
+
+def receive(crawler: Crawler, response: Response, request: Request) -> None:
+    crawler.signals.send_catch_log(
+        signals.response_received, response=response, request=request, spider=crawler.spider
+    )
+
+
+def write(redis: InMemoryRedis, request: Request) -> None:
+    # as the `scraping` worker does once the page is written
+    if fresh_product := request.meta.get("new_fresh_product"):
+        redis.set(fresh_product.key, 1, ex=fresh_product.ttl_seconds)
+
+
+def test_fresh_product_requests_are_filtered_across_runs(
+    redis: InMemoryRedis, create_crawler: Callable[..., Crawler]
+) -> None:
+    url = "https://www.otto.de/p/gerry-weber-klassische-bluse-blusenshirt-aus-leinen-leger-S003T0S8"
+    meta = {"category": "BLOUSE", "gender": "female", "consumer_lifestage": "adult"}
+
+    first_crawler = create_crawler(PRODUCT_FRESHNESS_SECONDS=60)
+    first_run = PersistentMetaAwareDupeFilter.from_crawler(first_crawler)
+    spider = first_crawler.spider
+    product_request = Request(url=url, callback=spider.parse_PRODUCT, meta=dict(meta))
+    failed_request = Request(url=f"{url}-failed", callback=spider.parse_PRODUCT, meta=dict(meta))
+    assert not first_run.request_seen(product_request)
+    assert not first_run.request_seen(failed_request)
+    assert not first_run.request_seen(Request(url=url, callback=spider.parse_SERP))
+    receive(first_crawler, Response(url=url, status=200), product_request)
+    receive(first_crawler, Response(url=url, status=503), failed_request)
+    # nothing is marked before the page is written
+    assert not redis.data
+    write(redis, product_request)
+    write(redis, failed_request)
+    assert list(redis.ttls.values()) == [60]
+
+    second_crawler = create_crawler(PRODUCT_FRESHNESS_SECONDS=60)
+    second_run = PersistentMetaAwareDupeFilter.from_crawler(second_crawler)
+    spider = second_crawler.spider
+    assert second_run.request_seen(Request(url=url, callback=spider.parse_PRODUCT, meta=dict(meta)))
+    assert not second_run.request_seen(
+        Request(url=f"{url}-failed", callback=spider.parse_PRODUCT, meta=dict(meta))
+    )
+    # other meta information, SERPs and products without persistence are fetched again
+    assert not second_run.request_seen(
+        Request(url=url, callback=spider.parse_PRODUCT, meta=dict(meta, category="SHIRT"))
+    )
+    assert not second_run.request_seen(Request(url=url, callback=spider.parse_SERP))
+    assert not PersistentMetaAwareDupeFilter.from_crawler(create_crawler()).request_seen(
+        Request(url=url, callback=spider.parse_PRODUCT, meta=dict(meta))
+    )
+
+
+def test_captcha_pages_are_not_marked_fresh(
+    redis: InMemoryRedis, create_crawler: Callable[..., Crawler]
+) -> None:
+    url = "https://www.otto.de/p/gerry-weber-klassische-bluse-blusenshirt-aus-leinen-leger-S003T0S8"
+    crawler = create_crawler(PRODUCT_FRESHNESS_SECONDS=60)
+    dupefilter = PersistentMetaAwareDupeFilter.from_crawler(crawler)
+
+    request = Request(url=url, callback=crawler.spider.parse_PRODUCT, meta={"category": "BLOUSE"})
+    assert not dupefilter.request_seen(request)
+    # as passed on by the `AdaptiveThrottleMiddleware` once its retries are exhausted
+    request.meta["captcha"] = True
+    receive(crawler, Response(url=url, status=200, body=b"px-captcha"), request)
+
+    assert "new_fresh_product" not in request.meta
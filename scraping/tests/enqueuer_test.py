@@ -0,0 +1,91 @@
+from datetime import datetime
+from threading import Event, Thread
+from typing import List, Optional, Tuple
+
+from core.domain import CountryType, FreshProduct, PageType, PageValidators, ScrapedPage
+from scraping.enqueuer import BackgroundEnqueuer
+
+
+class RecordingMessageQueue:
+    def __init__(self, fail_for_url: str = "") -> None:
+        self.fail_for_url = fail_for_url
+        self.enqueued: List[Tuple[str, str]] = []
+        self.flushed = False
+        self.proceed = Event()
+        self.proceed.set()
+
+    def add_scraping(
+        self,
+        table_name: str,
+        scraped_page: ScrapedPage,
+        page_validators: Optional[PageValidators] = None,
+        fresh_product: Optional[FreshProduct] = None,
+    ) -> None:
+        self.proceed.wait()
+        if scraped_page.url == self.fail_for_url:
+            raise ConnectionError("Redis is not available")
+        self.enqueued.append((table_name, scraped_page.url))
+
+    def flush(self) -> None:
+        self.flushed = True
+
+
+def create_scraped_page(url: str) -> ScrapedPage:
+    return ScrapedPage(
+        timestamp=datetime(2022, 1, 1),
+        merchant="otto",
+        country=CountryType.DE,
+        source="otto",
+        url=url,
+        html="<html></html>",
+        page_type=PageType.PRODUCT,
+        category="SHIRT",
+        gender=None,
+        consumer_lifestage=None,
+        meta_information=None,
+    )
+
+
+def test_pages_are_enqueued_in_order() -> None:
+    message_queue = RecordingMessageQueue(fail_for_url="https://otto.de/1")
+    enqueuer = BackgroundEnqueuer(message_queue)  # type: ignore[arg-type]
+
+    for i in range(5):
+        enqueuer.add_scraping("otto_de", create_scraped_page(f"https://otto.de/{i}"))
+    enqueuer.close()
+
+    assert message_queue.enqueued == [("otto_de", f"https://otto.de/{i}") for i in [0, 2, 3, 4]]
+    assert message_queue.flushed
+
+    metrics = enqueuer.get_metrics()
+    assert metrics["pages_added"] == 5
+    assert metrics["pages_enqueued"] == 4
+    assert metrics["pages_failed"] == 1
+
+
+def test_add_scraping_blocks_if_too_many_pages_are_pending() -> None:
+    message_queue = RecordingMessageQueue()
+    message_queue.proceed.clear()
+    enqueuer = BackgroundEnqueuer(message_queue, max_pending_pages=2)  # type: ignore[arg-type]
+
+    # one page is taken by the background thread, two are pending
+    added = [create_scraped_page(f"https://otto.de/{i}") for i in range(4)]
+
+    def add_pages() -> None:
+        for page in added:
+            enqueuer.add_scraping("otto_de", page)
+
+    thread = Thread(target=add_pages)
+    thread.start()
+
+    thread.join(timeout=0.5)
+    assert thread.is_alive()
+    assert enqueuer.get_metrics()["pages_added"] == 3
+
+    message_queue.proceed.set()
+    thread.join(timeout=5)
+    enqueuer.close()
+
+    assert not thread.is_alive()
+    assert len(message_queue.enqueued) == 4
+    assert enqueuer.get_metrics()["blocked_seconds"] > 0
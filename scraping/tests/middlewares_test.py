@@ -0,0 +1,185 @@
+from hashlib import sha256
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Tuple
+
+from conftest import InMemoryRedis
+from scrapy import Request
+from scrapy.core.downloader import Slot
+from scrapy.crawler import Crawler
+from scrapy.http import HtmlResponse, Response
+from scrapy.utils.test import get_crawler
+
+from scraping import settings
+from scraping.middlewares import AdaptiveThrottleMiddleware, ConditionalRequestMiddleware
+
+URL = "https://www.otto.de/p/gerry-weber-klassische-bluse-blusenshirt-aus-leinen-leger-S003T0S8"
+
+
+def create_middleware(slot: Slot, **custom_settings: Any) -> AdaptiveThrottleMiddleware:
+    crawler = get_crawler(
+        settings_dict={
+            name: getattr(settings, name) for name in dir(settings) if name.startswith("ADAPTIVE")
+        }
+        | {
+            "ADAPTIVE_THROTTLE_SUCCESSES_BEFORE_SPEEDUP": 2,
+            "DOWNLOAD_DELAY": 2,
+            "CONCURRENT_REQUESTS_PER_DOMAIN": 2,
+        }
+        | custom_settings
+    )
+    crawler.engine = SimpleNamespace(downloader=SimpleNamespace(slots={"otto.de": slot}))
+    return AdaptiveThrottleMiddleware.from_crawler(crawler)
+
+
+def create_request(latency: float) -> Request:
+    return Request(URL, meta={"download_slot": "otto.de", "download_latency": latency})
+
+
+def test_fast_responses_decrease_delay_and_increase_concurrency() -> None:
+    slot = Slot(concurrency=1, delay=5, randomize_delay=False)
+    middleware = create_middleware(slot)
+
+    for _ in range(20):
+        request = create_request(latency=0.5)
+        response = HtmlResponse(URL, body=b"<html></html>", request=request)
+        assert middleware.process_response(request, response, None) is response
+
+    # not faster than the spider's politeness settings
+    assert (slot.delay, slot.concurrency) == (2, 2)
+
+    slot = Slot(concurrency=1, delay=5, randomize_delay=False)
+    middleware = create_middleware(
+        slot, ADAPTIVE_THROTTLE_MIN_DELAY=1, ADAPTIVE_THROTTLE_MAX_CONCURRENCY=4
+    )
+    for _ in range(20):
+        request = create_request(latency=0.5)
+        middleware.process_response(request, HtmlResponse(URL, request=request), None)
+    assert (slot.delay, slot.concurrency) == (1, 4)
+
+
+def test_throttled_responses_increase_delay_and_decrease_concurrency() -> None:
+    slot = Slot(concurrency=4, delay=5, randomize_delay=False)
+    middleware = create_middleware(slot)
+
+    request = create_request(latency=0.5)
+    response = HtmlResponse(URL, status=429, headers={"Retry-After": "30"}, request=request)
+    assert middleware.process_response(request, response, None) is response
+    assert (slot.delay, slot.concurrency) == (30, 2)
+
+    request = create_request(latency=0.5)
+    response = HtmlResponse(URL, status=503, request=request)
+    middleware.process_response(request, response, None)
+    assert (slot.delay, slot.concurrency) == (60, 1)
+
+    for _ in range(5):
+        middleware.process_response(request, response, None)
+    assert (slot.delay, slot.concurrency) == (settings.ADAPTIVE_THROTTLE_MAX_DELAY, 1)
+
+
+def test_captcha_pages_are_retried() -> None:
+    slot = Slot(concurrency=2, delay=5, randomize_delay=False)
+    middleware = create_middleware(slot)
+    body = b'<form action="/errors/validateCaptcha"></form>'
+
+    request = create_request(latency=0.5)
+    for retries in range(1, settings.ADAPTIVE_THROTTLE_CAPTCHA_RETRIES + 1):
+        response = HtmlResponse(URL, body=body, request=request)
+        request = middleware.process_response(request, response, None)  # type: ignore[assignment]
+        assert isinstance(request, Request)
+        assert request.dont_filter
+        assert request.meta["captcha_retries"] == retries
+
+    response = HtmlResponse(URL, body=body, request=request)
+    assert middleware.process_response(request, response, None) is response
+    assert slot.delay == 5 * 2 ** (settings.ADAPTIVE_THROTTLE_CAPTCHA_RETRIES + 1)
+    assert middleware.crawler.stats.get_value("adaptive_throttle/captcha") == 3  # type: ignore
+
+
+def crawl(crawler: Crawler, response_kwargs: Dict[str, Any]) -> Tuple[Request, Response]:
+    middleware = ConditionalRequestMiddleware.from_crawler(crawler)
+    request = Request(URL, callback=crawler.spider.parse_PRODUCT, meta={"category": "BLOUSE"})
+    middleware.process_request(request, crawler.spider)
+    response = HtmlResponse(URL, request=request, **response_kwargs)
+    return request, middleware.process_response(request, response, crawler.spider)
+
+
+def write(redis: InMemoryRedis, response: Response) -> None:
+    # as the `scraping` worker does once the page is written
+    validators = response.meta["new_page_validators"]
+    redis.delete(validators.key)
+    redis.hset(
+        validators.key,
+        mapping=validators.model_dump(
+            include={"content_hash", "etag", "last_modified"}, exclude_none=True
+        ),
+    )
+    redis.expire(validators.key, validators.ttl_seconds)
+
+
+def test_unchanged_product_pages_are_detected(
+    redis: InMemoryRedis, create_crawler: Callable[..., Crawler]
+) -> None:
+    crawler = create_crawler(CONDITIONAL_REQUESTS_ENABLED=True, PAGE_VALIDATORS_TTL_SECONDS=60)
+    page = {"body": b"<html>product</html>", "headers": {"ETag": '"v1"'}}
+
+    request, response = crawl(crawler, page)
+    assert not response.meta["page_unchanged"]
+    assert "If-None-Match" not in request.headers
+    assert response.meta["new_page_validators"].etag == '"v1"'
+    write(redis, response)
+
+    # a conditional request, answered with the full page
+    request, response = crawl(crawler, page)
+    assert request.headers["If-None-Match"] == b'"v1"'
+    assert response.meta["page_unchanged"]
+    assert "new_page_validators" not in response.meta
+
+    # a conditional request, answered with `304 Not Modified`
+    request, response = crawl(crawler, {"status": 304})
+    assert response.meta["page_unchanged"]
+    assert response.meta["content_hash"] == sha256(page["body"]).hexdigest()  # type: ignore
+
+    request, response = crawl(crawler, {"body": b"<html>new product</html>"})
+    assert not response.meta["page_unchanged"]
+    write(redis, response)
+    request, response = crawl(crawler, {"body": b"<html>new product</html>"})
+    assert "If-None-Match" not in request.headers
+    assert response.meta["page_unchanged"]
+
+    assert len(redis.data) == 1
+    assert list(redis.ttls.values()) == [60]
+
+
+def test_validators_are_not_stored_before_the_page_is_written(
+    redis: InMemoryRedis, create_crawler: Callable[..., Crawler]
+) -> None:
+    crawler = create_crawler(CONDITIONAL_REQUESTS_ENABLED=True)
+    page = {"body": b"<html>product</html>"}
+
+    _, response = crawl(crawler, page)
+    assert not redis.data
+    # the page got lost on its way to the scraping table and is not taken as unchanged
+    _, response = crawl(crawler, page)
+    assert not response.meta["page_unchanged"]
+
+
+def test_captcha_pages_are_not_stored(
+    redis: InMemoryRedis, create_crawler: Callable[..., Crawler]
+) -> None:
+    crawler = create_crawler(CONDITIONAL_REQUESTS_ENABLED=True)
+    conditional_request_middleware = ConditionalRequestMiddleware.from_crawler(crawler)
+    adaptive_throttle_middleware = create_middleware(
+        Slot(concurrency=2, delay=5, randomize_delay=False), ADAPTIVE_THROTTLE_CAPTCHA_RETRIES=0
+    )
+
+    request = Request(URL, callback=crawler.spider.parse_PRODUCT, meta=create_request(0.5).meta)
+    conditional_request_middleware.process_request(request, crawler.spider)
+    response = HtmlResponse(URL, body=b"px-captcha", request=request)
+
+    # responses are processed in decreasing order
+    response = adaptive_throttle_middleware.process_response(request, response, crawler.spider)
+    conditional_request_middleware.process_response(
+        request, response, crawler.spider  # type: ignore[arg-type]
+    )
+    assert "page_unchanged" not in response.meta
+    assert "new_page_validators" not in response.meta
@@ -0,0 +1,73 @@
+from typing import Callable
+
+from conftest import InMemoryRedis
+from scrapy import Request, signals
+from scrapy.crawler import Crawler
+from scrapy.exceptions import DontCloseSpider
+from twisted.python.failure import Failure
+
+from scraping.scheduler import RedisScheduler
+
+URL = "https://www.otto.de/p/gerry-weber-klassische-bluse-blusenshirt-aus-leinen-leger-S003T0S8"
+
+
+def start_job(create_crawler: Callable[..., Crawler], idle_seconds: int = 300) -> RedisScheduler:
+    crawler = create_crawler(
+        DUPEFILTER_CLASS="scraping.dupefilter.SharedMetaAwareDupeFilter",
+        DISTRIBUTED_CRAWL_IDLE_SECONDS=idle_seconds,
+        DISTRIBUTED_CRAWL_TTL_SECONDS=3600,
+    )
+    scheduler = RedisScheduler.from_crawler(crawler)
+    scheduler.open(crawler.spider)
+    return scheduler
+
+
+def keeps_spider_open(scheduler: RedisScheduler) -> bool:
+    # as the engine checks the results of the `spider_idle` signal
+    results = scheduler.crawler.signals.send_catch_log(
+        signals.spider_idle, spider=scheduler.spider, dont_log=DontCloseSpider
+    )
+    return any(
+        isinstance(result, Failure) and isinstance(result.value, DontCloseSpider)
+        for _, result in results
+    )
+
+
+def test_jobs_share_the_frontier(
+    redis: InMemoryRedis, create_crawler: Callable[..., Crawler]
+) -> None:
+    first_job, second_job = start_job(create_crawler), start_job(create_crawler)
+    first_spider, second_spider = first_job.crawler.spider, second_job.crawler.spider
+
+    meta = {"category": "BLOUSE", "gender": "female", "consumer_lifestage": "adult"}
+    assert first_job.enqueue_request(Request(URL, callback=first_spider.parse_SERP))
+    assert first_job.enqueue_request(
+        Request(URL, callback=first_spider.parse_PRODUCT, meta=meta, priority=1)
+    )
+    # duplicates are filtered across jobs, considering the meta information
+    assert not second_job.enqueue_request(Request(URL, callback=second_spider.parse_SERP))
+    assert not second_job.enqueue_request(
+        Request(URL, callback=second_spider.parse_PRODUCT, meta=dict(meta))
+    )
+    assert second_job.enqueue_request(
+        Request(URL, callback=second_spider.parse_PRODUCT, meta=dict(meta, category="SHIRT"))
+    )
+    assert set(redis.ttls.values()) == {3600}
+
+    assert second_job.has_pending_requests()
+    request = second_job.next_request()
+    assert request is not None
+    assert request.callback == second_spider.parse_PRODUCT
+    assert request.meta == meta
+
+    assert first_job.next_request() is not None
+    assert first_job.next_request() is not None
+    assert not first_job.has_pending_requests()
+    assert second_job.next_request() is None
+
+
+def test_idle_jobs_wait_for_requests_of_other_jobs(
+    redis: InMemoryRedis, create_crawler: Callable[..., Crawler]
+) -> None:
+    assert keeps_spider_open(start_job(create_crawler))
+    assert not keeps_spider_open(start_job(create_crawler, idle_seconds=0))
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 import subprocess
 from configparser import ConfigParser
 from datetime import datetime
@@ -30,6 +31,9 @@ MERCHANTS = [
 
 START_TIMESTAMP = datetime.utcnow()
 
+# Number of scrapyd jobs per merchant, they share the crawl if `DISTRIBUTED_CRAWL_ENABLED` is set
+JOBS_PER_MERCHANT = int(os.environ.get("JOBS_PER_MERCHANT", 1))
+
 # Read scrapy config and get target URL for local scraping
 scrapy_config_parser = ConfigParser()
 scrapy_config_parser.read("/green-db/scraping/scrapy.cfg")  # Repo gets cloned
@@ -37,9 +41,10 @@ SCRAPYD_CLUSTER_TARGET = scrapy_config_parser.get("deploy:in-cluster", "url")
 
 if __name__ == "__main__":
     for merchant in MERCHANTS:
-        command = (
-            f"scrapyd-client -t {SCRAPYD_CLUSTER_TARGET} schedule -p scraping --arg "
-            f"timestamp='{START_TIMESTAMP}' {merchant}"
-        )
-        output = subprocess.run(command, shell=True, capture_output=True)
-        print(output.stdout.decode("utf-8"))
+        for _ in range(JOBS_PER_MERCHANT):
+            command = (
+                f"scrapyd-client -t {SCRAPYD_CLUSTER_TARGET} schedule -p scraping --arg "
+                f"timestamp='{START_TIMESTAMP}' {merchant}"
+            )
+            output = subprocess.run(command, shell=True, capture_output=True)
+            print(output.stdout.decode("utf-8"))
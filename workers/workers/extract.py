@@ -1,3 +1,5 @@
+from typing import List
+
 from message_queue import MessageQueue
 from redis import Redis
 from rq import Connection, Worker
@@ -13,7 +15,9 @@ CONNECTION_FOR_TABLE = {name: Scraping(name) for name in ALL_SCRAPING_TABLE_NAME
 
 
 green_db_connection = GreenDB()
-message_queue = MessageQueue()
+# Jobs are processed in forked processes, so collected items or buffered jobs would be lost:
+# enqueue immediately
+message_queue = MessageQueue(batch_size=1, pipeline_size=1)
 
 
 def start() -> None:
@@ -47,3 +51,27 @@ def extract_and_write_to_green_db(table_name: str, row_id: int) -> None:
     else:
         # TODO: what to do when extract fails? -> "failed" queue?
         pass
+
+
+def extract_batch_and_write_to_green_db(table_name: str, row_ids: List[int]) -> None:
+    """
+    This function gets executed when a new batch job is available.
+    It fetches all given `row_ids` from the table `table_name` at once, extracts a `Product`
+        from each HTML, inserts all `Product`s into the GreenDB at once
+        and enqueues a single inference job for them.
+
+    Args:
+        table_name (str): The table where the `ScrapedPage`s should be fetched from
+        row_ids (List[int]): The ids of the to-be-fetched-rows
+    """
+    scraped_pages = CONNECTION_FOR_TABLE[table_name].get_scraped_pages_with_ids(ids=row_ids)
+
+    products = [
+        product
+        for scraped_page in scraped_pages
+        if (product := extract_product(table_name=table_name, scraped_page=scraped_page))
+    ]
+
+    if products:
+        product_row_ids = green_db_connection.write_many(products)
+        message_queue.add_inference_batch(row_ids=product_row_ids)
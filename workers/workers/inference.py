@@ -1,8 +1,9 @@
-import json
+from typing import List, Tuple
 
-import pandas as pd
+import pyarrow as pa
 import requests
 from redis import Redis
+from requests.adapters import HTTPAdapter
 from rq import Connection, Worker
 
 from core.constants import PRODUCT_CLASSIFICATION_MODEL_FEATURES, WORKER_QUEUE_INFERENCE
@@ -12,6 +13,18 @@ from database.connection import GreenDB
 
 green_db_connection = GreenDB()
 
+PRODUCT_CLASSIFICATION_URL = "http://product-classification:8080"
+# Maximum number of products sent within one request to the product-classification service
+PRODUCT_CLASSIFICATION_REQUEST_SIZE = 100
+
+# Products and classifications are exchanged as Arrow record batches, which is much cheaper to
+# (de)serialize than the JSON format of the product-classification service
+ARROW_STREAM_MIMETYPE = "application/vnd.apache.arrow.stream"
+
+# Reuses connections to the product-classification service instead of opening one per request
+session = requests.Session()
+session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
 
 def start() -> None:
     """
@@ -40,6 +53,29 @@ def inference_and_write_to_green_db(row_id: int, table_name: str) -> None:
     green_db_connection.write_product_classification(product_classification)
 
 
+def inference_batch_and_write_to_green_db(row_ids: List[int], table_name: str) -> None:
+    """
+    This function gets executed when a new batch job is available.
+    It fetches all given `row_ids` from the GreenDB at once, performs inference for up to
+        `PRODUCT_CLASSIFICATION_REQUEST_SIZE` of them per request
+        and inserts all results into the GreenDB at once.
+
+    Args:
+        row_ids (List[int]): The ids of the to-be-fetched-rows
+        table_name (str): The table name, used for logging purposes
+    """
+    rows = list(green_db_connection.get_products_with_ids(row_ids, convert_orm=False))
+    product_classifications: List[ProductClassification] = []
+
+    for start in range(0, len(rows), PRODUCT_CLASSIFICATION_REQUEST_SIZE):
+        end = start + PRODUCT_CLASSIFICATION_REQUEST_SIZE
+        product_classifications += infer_product_categories(
+            [(row.id, Product.model_validate(row)) for row in rows[start:end]]  # type: ignore
+        )
+
+    green_db_connection.write_product_classifications(product_classifications)
+
+
 def infer_product_category(product: Product, row_id: int) -> ProductClassification:
     """
     This function is used to call the product-classification microservice.
@@ -50,10 +86,41 @@ def infer_product_category(product: Product, row_id: int) -> ProductClassificati
         product (Product): a Product instance.
         row_id (int): The id of the Product instance from the database.
     """
-    reduced = {
-        k: v for k, v in product.__dict__.items() if k in PRODUCT_CLASSIFICATION_MODEL_FEATURES
-    }
-    reduced["id"] = row_id
-    json_post = pd.DataFrame.from_records(reduced, index=[0]).to_json()
-    r = requests.post("http://product-classification:8080", json=json_post, timeout=30)
-    return ProductClassification.parse_obj(json.loads(r.text)[0])
+    return infer_product_categories([(row_id, product)])[0]
+
+
+def infer_product_categories(products: List[Tuple[int, Product]]) -> List[ProductClassification]:
+    """
+    This function is used to call the product-classification microservice for many products
+    with a single request.
+
+    Args:
+        products (List[Tuple[int, Product]]): ids from the database and Product instances.
+
+    Returns:
+        List[ProductClassification]: product classifications in the order of `products`.
+    """
+    records = []
+    for row_id, product in products:
+        reduced = {
+            k: v for k, v in product.__dict__.items() if k in PRODUCT_CLASSIFICATION_MODEL_FEATURES
+        }
+        reduced["id"] = row_id
+        records.append(reduced)
+
+    table = pa.Table.from_pylist(records)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+
+    r = session.post(
+        PRODUCT_CLASSIFICATION_URL,
+        data=sink.getvalue().to_pybytes(),
+        headers={"Content-Type": ARROW_STREAM_MIMETYPE},
+        timeout=30,
+    )
+    r.raise_for_status()
+    return [
+        ProductClassification.model_validate(record)
+        for record in pa.ipc.open_stream(r.content).read_all().to_pylist()
+    ]
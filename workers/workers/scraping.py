@@ -1,9 +1,13 @@
+from typing import List, Optional
+
 from message_queue import MessageQueue
+from message_queue.html_store import HTMLStore
 from redis import Redis
 from rq import Connection, Worker
 
 from core.constants import ALL_SCRAPING_TABLE_NAMES, WORKER_QUEUE_SCRAPING
-from core.domain import PageType, ScrapedPage
+from core.domain import FreshProduct, PageType, PageValidators, ScrapedPage, UnchangedPage
+from core.html_store import HTML_STORE_PATH
 from core.redis import REDIS_HOST, REDIS_PASSWORD, REDIS_PORT, REDIS_USER
 from database.connection import Scraping
 
@@ -14,7 +18,11 @@ redis_connection = Redis(
     host=REDIS_HOST, port=REDIS_PORT, password=REDIS_PASSWORD, username=REDIS_USER
 )
 
-message_queue = MessageQueue()
+# Jobs are processed in forked processes, so collected items or buffered jobs would be lost:
+# enqueue immediately
+message_queue = MessageQueue(batch_size=1, pipeline_size=1)
+
+html_store = HTMLStore() if HTML_STORE_PATH else None
 
 
 def start() -> None:
@@ -26,7 +34,70 @@ def start() -> None:
         worker.work(with_scheduler=True)
 
 
-def write_to_scraping_database(table_name: str, scraped_page: ScrapedPage) -> None:
+def _load_html(scraped_pages: List[ScrapedPage], html_references: List[str]) -> None:
+    """
+    Helper function that sets the HTML of each of the `scraped_pages` from the `html_store`.
+
+    Args:
+        scraped_pages (List[ScrapedPage]): Domain objects that were enqueued without HTML
+        html_references (List[str]): References to the HTML of each of the `scraped_pages`
+    """
+    if html_store is None:
+        raise ValueError("Got HTML references, but 'HTML_STORE_PATH' is not set.")
+
+    for scraped_page, html_reference in zip(scraped_pages, html_references):
+        scraped_page.html = html_store.get(html_reference)
+
+
+def _delete_html(html_references: List[str]) -> None:
+    """
+    Helper function that deletes the stored HTML once it is written into the database.
+
+    Args:
+        html_references (List[str]): References to the HTML to delete
+    """
+    for html_reference in html_references:
+        html_store.delete(html_reference)  # type: ignore[union-attr]
+
+
+def _save_for_next_crawl(
+    page_validators: List[Optional[PageValidators]], fresh_products: List[Optional[FreshProduct]]
+) -> None:
+    """
+    Helper function that stores what the spiders need of written pages in their next crawl:
+        validators to detect unchanged pages and marks of recently fetched products.
+
+    Args:
+        page_validators (List[Optional[PageValidators]]): Validators to store, if any
+        fresh_products (List[Optional[FreshProduct]]): Marks to store, if any
+    """
+    pipeline = redis_connection.pipeline(transaction=False)
+    for validators in page_validators:
+        if validators is None:
+            continue
+
+        pipeline.delete(validators.key)
+        pipeline.hset(
+            validators.key,
+            mapping=validators.model_dump(
+                include={"content_hash", "etag", "last_modified"}, exclude_none=True
+            ),
+        )
+        pipeline.expire(validators.key, validators.ttl_seconds)
+
+    for fresh_product in fresh_products:
+        if fresh_product is not None:
+            pipeline.set(fresh_product.key, 1, ex=fresh_product.ttl_seconds)
+    pipeline.execute()
+
+
+def write_to_scraping_database(
+    table_name: str,
+    scraped_page: ScrapedPage,
+    html_reference: Optional[str] = None,
+    page_validators: Optional[PageValidators] = None,
+    fresh_product: Optional[FreshProduct] = None,
+) -> None:
     """
     This function gets executed when a new job is available.
     It simply inserts the `scraped_page` into the table `table_name`.
@@ -34,8 +105,85 @@ def write_to_scraping_database(table_name: str, scraped_page: ScrapedPage) -> No
     Args:
         table_name (str): The table the `scraped_page` should be inserted into
         scraped_page (ScrapedPage): Tht actual domain object to insert into `table_name`
+        html_reference (Optional[str], optional): If set, the HTML is not part of the
+            `scraped_page` but stored in the `html_store`. Defaults to None.
+        page_validators (Optional[PageValidators], optional): Validators of the
+            `scraped_page`, stored once it is written. Defaults to None.
+        fresh_product (Optional[FreshProduct], optional): Mark of the `scraped_page`, stored
+            once it is written. Defaults to None.
     """
+    if html_reference:
+        _load_html([scraped_page], [html_reference])
+
     row = CONNECTION_FOR_TABLE[table_name].write(scraped_page)
 
+    if html_reference:
+        _delete_html([html_reference])
+
     if scraped_page.page_type == PageType.PRODUCT.value:
         message_queue.add_extract(table_name=table_name, row_id=row.id)
+
+    if page_validators or fresh_product:
+        _save_for_next_crawl([page_validators], [fresh_product])
+
+
+def write_batch_to_scraping_database(
+    table_name: str,
+    scraped_pages: List[ScrapedPage],
+    html_references: Optional[List[str]] = None,
+    page_validators: Optional[List[Optional[PageValidators]]] = None,
+    fresh_products: Optional[List[Optional[FreshProduct]]] = None,
+) -> None:
+    """
+    This function gets executed when a new batch job is available.
+    It inserts all `scraped_pages` into the table `table_name` at once
+        and enqueues a single extract job for all product pages.
+
+    Args:
+        table_name (str): The table the `scraped_pages` should be inserted into
+        scraped_pages (List[ScrapedPage]): The actual domain objects to insert into `table_name`
+        html_references (Optional[List[str]], optional): If set, the HTML is not part of the
+            `scraped_pages` but stored in the `html_store`. Defaults to None.
+        page_validators (Optional[List[Optional[PageValidators]]], optional): Validators of
+            each of the `scraped_pages`, stored once they are written. Defaults to None.
+        fresh_products (Optional[List[Optional[FreshProduct]]], optional): Marks of each of
+            the `scraped_pages`, stored once they are written. Defaults to None.
+    """
+    if html_references:
+        _load_html(scraped_pages, html_references)
+
+    row_ids = CONNECTION_FOR_TABLE[table_name].write_many(scraped_pages)
+
+    if html_references:
+        _delete_html(html_references)
+
+    product_row_ids = [
+        row_id
+        for row_id, scraped_page in zip(row_ids, scraped_pages)
+        if scraped_page.page_type == PageType.PRODUCT.value
+    ]
+    if product_row_ids:
+        message_queue.add_extract_batch(table_name=table_name, row_ids=product_row_ids)
+
+    if page_validators or fresh_products:
+        _save_for_next_crawl(page_validators or [], fresh_products or [])
+
+
+def write_unchanged_page_to_scraping_database(
+    table_name: str, unchanged_page: UnchangedPage, fresh_product: Optional[FreshProduct] = None
+) -> None:
+    """
+    This function gets executed when a page was scraped again without changes.
+    It only records the `unchanged_page`, the page is neither written into the table
+        `table_name` again nor extracted.
+
+    Args:
+        table_name (str): The table the page was stored in when it changed the last time
+        unchanged_page (UnchangedPage): The domain object to record
+        fresh_product (Optional[FreshProduct], optional): Mark of the page, stored once the
+            `unchanged_page` is recorded. Defaults to None.
+    """
+    CONNECTION_FOR_TABLE[table_name].write_unchanged_page(unchanged_page)
+
+    if fresh_product:
+        _save_for_next_crawl([], [fresh_product])